@@ -0,0 +1,121 @@
+class IndexedMinHeap:
+    """
+    A binary min-heap over a fixed set of integer ids 0..capacity-1, each holding at most one key.
+
+    The heap is stored in parallel arrays instead of per-entry objects:
+      • keys[id]: the current key of id.
+      • heap[p]: the id stored at heap position p.
+      • position[id]: the heap position of id, or -1 if id is not in the heap.
+    Keys can be changed or removed in O(log n) through the id, so the heap never holds stale
+    entries. Ties between equal keys are broken by the smaller id.
+    """
+    def __init__(self, capacity):
+        self.keys = [0.0] * capacity
+        self.heap = []
+        self.position = [-1] * capacity
+
+    def __contains__(self, i):
+        return self.position[i] != -1
+
+    def push(self, i, key):
+        """Set the key of id i, inserting it if needed (decrease-key and increase-key included)."""
+        p = self.position[i]
+        if p == -1:
+            self.keys[i] = key
+            self.heap.append(i)
+            self.position[i] = len(self.heap) - 1
+            self._sift_up(len(self.heap) - 1)
+            return
+        old = self.keys[i]
+        self.keys[i] = key
+        if key < old:
+            self._sift_up(p)
+        else:
+            self._sift_down(p)
+
+    def remove(self, i):
+        """Remove id i from the heap if present."""
+        p = self.position[i]
+        if p == -1:
+            return
+        last = self.heap.pop()
+        self.position[i] = -1
+        if p < len(self.heap):
+            self.heap[p] = last
+            self.position[last] = p
+            self._sift_down(p)
+            self._sift_up(self.position[last])
+
+    def pop(self):
+        """Pop and return (id, key) with the smallest key."""
+        if not self.heap:
+            raise IndexError("pop from an empty heap")
+        i = self.heap[0]
+        self.remove(i)
+        return i, self.keys[i]
+
+    def peek(self):
+        """Return (id, key) with the smallest key without popping it."""
+        if not self.heap:
+            raise IndexError("peek from an empty heap")
+        i = self.heap[0]
+        return i, self.keys[i]
+
+    def is_empty(self):
+        """Check if the heap is empty."""
+        return len(self.heap) == 0
+
+    def size(self):
+        """Return the size of the heap."""
+        return len(self.heap)
+
+    def heapify(self, ids, keys):
+        """Replace the content of the heap with the given ids and their keys."""
+        for i in self.heap:
+            self.position[i] = -1
+        self.heap = list(ids)
+        for p, (i, key) in enumerate(zip(self.heap, keys)):
+            self.keys[i] = key
+            self.position[i] = p
+        for p in reversed(range(len(self.heap) // 2)):
+            self._sift_down(p)
+
+    def _sift_up(self, p):
+        heap, position, keys = self.heap, self.position, self.keys
+        i = heap[p]
+        key = keys[i]
+        while p > 0:
+            parent = (p - 1) >> 1
+            j = heap[parent]
+            parent_key = keys[j]
+            if key > parent_key or (key == parent_key and i > j):
+                break
+            heap[p] = j
+            position[j] = p
+            p = parent
+        heap[p] = i
+        position[i] = p
+
+    def _sift_down(self, p):
+        heap, position, keys = self.heap, self.position, self.keys
+        n = len(heap)
+        i = heap[p]
+        key = keys[i]
+        while True:
+            child = 2 * p + 1
+            if child >= n:
+                break
+            j = heap[child]
+            child_key = keys[j]
+            if child + 1 < n:
+                k = heap[child + 1]
+                other_key = keys[k]
+                if other_key < child_key or (other_key == child_key and k < j):
+                    child, j, child_key = child + 1, k, other_key
+            if child_key > key or (child_key == key and j > i):
+                break
+            heap[p] = j
+            position[j] = p
+            p = child
+        heap[p] = i
+        position[i] = p
@@ -0,0 +1,125 @@
+import json
+import struct
+
+import numpy as np
+
+from DataStructures.SatisfactoryRegionIndex import SatisfactoryRegionIndex
+
+MAGIC = b'FRCATLG\0'
+VERSION = 1
+# magic, version, number of entries, offset and length of the index
+HEADER = struct.Struct('<8sIIQQ')
+
+
+def _aligned(offset):
+    return (offset + 7) & ~7
+
+
+class PackedTypes:
+    """
+    Boundary types stored one bit each (little bit order), indexable by an integer or an
+    integer array like the uint8 array of SatisfactoryRegionIndex, without unpacking them.
+    """
+    def __init__(self, bits, count):
+        self.bits = bits
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if isinstance(i, np.ndarray):
+            return (self.bits[i >> 3] >> (i & 7).astype(np.uint8)) & 1
+        if i < 0:
+            i += self.count
+        return (int(self.bits[i >> 3]) >> (i & 7)) & 1
+
+    def unpack(self):
+        return np.unpackbits(self.bits, count=self.count, bitorder='little')
+
+
+def write_catalog(path, entries, metadata=None):
+    """
+    Write boundary lists to a binary catalog file.
+
+    entries maps a configuration key (a string, e.g. a preprocessing key) to a sorted boundary
+    list; metadata optionally maps the same keys to JSON-serializable descriptions.
+
+    Layout (little endian): a header (magic, version, entry count, index offset and length),
+    then for every entry its angles as a float64 array and its boundary types as packed bits,
+    each starting at a multiple of 8 bytes, then the index: a JSON object giving the count, the
+    offsets and the metadata of every key.
+    """
+    metadata = metadata or {}
+    index = {}
+    offset = HEADER.size
+    with open(path, 'wb') as f:
+        f.write(b'\0' * HEADER.size)
+        for key, boundaries in entries.items():
+            angles = np.array([boundary[0] for boundary in boundaries], dtype='<f8')
+            bits = np.packbits(np.array([boundary[1] for boundary in boundaries], dtype=np.uint8), bitorder='little')
+            types_offset = offset + angles.nbytes
+            end = _aligned(types_offset + bits.nbytes)
+            f.write(angles.tobytes() + bits.tobytes() + b'\0' * (end - types_offset - bits.nbytes))
+            index[key] = {'count': len(angles), 'angles': offset, 'types': types_offset,
+                          'meta': metadata.get(key, {})}
+            offset = end
+        data = json.dumps(index).encode()
+        f.write(data)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, len(index), offset, len(data)))
+
+
+class RegionCatalog:
+    """
+    Read-only view of a catalog written by write_catalog.
+
+    The file is memory-mapped: angles() and types() are views into the mapping, and index()
+    queries them in place, so opening a catalog costs only its index and processes that map
+    the same file share its pages.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.data = np.memmap(path, dtype=np.uint8, mode='r')
+        magic, version, count, index_offset, index_length = HEADER.unpack(bytes(self.data[:HEADER.size]))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a region catalog")
+        if version != VERSION:
+            raise ValueError(f"{path} has catalog version {version}, expected {VERSION}")
+        self.entries = json.loads(bytes(self.data[index_offset:index_offset + index_length]))
+        self._indexes = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def keys(self):
+        return self.entries.keys()
+
+    def metadata(self, key):
+        return self.entries[key]['meta']
+
+    def find(self, **fields):
+        """The keys whose metadata has all the given field values."""
+        return [key for key, entry in self.entries.items()
+                if all(entry['meta'].get(name) == value for name, value in fields.items())]
+
+    def angles(self, key):
+        entry = self.entries[key]
+        return self.data[entry['angles']:entry['angles'] + 8 * entry['count']].view('<f8')
+
+    def types(self, key):
+        entry = self.entries[key]
+        return PackedTypes(self.data[entry['types']:entry['types'] + (entry['count'] + 7) // 8], entry['count'])
+
+    def boundaries(self, key):
+        """The boundary list of key, as two_d_array_sweep returns it (a copy)."""
+        return list(zip(self.angles(key).tolist(), self.types(key).unpack().tolist()))
+
+    def index(self, key):
+        """A SatisfactoryRegionIndex over the mapped arrays of key (created once per key)."""
+        if key not in self._indexes:
+            self._indexes[key] = SatisfactoryRegionIndex.from_arrays(self.angles(key), self.types(key))
+        return self._indexes[key]
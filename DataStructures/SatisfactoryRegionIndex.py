@@ -0,0 +1,90 @@
+import math
+from bisect import bisect_left
+
+import numpy as np
+
+
+class SatisfactoryRegionIndex:
+    """
+    Index over the sorted boundary list returned by two_d_array_sweep, for answering
+    2DOnline queries. It is built once and answers both single queries and vectorized
+    batches of weight vectors, with the same results as two_d_online.
+
+    The boundary angles are kept as a contiguous float64 array (and a plain list for
+    single queries), the boundary types as a uint8 array.
+    """
+    def __init__(self, sorted_satisfactory_regions: list):
+        self.angles = np.array([boundary[0] for boundary in sorted_satisfactory_regions], dtype=np.float64)
+        self.types = np.array([boundary[1] for boundary in sorted_satisfactory_regions], dtype=np.uint8)
+        self._angles = self.angles.tolist()
+        self._types = self.types.tolist()
+        self._last = len(self._angles) - 1
+
+    @classmethod
+    def from_arrays(cls, angles, types):
+        """
+        Index over boundary angles and types that already are arrays (for instance the
+        memory-mapped arrays of a RegionCatalog), without copying them. types may be any object
+        indexable by an integer or an integer array.
+        """
+        index = cls.__new__(cls)
+        index.angles = index._angles = angles
+        index.types = index._types = types
+        index._last = len(angles) - 1
+        return index
+
+    def __len__(self):
+        return len(self._angles)
+
+    def query(self, w1: float, w2: float):
+        """
+        Single query, same as two_d_online(regions, w1, w2).
+        Returns the weights themselves if they are in a satisfactory region, or the weights
+        of the nearer boundary (with the same norm) otherwise.
+        """
+        angles, last = self._angles, self._last
+        if last < 0:
+            raise IndexError("no satisfactory regions to query")
+        theta = math.pi / 2 if w1 == 0 else math.atan2(w2, w1)
+        low = bisect_left(angles, theta) - 1
+        if low < 0:
+            low = 0
+        elif low >= last:
+            low = last - 1 if last > 0 else 0
+        high = low + 1 if last > 0 else 0
+
+        low_angle, high_angle = angles[low], angles[high]
+        if low_angle <= theta < high_angle and self._types[low] == 0:
+            return w1, w2
+
+        r = math.sqrt(w1 ** 2 + w2 ** 2)
+        angle = low_angle if (theta - low_angle) < (high_angle - theta) else high_angle
+        return r * math.cos(angle), r * math.sin(angle)
+
+    def query_batch(self, weights):
+        """
+        Vectorized query for an N×2 array of (w1, w2) weight vectors.
+        Returns (adjusted, in_region): an N×2 float64 array of the weights answered by
+        query() for every row (up to the last bit of NumPy's cos/sin), and a boolean array telling which rows were already in a
+        satisfactory region (and so were returned unchanged).
+        If the index is empty, no weight vector is satisfactory and the adjusted weights are NaN.
+        """
+        weights = np.asarray(weights, dtype=np.float64).reshape(-1, 2)
+        w1, w2 = weights[:, 0], weights[:, 1]
+        m = len(self.angles)
+        if m == 0:
+            return np.full_like(weights, np.nan), np.zeros(len(weights), dtype=bool)
+
+        theta = np.where(w1 == 0, math.pi / 2, np.arctan2(w2, w1))
+        low = np.clip(np.searchsorted(self.angles, theta, side='left') - 1, 0, max(m - 2, 0))
+        high = np.minimum(low + 1, m - 1)
+        low_angle = self.angles[low]
+        high_angle = self.angles[high]
+
+        in_region = (self.types[low] == 0) & (low_angle <= theta) & (theta < high_angle)
+        angle = np.where((theta - low_angle) < (high_angle - theta), low_angle, high_angle)
+        r = np.sqrt(w1 ** 2 + w2 ** 2)
+
+        adjusted = np.where(in_region[:, None], weights,
+                            np.column_stack((r * np.cos(angle), r * np.sin(angle))))
+        return adjusted, in_region
@@ -1,4 +1,5 @@
-import pandas as pd
+import numpy as np
+from Datasets.ColumnarCache import ColumnarCache
 from Datasets.Dataset import Dataset
 from Datasets.COMPAS.Oracle import Oracle
 import os
@@ -12,29 +13,52 @@ class COMPAS(Dataset):
                  'age_bucketized': ['<30', '31-40', '>40'],
                  'race': ['African-American', 'Caucasian', 'Hispanic', 'Asian', 'Native American', 'Other']
                  }
+    # Protected types that are derived from another column rather than read from the CSV.
+    DERIVED_TYPES = {'age_binary': 'age', 'age_bucketized': 'age'}
 
-    def __init__(self, attribute1='age', attribute2='c_days_from_compas', type='race', type_attr='African-American'):
-        df = self.__load_and_preprocess(attribute1, attribute2)
-        super(COMPAS, self).__init__(df, attribute1, attribute2, type)
+    def __init__(self, attribute1='age', attribute2='c_days_from_compas', type='race', type_attr='African-American',
+                 raw_df=None):
+        """
+        raw_df: the frame returned by read_csv(), to build many datasets from one parsed CSV.
+        It is not modified. When omitted, only the columns this dataset needs are loaded.
+        """
+        if raw_df is None:
+            raw_df = self.read_csv(self.columns_for(attribute1, attribute2, type))
+        df = self.preprocess(raw_df, attribute1, attribute2)
+        super(COMPAS, self).__init__(df, attribute1, attribute2, type, labels=self.TYPE_ATTS[type])
         self.set_oracle(Oracle(type_attr=type_attr))
 
-    def __len__(self):
-        return len(self.attributes)
-
-    def __load_and_preprocess(self, attribute1, attribute2):
-        # load the dataset
+    @classmethod
+    def get_path(cls):
         curr_path = os.path.dirname(os.path.realpath(__file__))
-        path = os.path.join(curr_path, "compas-scores-two-years-violent.csv")
-        df = pd.read_csv(path)
+        return os.path.join(curr_path, cls.DATASET_FILE)
+
+    @classmethod
+    def columns_for(cls, attribute1, attribute2, type):
+        """The CSV columns needed for a dataset over the two attributes and the protected type."""
+        return list(dict.fromkeys([attribute1, attribute2, cls.DERIVED_TYPES.get(type, type)]))
 
+    @classmethod
+    def read_csv(cls, columns=None):
+        """
+        Load columns of the dataset file (default: every scoring attribute and protected type).
+        They are read from a memory-mapped columnar cache next to the CSV, which is rebuilt when
+        the CSV changes.
+        """
+        cached = list(dict.fromkeys(cls.SCORING_ATTR + [cls.DERIVED_TYPES.get(type, type) for type in cls.TYPE_ATTS]))
+        return ColumnarCache(cls.get_path(), cached).load(columns)
+
+    @staticmethod
+    def preprocess(df, attribute1, attribute2):
         attributes = [attribute1, attribute2]
         df = df.dropna(subset=attributes)
 
-        # create a binary groups for 'age'
-        df['age_binary'] = df['age'].apply(lambda x: '<36' if x < 35 else '>=36')
-        df['age_bucketized'] = df['age'].apply(lambda x: '<30' if x < 30 else ('31-40' if 30 < x <= 40 else '>40'))
+        if 'age' in df:
+            age = df['age'].to_numpy()
+            # create a binary groups for 'age'
+            df['age_binary'] = np.where(age < 35, '<36', '>=36')
+            df['age_bucketized'] = np.select([age < 30, (30 < age) & (age <= 40)], ['<30', '31-40'], '>40')
 
-        df['age'] = df['age'].max() - df['age']
+            df['age'] = age.max() - age
 
         return df
-
@@ -0,0 +1,92 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from Datasets.FileHash import file_hash
+
+
+class ColumnarCache:
+    """
+    Columnar binary cache of selected columns of a CSV file, kept in a directory next to it.
+
+    Every column is stored as one .npy file that is memory-mapped when read. Numeric columns
+    keep their parsed dtype; text columns are stored as integer codes and their labels are kept
+    in the manifest. The manifest also records the CSV's mtime, size and content hash: when the
+    mtime or size change the hash is checked, and the cache is rebuilt only if it differs.
+    """
+    def __init__(self, csv_path, columns):
+        self.csv_path = csv_path
+        self.columns = list(columns)
+        self.directory = f'{csv_path}.columns'
+        self.manifest_path = os.path.join(self.directory, 'manifest.json')
+
+    def _column_path(self, column):
+        return os.path.join(self.directory, f'{self.columns.index(column)}.npy')
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return manifest if manifest['columns'] == self.columns else None
+
+    def _write_manifest(self, manifest):
+        tmp_path = f'{self.manifest_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def manifest(self):
+        """Return a manifest that matches the current CSV, rebuilding the cache if needed."""
+        stat = os.stat(self.csv_path)
+        manifest = self._read_manifest()
+        if manifest is not None and (manifest['mtime_ns'], manifest['size']) == (stat.st_mtime_ns, stat.st_size):
+            return manifest
+
+        digest = file_hash(self.csv_path)
+        if manifest is not None and manifest['sha256'] == digest:
+            # Touched but unchanged: only refresh the recorded mtime.
+            manifest['mtime_ns'], manifest['size'] = stat.st_mtime_ns, stat.st_size
+            self._write_manifest(manifest)
+            return manifest
+        return self.build(stat, digest)
+
+    def build(self, stat, digest):
+        os.makedirs(self.directory, exist_ok=True)
+        df = pd.read_csv(self.csv_path, usecols=self.columns)
+        labels = {}
+        for column in self.columns:
+            values = df[column]
+            if pd.api.types.is_numeric_dtype(values):
+                array = values.to_numpy()
+            else:
+                codes, uniques = pd.factorize(values)
+                array = codes.astype(np.int16)
+                labels[column] = uniques.tolist()
+            path = self._column_path(column)
+            with open(f'{path}.tmp', 'wb') as f:
+                np.save(f, array)
+            os.replace(f'{path}.tmp', path)
+
+        manifest = {'columns': self.columns, 'labels': labels, 'rows': len(df),
+                    'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': digest}
+        self._write_manifest(manifest)
+        return manifest
+
+    def load(self, columns=None):
+        """
+        Return a DataFrame with the requested columns (default: all the cached ones).
+        Numeric columns are memory-mapped; text columns come back as categoricals.
+        """
+        manifest = self.manifest()
+        data = {}
+        for column in columns or self.columns:
+            array = np.load(self._column_path(column), mmap_mode='r')
+            if column in manifest['labels']:
+                data[column] = pd.Categorical.from_codes(array, manifest['labels'][column])
+            else:
+                data[column] = array
+        return pd.DataFrame(data, copy=False)
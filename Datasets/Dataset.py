@@ -1,27 +1,73 @@
-from random import sample
+import numpy as np
 
 
 class Dataset:
-    def __init__(self, df, attribute1, attribute2, type):
-        self.dataset = df
-        self.attributes = self.dataset[[attribute1, attribute2, type]].values.tolist()
+    def __init__(self, df, attribute1, attribute2, type, labels=None, seed=0):
+        """
+        The items are kept as columns: the two scoring attributes as float64 arrays, and the
+        protected type as small integer codes into self.labels. labels fixes the label table
+        (values missing from it get code -1); by default it is the sorted distinct values.
+        Sampling (set_portion) is seeded, so runs are reproducible.
+        """
+        import pandas as pd  # the sweep modules import Dataset, so keep pandas off their import path
+
+        if labels is None:
+            codes, labels = pd.factorize(df[type], sort=True)
+        else:
+            codes = pd.Categorical(df[type], categories=labels).codes
+        self.set_columns(df[attribute1].to_numpy(dtype=np.float64), df[attribute2].to_numpy(dtype=np.float64),
+                         codes, labels, seed)
+
+    def set_columns(self, xs, ys, groups, labels, seed=0):
+        """Set the items from ready-made columns (for datasets that are not read from a frame)."""
+        self.xs = xs
+        self.ys = ys
+        self.groups = groups.astype(np.min_scalar_type(-max(len(labels), 1)), copy=False)
+        self.labels = list(labels)
         self.oracle = None
-        self.portion = self.dataset.shape[0]
+        self.portion = len(self.xs)
+        self.rng = np.random.default_rng(seed)
+        self.sample = None
 
     def __len__(self):
-        return self.dataset.size
+        return len(self.xs)
+
+    def set_seed(self, seed):
+        self.rng = np.random.default_rng(seed)
+        self.set_portion(self.portion)
 
     def set_portion(self, portion):
+        """Draw a sample of `portion` items (all of them when portion is the dataset size)."""
         self.portion = portion
-        self.oracle.reset()
+        self.sample = None if portion >= len(self.xs) else \
+            np.sort(self.rng.choice(len(self.xs), portion, replace=False))
+        if self.oracle is not None:
+            self.oracle.reset()
+
+    def get_sample(self):
+        """Indices of the sampled items, or None when the whole dataset is used."""
+        return self.sample
+
+    def get_columns(self):
+        """
+        Return (xs, ys, groups) for the sampled items.
+        Without sampling these are the dataset's own arrays (read-only views, no copy).
+        """
+        if self.sample is None:
+            columns = (self.xs.view(), self.ys.view(), self.groups.view())
+            for column in columns:
+                column.flags.writeable = False
+            return columns
+        return self.xs[self.sample], self.ys[self.sample], self.groups[self.sample]
 
     def get_attributes(self) -> list:
-        return sample(self.attributes, self.portion)
+        """The sampled items as [x, y, group code] rows, for the list-based sweep."""
+        return [list(row) for row in zip(*(column.tolist() for column in self.get_columns()))]
 
     def set_oracle(self, oracle):
+        if hasattr(oracle, 'encode'):
+            oracle.encode(self.labels)
         self.oracle = oracle
 
     def get_oracle(self):
         return self.oracle
-
-
@@ -0,0 +1,20 @@
+import hashlib
+import os
+
+_file_hashes = {}
+
+
+def file_hash(path):
+    """
+    Content hash (sha256) of a dataset file.
+    Hashes are memoized per (path, mtime, size), so an unchanged file is only read once per process.
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+    if memo_key not in _file_hashes:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(2 ** 20), b''):
+                digest.update(chunk)
+        _file_hashes[memo_key] = digest.hexdigest()
+    return _file_hashes[memo_key]
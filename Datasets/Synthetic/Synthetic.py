@@ -0,0 +1,67 @@
+import numpy as np
+
+from Datasets.Dataset import Dataset
+from Datasets.COMPAS.Oracle import Oracle
+
+
+class Synthetic(Dataset):
+    """
+    Generated dataset for scaling tests of the sweep.
+
+    distribution sets the joint distribution of the two attributes:
+      • 'independent': x and y uniform on [0, 1].
+      • 'correlated' / 'anti-correlated': standard bivariate normal with correlation
+        +correlation / -correlation (anti-correlated items exchange the most).
+      • 'duplicates': every item is one of `distinct` independent uniform points, so most
+        items share their x and y with many others.
+    group_proportions gives the share of every group (labels 'g0', 'g1', ...); the first group
+    is the protected one, and group_shift is added to both attributes of its items (a negative
+    shift correlates the group with lower scores).
+
+    The items are generated chunk by chunk straight into the column arrays, so large instances
+    never hold more than one chunk of temporaries. The output is determined by seed (and
+    chunk_size).
+    """
+    DISTRIBUTIONS = ('independent', 'correlated', 'anti-correlated', 'duplicates')
+
+    def __init__(self, n=100000, distribution='independent', correlation=0.9, group_proportions=(0.5, 0.5),
+                 group_shift=0.0, distinct=1000, seed=0, chunk_size=2 ** 20):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"unknown distribution {distribution!r}, expected one of {self.DISTRIBUTIONS}")
+        proportions = np.asarray(group_proportions, dtype=np.float64)
+        proportions = proportions / proportions.sum()
+
+        rng = np.random.default_rng(seed)
+        xs = np.empty(n, dtype=np.float64)
+        ys = np.empty(n, dtype=np.float64)
+        groups = np.empty(n, dtype=np.min_scalar_type(-len(proportions)))
+        if distribution == 'duplicates':
+            points = rng.random((distinct, 2))
+        rho = -correlation if distribution == 'anti-correlated' else correlation
+
+        for start in range(0, n, chunk_size):
+            end = min(start + chunk_size, n)
+            size = end - start
+            x, y = xs[start:end], ys[start:end]
+            if distribution == 'independent':
+                rng.random(out=x)
+                rng.random(out=y)
+            elif distribution == 'duplicates':
+                chosen = rng.integers(0, distinct, size)
+                np.take(points[:, 0], chosen, out=x)
+                np.take(points[:, 1], chosen, out=y)
+            else:
+                rng.standard_normal(out=x)
+                rng.standard_normal(out=y)
+                y *= np.sqrt(1 - rho ** 2)
+                y += rho * x
+            chunk_groups = rng.choice(len(proportions), size, p=proportions)
+            groups[start:end] = chunk_groups
+            if group_shift:
+                protected = chunk_groups == 0
+                x[protected] += group_shift
+                y[protected] += group_shift
+
+        labels = [f'g{i}' for i in range(len(proportions))]
+        self.set_columns(xs, ys, groups, labels, seed)
+        self.set_oracle(Oracle(type_attr=labels[0]))
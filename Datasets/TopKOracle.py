@@ -0,0 +1,85 @@
+class TopKOracle:
+    """
+    Base class for fairness oracles that only look at the group counts in the top-k of a ranking.
+
+    Subclasses implement `top_k_for(n)` and `is_fair(counts)`. The class then provides both
+    evaluation modes used by the sweep:
+      • __call__(ranking): a full rescan of the top-k prefix (kept for verification).
+      • start(groups) / swap(i, upper_group, lower_group): an incremental mode that keeps the
+        group counts of the top-k up to date, so every check after an adjacent swap is O(1).
+
+    Groups are usually the integer codes of a Dataset; encode(labels) gives the oracle the label
+    table, and is_fair looks up the code of a label with code_of(label).
+    """
+    def __init__(self):
+        self.top_k = None
+        self.counts = {}
+        self.verdict = None
+        self.codes = {}
+
+    def encode(self, labels):
+        """Use the group codes of a dataset whose code i stands for labels[i]."""
+        self.codes = {label: code for code, label in enumerate(labels)}
+
+    def code_of(self, label):
+        """The group value of label in the rankings (the label itself before encode)."""
+        return self.codes.get(label, label)
+
+    def top_k_for(self, n):
+        """Return the size of the top segment for a ranking of n items."""
+        raise NotImplementedError
+
+    def is_fair(self, counts):
+        """Decide fairness from the group counts (a dict: group -> count) of the top-k."""
+        raise NotImplementedError
+
+    def params(self):
+        """Return the configuration of the oracle as a dict (used to key cached results)."""
+        raise NotImplementedError
+
+    def __call__(self, ranking):
+        # Sized for this ranking: the oracle may have judged rankings of another length before.
+        self.top_k = self.top_k_for(len(ranking))
+
+        counts = {}
+        for item in ranking[:self.top_k]:
+            counts[item[2]] = counts.get(item[2], 0) + 1
+        return self.is_fair(counts)
+
+    def start(self, groups):
+        """
+        Initialize the incremental state from the group labels of the ranking, in rank order.
+        Returns the verdict for that ranking.
+        """
+        self.top_k = self.top_k_for(len(groups))
+
+        self.counts = {}
+        for group in groups[:self.top_k]:
+            self.counts[group] = self.counts.get(group, 0) + 1
+        self.verdict = self.is_fair(self.counts)
+        return self.verdict
+
+    def swap(self, i, upper_group, lower_group):
+        """
+        Notify the oracle that the items at positions i and i+1 were exchanged.
+        upper_group is the group of the item now at position i, lower_group the one now at i+1.
+        Only a swap across the (k-1, k) boundary changes the top-k, so any other swap is free.
+        Returns the verdict for the new ranking.
+        """
+        if i == self.top_k - 1 and upper_group != lower_group:
+            self.counts[upper_group] = self.counts.get(upper_group, 0) + 1
+            self.counts[lower_group] -= 1
+            self.verdict = self.is_fair(self.counts)
+        return self.verdict
+
+    def watched_slots(self):
+        """
+        Positions i at which an exchange of items i and i+1 can change the verdict
+        (valid after start). Sweeps that serve many oracles use it to skip the other swaps.
+        """
+        return (self.top_k - 1,)
+
+    def reset(self):
+        self.top_k = None
+        self.counts = {}
+        self.verdict = None
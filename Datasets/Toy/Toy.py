@@ -3,26 +3,51 @@ import os
 import pandas as pd
 
 from Datasets.Dataset import Dataset
+from Datasets.TopKOracle import TopKOracle
+
+# Fixed label table of the color column, so that the group codes are known without the data.
+LABELS = ('blue', 'orange')
+
 
 def toy_oracle(order):
+    """
+    Full-rescan oracle: the top 4 of the [x, y, group] rows must hold as many blue items as
+    orange ones. Groups are codes into LABELS, as Toy.get_attributes returns them.
+    """
     count = {'blue': 0, 'orange': 0}
     for attr in order[:4]:
-        count[attr[2]] += 1
+        count[LABELS[attr[2]]] += 1
     return count['blue'] == count['orange']
 
 
+class ToyOracle(TopKOracle):
+    """
+    Incremental version of toy_oracle: the top 4 must hold as many blue items as orange ones.
+    """
+    def top_k_for(self, n):
+        return 4
+
+    def is_fair(self, counts):
+        return counts.get(self.code_of('blue'), 0) == counts.get(self.code_of('orange'), 0)
+
+    def params(self):
+        return {'top_k': 4}
+
+
 class Toy(Dataset):
+    DATASET_FILE = 'toy_data.csv'
+
     def __init__(self, attribute1='x', attribute2='y'):
         df = self.__load_and_preprocess(attribute1, attribute2)
-        super(Toy, self).__init__(df, attribute1, attribute2, 'color')
-        self.set_oracle(toy_oracle)
+        super(Toy, self).__init__(df, attribute1, attribute2, 'color', labels=LABELS)
+        self.set_oracle(ToyOracle())
 
-    def __len__(self):
-        return len(self.attributes)
+    @classmethod
+    def get_path(cls):
+        curr_path = os.path.dirname(os.path.realpath(__file__))
+        return os.path.join(curr_path, cls.DATASET_FILE)
 
     def __load_and_preprocess(self, attribute1, attribute2):
         # load the dataset
-        curr_path = os.path.dirname(os.path.realpath(__file__))
-        path = os.path.join(curr_path, "toy_data.csv")
-        df = pd.read_csv(path)
+        df = pd.read_csv(self.get_path())
         return df
\ No newline at end of file
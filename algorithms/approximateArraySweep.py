@@ -0,0 +1,96 @@
+import math
+from time import perf_counter
+
+import numpy as np
+
+from algorithms.sweepStats import SweepStats
+
+
+def verdict_at(xs, ys, groups, oracle, theta, k):
+    """
+    The oracle's verdict for the ranking by x + theta * y, without sorting it.
+
+    Ties are broken like the sweep orders the items just after theta (see ordering_at in
+    algorithms/parallelArraySweep.py): by decreasing y, then by id. Top-k oracles (see
+    Datasets/TopKOracle.py) only need the group counts of the top k items: np.partition finds the
+    k-th score in O(n), and only the items tied with it are ordered. Other oracles get the full
+    ranking as [x, y, group] rows.
+    """
+    scores = xs + theta * ys
+    if k is None:
+        order = np.lexsort((-ys, -scores))  # stable, so the last ties keep the id order
+        return oracle([list(row) for row in zip(xs[order].tolist(), ys[order].tolist(), groups[order].tolist())])
+    if k == 0:
+        return oracle.is_fair({})
+    if k < len(scores):
+        kth = np.partition(-scores, k - 1)[k - 1]
+        above = np.nonzero(-scores < kth)[0]
+        tied = np.nonzero(-scores == kth)[0]
+        top = np.concatenate((above, tied[np.lexsort((tied, -ys[tied]))][:k - len(above)]))
+    else:
+        top = slice(None)
+    codes, counts = np.unique(groups[top], return_counts=True)
+    return oracle.is_fair(dict(zip(codes.tolist(), counts.tolist())))
+
+
+def approximate_array_sweep(xs, ys, groups, oracle, epsilon=1e-3, step=None):
+    """
+    Approximate engine for the 2draysweep algorithm, for n too large for an exact sweep; see
+    two_d_array_sweep for the interface. The items are given as columns, like for
+    vectorized_array_sweep.
+
+    Instead of following the ordering exchanges, the oracle is evaluated on the top-k at angles
+    `step` apart over [0, π/2] (default epsilon), and every pair of neighbouring angles with
+    different verdicts is bisected until it is at most epsilon wide. The boundary is reported at
+    the upper end of that interval, so:
+      • every boundary is within epsilon above an angle where the exact verdict changes;
+      • every satisfactory region (or gap between regions) wider than `step` is found.
+    Narrower ones can be missed, so the default misses nothing wider than epsilon; a larger step
+    is faster but only guarantees regions wider than step. The cost is O(n) per evaluated angle:
+    about (π/2) / step + (number of boundaries) * log2(step / epsilon) of them.
+
+    The boundaries follow the same format as the exact engines: a region satisfactory at 0
+    starts at (0, 0) and one satisfactory at π/2 ends at (π/2, 1).
+    """
+    stats = SweepStats()
+    start_time = perf_counter()
+    step = step or epsilon
+    half_pi = math.pi / 2
+    n = len(xs)
+    if hasattr(oracle, 'top_k_for'):
+        oracle.reset()
+        k = oracle.top_k = min(oracle.top_k_for(n), n)
+    else:
+        k = None
+
+    def verdict(theta):
+        stats.oracle_calls += 1
+        return verdict_at(xs, ys, groups, oracle, theta, k)
+
+    angles = np.linspace(0, half_pi, max(math.ceil(half_pi / step), 1) + 1).tolist()
+    loop_time = perf_counter()
+    satisfactory_regions = []
+    low, fair = angles[0], verdict(angles[0])
+    if fair:
+        satisfactory_regions.append((0, 0))
+    for high in angles[1:]:
+        high_fair = verdict(high)
+        if high_fair != fair:
+            # Bisect (low, high] down to epsilon; the verdict changes inside it.
+            a, b = low, high
+            while b - a > epsilon:
+                middle = (a + b) / 2
+                if verdict(middle) == fair:
+                    a = middle
+                else:
+                    b = middle
+            satisfactory_regions.append((b, 0 if high_fair else 1))
+        low, fair = high, high_fair
+    if fair:
+        satisfactory_regions.append((half_pi, 1))
+
+    end_time = perf_counter()
+    stats.boundaries = len(satisfactory_regions)
+    stats.theta = half_pi
+    stats.phases = {'setup': loop_time - start_time, 'loop': end_time - loop_time, 'total': end_time - start_time}
+    return satisfactory_regions, stats
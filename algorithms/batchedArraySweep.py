@@ -0,0 +1,149 @@
+import heapq
+import math
+from time import perf_counter
+
+import numpy as np
+
+from algorithms.sweepStats import SweepStats, timed
+
+
+def collapse_points(xs, ys, groups):
+    """
+    Merge the items at identical (x, y) points into weighted multi-items.
+
+    Output:
+      - px, py: float64 arrays with the distinct points, sorted by decreasing x, then
+        decreasing y (the ordering of the sweep once the exchanges at 0 are done).
+      - members: for every multi-item, the groups of its items in id order. Items at one point
+        never exchange, so the sweep keeps them in that order.
+    """
+    order = np.lexsort((-ys, -xs))  # stable, so the items of one point stay in id order
+    sx, sy = xs[order], ys[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (sx[1:] != sx[:-1]) | (sy[1:] != sy[:-1])
+    starts = np.nonzero(first)[0]
+    members = [chunk.tolist() for chunk in np.split(groups[order], starts[1:])] if len(order) else []
+    return sx[starts], sy[starts], members
+
+
+def batched_array_sweep(xs, ys, groups, oracle, profile=False, hook=None):
+    """
+    Engine for top-k oracles (see Datasets/TopKOracle.py) that sweeps distinct points and
+    evaluates the oracle once per distinct angle; see two_d_array_sweep for the interface. The
+    items are given as columns, like for vectorized_array_sweep.
+
+    Integer attributes put many items at the same point and many exchanges at the same angle.
+    Identical points are collapsed into multi-items (see collapse_points), so the heap and the
+    exchanges are those of the distinct points. The exchanges at one angle are applied as a
+    batch and the oracle judges the ordering once the batch is done, from the group counts of
+    the top-k, which a multi-item across the k-th position splits in id order.
+
+    The boundaries are those of the orderings at every angle of [0, π/2], every exchange at or
+    below that angle done (see ordering_at in algorithms/parallelArraySweep.py). They are
+    not always the boundaries of the other engines, which judge the ordering after every single
+    exchange. Here the ordering at 0 is the one after the exchanges at 0, a verdict that flips and
+    flips back within one angle gives no (zero-width) region, and the initial exchanges beyond
+    π/2 are not swept. stats.exchanges counts the exchanges between multi-items.
+    """
+    stats = SweepStats()
+    start_time = perf_counter()
+    if hook is not None:
+        hook.on_start(stats)
+    if not hasattr(oracle, 'is_fair'):
+        raise ValueError("the batched engine needs a top-k oracle (see Datasets/TopKOracle.py)")
+    half_pi = math.pi / 2
+    px, py, members = collapse_points(xs, ys, groups)
+    m = len(members)
+    x = px.tolist()
+    y = py.tolist()
+    weights = [len(group_list) for group_list in members]
+
+    oracle.reset()
+    start = oracle.start if not profile else timed(oracle.start, stats)
+    is_fair = oracle.is_fair if not profile else timed(oracle.is_fair, stats)
+    fair = start([group for group_list in members for group in group_list])
+    k = oracle.top_k
+    counts = dict(oracle.counts)
+
+    order = list(range(m))
+    # offsets[p]: position of the first item of the multi-item at slot p.
+    offsets = np.concatenate(([0], np.cumsum(weights)[:-1])).tolist() if m else []
+    index = np.nonzero(py[:-1] < py[1:])[0]
+    exchanges = (px[index + 1] - px[index]) / (py[index] - py[index + 1])
+    keep = exchanges <= half_pi
+    heap = list(zip(exchanges[keep].tolist(), index[keep].tolist(), index[keep].tolist(), (index[keep] + 1).tolist()))
+    heapq.heapify(heap)
+
+    heappop, heappush = heapq.heappop, heapq.heappush
+    last = m - 2
+    satisfactory_regions = [(0, 0)] if fair else []
+    intersections_count = 0
+    stale = 0
+    evaluations = 1
+    peak_heap = len(heap)
+    next_hook = hook.every if hook is not None else -1
+    theta = 0
+    loop_time = perf_counter()
+    while heap:
+        theta = heap[0][0]
+        changed = False
+        # One batch: every exchange at theta, and the ones its exchanges bring forward.
+        while heap and heap[0][0] <= theta:
+            oe, p, upper, lower = heappop(heap)
+            if order[p] != upper or order[p + 1] != lower:
+                stale += 1
+                continue  # stale event; skip it.
+            order[p] = lower
+            order[p + 1] = upper
+            offset = offsets[p]
+            a, b = weights[upper], weights[lower]
+            offsets[p + 1] = offset + b
+            room = k - offset
+            if 0 < room < a + b:
+                # The k-th position falls inside the pair: the lower multi-item brings its items
+                # [max(0, room - a), min(b, room)) into the top-k, the upper one loses its items
+                # [max(0, room - b), min(a, room)).
+                for group in members[lower][max(0, room - a):min(b, room)]:
+                    counts[group] = counts.get(group, 0) + 1
+                for group in members[upper][max(0, room - b):min(a, room)]:
+                    counts[group] -= 1
+                changed = True
+            intersections_count += 1
+            if p > 0:
+                above = order[p - 1]
+                if y[above] < y[lower]:
+                    new_oe = (x[lower] - x[above]) / (y[above] - y[lower])
+                    if new_oe <= half_pi:
+                        heappush(heap, (new_oe, p - 1, above, lower))
+            if p < last:
+                below = order[p + 2]
+                if y[upper] < y[below]:
+                    new_oe = (x[below] - x[upper]) / (y[upper] - y[below])
+                    if new_oe <= half_pi:
+                        heappush(heap, (new_oe, p + 1, upper, below))
+            if len(heap) > peak_heap:
+                peak_heap = len(heap)
+            if intersections_count == next_hook:
+                next_hook += hook.every
+                stats.exchanges, stats.stale_events, stats.peak_heap, stats.theta = \
+                    intersections_count, stale, peak_heap, theta
+                hook.on_events(stats)
+
+        if changed:
+            evaluations += 1
+            verdict = is_fair(counts)
+            if verdict != fair:
+                satisfactory_regions.append((theta, 0 if verdict else 1))
+                fair = verdict
+
+    if fair:
+        satisfactory_regions.append((half_pi, 1))
+
+    end_time = perf_counter()
+    stats.exchanges, stats.stale_events, stats.peak_heap, stats.theta = intersections_count, stale, peak_heap, theta
+    stats.oracle_calls = evaluations
+    stats.boundaries = len(satisfactory_regions)
+    stats.phases = {'setup': loop_time - start_time, 'loop': end_time - loop_time, 'total': end_time - start_time}
+    if hook is not None:
+        hook.on_finish(stats)
+    return satisfactory_regions, stats
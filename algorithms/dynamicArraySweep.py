@@ -0,0 +1,383 @@
+import heapq
+import math
+
+import numpy as np
+
+from Datasets.Dataset import Dataset
+from algorithms.multiOracleSweep import OracleState
+from algorithms.parallelArraySweep import ordering_at
+from algorithms.vectorizedArraySweep import initial_state
+
+
+def band_events(xs, ys, lo, hi):
+    """
+    Sweep the exchanges up to π/2 and keep the ones at slots lo <= i < hi.
+
+    Output:
+      - thetas, slots, uppers, lowers: arrays describing every kept exchange, in sweep order;
+        upper and lower are the ids of the items at i and i+1 just before the exchange.
+    """
+    n = len(xs)
+    half_pi = math.pi / 2
+    order, heap = initial_state(xs, ys)
+    # Initial exchanges beyond π/2 are swept after all the others (see tail_exchanges).
+    heap = [event for event in heap if event[0] <= half_pi]
+    heapq.heapify(heap)
+    order = order.tolist()
+    x = xs.tolist()
+    y = ys.tolist()
+
+    heappop, heappush = heapq.heappop, heapq.heappush
+    last = n - 2
+    band = []
+    while heap:
+        event = heappop(heap)
+        oe, i, left, right = event
+        if order[i] != left or order[i + 1] != right:
+            continue  # stale event; skip it.
+        order[i] = right
+        order[i + 1] = left
+        if lo <= i < hi:
+            band.append(event)
+        if i > 0:
+            upper = order[i - 1]
+            if y[upper] < y[right]:
+                new_oe = (x[right] - x[upper]) / (y[upper] - y[right])
+                if new_oe <= half_pi:
+                    heappush(heap, (new_oe, i - 1, upper, right))
+        if i < last:
+            lower = order[i + 2]
+            if y[left] < y[lower]:
+                new_oe = (x[lower] - x[left]) / (y[left] - y[lower])
+                if new_oe <= half_pi:
+                    heappush(heap, (new_oe, i + 1, left, lower))
+
+    if not band:
+        return np.empty(0), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    thetas, slots, uppers, lowers = zip(*band)
+    return (np.array(thetas, dtype=np.float64), np.array(slots, dtype=np.int64),
+            np.array(uppers, dtype=np.int64), np.array(lowers, dtype=np.int64))
+
+
+def block_exchanges(ys, theta, block, top):
+    """
+    The exchanges the sweep makes at theta inside a block of items through one point.
+    block lists the items in their order just before theta (the initial order for 0), from
+    position top on; the sweep always applies the pending exchange at the smallest slot first.
+    """
+    y = ys
+    order = list(block)
+    heap = [(top + p, order[p], order[p + 1]) for p in range(len(order) - 1) if y[order[p]] < y[order[p + 1]]]
+    heapq.heapify(heap)
+    last = top + len(order) - 2
+    exchanges = []
+    while heap:
+        i, left, right = heapq.heappop(heap)
+        if order[i - top] != left or order[i - top + 1] != right:
+            continue  # stale event; skip it.
+        order[i - top] = right
+        order[i - top + 1] = left
+        exchanges.append((theta, i, left, right))
+        if i > top and y[order[i - top - 1]] < y[right]:
+            heapq.heappush(heap, (i - 1, order[i - top - 1], right))
+        if i < last and y[left] < y[order[i - top + 2]]:
+            heapq.heappush(heap, (i + 1, left, order[i - top + 2]))
+    return exchanges
+
+
+def tail_exchanges(xs, ys, order):
+    """
+    The exchanges the sweep makes after π/2: it seeds the exchanges of the initial ordering
+    `order` without the π/2 cut and applies the ones beyond π/2 that are still valid once
+    all the others are done. Returns them as (theta, i, upper, lower).
+    """
+    half_pi = math.pi / 2
+    index = np.nonzero(ys[order[:-1]] < ys[order[1:]])[0]
+    exchanges = (xs[order[index + 1]] - xs[order[index]]) / (ys[order[index]] - ys[order[index + 1]])
+    beyond = exchanges > half_pi
+    heap = list(zip(exchanges[beyond].tolist(), index[beyond].tolist(),
+                    order[index[beyond]].tolist(), order[index[beyond] + 1].tolist()))
+    if not heap:
+        return []
+    heapq.heapify(heap)
+    order, _ = ordering_at(xs, ys, half_pi)
+    x = xs.tolist()
+    y = ys.tolist()
+    last = len(order) - 2
+    swaps = []
+    while heap:
+        event = heapq.heappop(heap)
+        oe, i, left, right = event
+        if order[i] != left or order[i + 1] != right:
+            continue  # stale event; skip it.
+        order[i] = right
+        order[i + 1] = left
+        swaps.append(event)
+        if i > 0:
+            upper = order[i - 1]
+            if y[upper] < y[right]:
+                new_oe = (x[right] - x[upper]) / (y[upper] - y[right])
+                if new_oe <= half_pi:
+                    heapq.heappush(heap, (new_oe, i - 1, upper, right))
+        if i < last:
+            lower = order[i + 2]
+            if y[left] < y[lower]:
+                new_oe = (x[lower] - x[left]) / (y[left] - y[lower])
+                if new_oe <= half_pi:
+                    heapq.heappush(heap, (new_oe, i + 1, left, lower))
+    return swaps
+
+
+class DynamicArraySweep:
+    """
+    The satisfactory regions of a dataset that gains and loses items, without re-sweeping it.
+
+    A top-k oracle only looks at the exchanges at slot k-1 (the items at positions k-1 and k).
+    The structure keeps the exchanges of a band of slots around it, [lo, hi), recorded by one
+    full sweep. Inserting or deleting an item z only needs the exchanges that involve z:
+    its n crossings with the other items give its position at every angle, which tells how the
+    slot of every kept exchange shifts (by one when z is above the pair), and z's own crossings
+    are merged into the band. That is O(n log n + b) per update for b kept exchanges, instead
+    of the O(n² log n) of a new sweep. The band follows the items: at the angles where z is
+    above it, its slots shift with the exchanges, and where z is inside it, it grows or shrinks
+    by one, so no kept exchange is lost (see follow). Its bounds are step functions of the angle.
+    Only once slot k-1 (k follows the number of items) leaves it at some angle is the band
+    rebuilt by a full sweep, so `margin` slots on each side trade memory for fewer rebuilds.
+
+    Items are identified by their position in the columns, like the rows of a Dataset: insert
+    appends an item, and delete shifts the ids of the later items down by one.
+
+    regions() returns the boundaries two_d_array_sweep would return for the current items
+    (in id order), ties included: where z passes through a point shared by several items
+    (common with integer attributes), the exchanges of that block are swept again.
+    """
+    def __init__(self, dataset: Dataset, margin=32):
+        oracle = dataset.get_oracle()
+        if not hasattr(oracle, 'watched_slots'):
+            raise ValueError("DynamicArraySweep needs a top-k oracle (see Datasets/TopKOracle.py)")
+        xs, ys, groups = dataset.get_columns()
+        self.xs = np.array(xs, dtype=np.float64)
+        self.ys = np.array(ys, dtype=np.float64)
+        self.groups = np.array(groups)
+        self.labels = dataset.labels
+        self.oracle = oracle
+        self.margin = margin
+        self.rebuilds = 0
+        self.rebuild()
+
+    def __len__(self):
+        return len(self.xs)
+
+    def get_columns(self):
+        """The current items as (xs, ys, groups), see Dataset.get_columns."""
+        return self.xs, self.ys, self.groups
+
+    def top_k(self):
+        return self.oracle.top_k_for(len(self.xs))
+
+    def rebuild(self):
+        """Record the band around the current slot k-1 with a full sweep."""
+        k = self.top_k()
+        lo = max(k - 1 - self.margin, 0)
+        hi = min(k + self.margin, len(self.xs) - 1)
+        # The band is [los[j], his[j]) on the angles (edges[j-1], edges[j]], and [los[-1], his[-1])
+        # after the last edge.
+        self.edges = np.empty(0)
+        self.los = np.array([lo])
+        self.his = np.array([hi])
+        self.thetas, self.slots, self.uppers, self.lowers = band_events(self.xs, self.ys, lo, hi)
+        self.rebuilds += 1
+
+    def crossings(self, x, y, item):
+        """
+        Where item (at x, y, with id item) stands among the other items at every angle up to π/2.
+
+        Output:
+          - thetas: its exchanges with the other items, sorted.
+          - positions: its position just before each of them.
+          - others: the other item of each exchange.
+          - moves_up: whether the item passes the other one (rather than being passed).
+          - start: its position in the initial ordering.
+        """
+        xs, ys = self.xs, self.ys
+        ids = np.arange(len(xs))
+        # Ties in x keep id order, like the stable initial sort of the sweep.
+        above = (xs > x) | ((xs == x) & (ids < item))
+        passed = np.nonzero(above & (ys < y))[0]  # item passes them
+        passing = np.nonzero(~above & (ys > y))[0]  # they pass item (item itself is excluded)
+        thetas = np.concatenate(((x - xs[passed]) / (ys[passed] - y), (xs[passing] - x) / (y - ys[passing])))
+        others = np.concatenate((passed, passing))
+        moves_up = np.concatenate((np.ones(len(passed), dtype=bool), np.zeros(len(passing), dtype=bool)))
+        keep = thetas <= math.pi / 2
+        thetas, others, moves_up = thetas[keep], others[keep], moves_up[keep]
+        order = np.lexsort((others, thetas))
+        thetas, others, moves_up = thetas[order], others[order], moves_up[order]
+
+        start = int(above.sum())
+        steps = np.where(moves_up, -1, 1)
+        positions = start + np.concatenate(([0], np.cumsum(steps)[:-1])) if len(steps) else steps
+        return thetas, positions, others, moves_up, start
+
+    def position_at(self, thetas, positions, moves_up, start, angles):
+        """Position of an item at the given angles (before its own exchanges there), from crossings()."""
+        done = np.searchsorted(thetas, angles, side='left')
+        after = np.concatenate(([start], positions + np.where(moves_up, -1, 1)))
+        return after[done]
+
+    def follow(self, crossings, inserted):
+        """
+        The bounds of the band once the item of crossings is inserted (or deleted), as
+        (edges, los, his), see rebuild; the item's crossings become edges where needed.
+
+        Where the item is at position p, the kept exchanges at the slots from p on move down one
+        (up one for a deletion). An inserted item above the band moves the whole band down; one
+        inside it or just below adds its own exchanges, which are all kept, so the band grows by
+        one. A deleted item above the band moves it up; one inside it leaves a slot without its
+        exchanges there, so the band shrinks by one.
+        """
+        thetas, positions, _, moves_up, start = crossings
+        edges = np.union1d(self.edges, thetas)
+        index = np.searchsorted(self.edges, edges, side='left')
+        los = np.append(self.los[index], self.los[-1])
+        his = np.append(self.his[index], self.his[-1])
+        p = self.position_at(thetas, positions, moves_up, start, np.append(edges, math.inf))
+        if inserted:
+            return edges, los + (p < los), his + (p <= his + 1)
+        return edges, los - (p < los), his - (p <= his)
+
+    def resweep_blocks(self, item, crossings, events, own=None):
+        """
+        Redo the exchanges at the angles where item meets two or more other items at one point
+        (several crossings at one angle, or identical points): there the sweep reverses the
+        whole block, and the slots of its exchanges cannot be shifted one by one.
+
+        events are the kept exchanges (thetas, slots, uppers, lowers) after the shift and own
+        the inserted item's exchanges in the same form (None when item is being deleted);
+        returns them merged with the swept blocks.
+        """
+        thetas, positions, others, _, start = crossings
+        xs, ys = self.xs, self.ys
+        twins = np.nonzero((xs == xs[item]) & (ys == ys[item]))[0]
+        twins = twins[twins != item].tolist()
+        if twins:
+            angles = np.unique(thetas[thetas > 0])
+        else:
+            angles = np.unique(thetas[1:][(thetas[1:] == thetas[:-1]) & (thetas[1:] > 0)])
+        # At 0 the block is every item with the same x, in the id order of the initial sort,
+        # whether or not it exchanges with item.
+        same_x = np.nonzero(xs == xs[item])[0].tolist()
+        blocks = [(0.0, same_x, start - same_x.index(item))] if len(same_x) > 1 else []
+        for theta in angles.tolist():
+            first = np.searchsorted(thetas, theta, side='left')
+            end = np.searchsorted(thetas, theta, side='right')
+            # Just before theta the items through the point are ordered by y (identical ones by id).
+            block = sorted(set(others[first:end].tolist() + twins + [item]), key=lambda member: (ys[member], member))
+            blocks.append((theta, block, positions[first] - block.index(item)))
+
+        deleted = own is None
+        if deleted:
+            own = tuple(column[:0] for column in events)
+        if not blocks:
+            return [np.concatenate(columns) for columns in zip(events, own)]
+
+        event_thetas, _, uppers, lowers = events
+        drop = np.zeros(len(event_thetas), dtype=bool)
+        keep_own = np.ones(len(own[0]), dtype=bool)
+        swept = []
+        for theta, block, top in blocks:
+            keep_own[np.searchsorted(thetas, theta, side='left'):np.searchsorted(thetas, theta, side='right')] = False
+            # The update moves the bounds of the band by one at most.
+            band = np.searchsorted(self.edges, theta, side='left')
+            if top + len(block) - 1 <= self.los[band] - 1 or top >= self.his[band] + 1:
+                continue  # all of its exchanges are outside the band
+            members = np.array(block)
+            at = slice(np.searchsorted(event_thetas, theta, side='left'), np.searchsorted(event_thetas, theta, side='right'))
+            drop[at] |= np.isin(uppers[at], members) & np.isin(lowers[at], members)
+            if deleted:
+                block.remove(item)
+            swept.extend(block_exchanges(self.ys, theta, block, top))
+
+        swept = [np.array(column, dtype=dtype) for column, dtype in
+                 zip(zip(*swept), (np.float64, np.int64, np.int64, np.int64))] if swept else \
+            [np.empty(0), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)]
+        return [np.concatenate((column[~drop], own_column[keep_own], swept_column))
+                for column, own_column, swept_column in zip(events, own, swept)]
+
+    def insert(self, x, y, group):
+        """Add an item (group is a label of the dataset) and return its id."""
+        code = self.labels.index(group) if group in self.labels else -1
+        item = len(self.xs)
+        crossings = self.crossings(x, y, item)
+        thetas, positions, others, moves_up, start = crossings
+
+        # Kept exchanges below the new item keep their slot, the ones above it move down one.
+        position = self.position_at(thetas, positions, moves_up, start, self.thetas)
+        events = (self.thetas, self.slots + (position <= self.slots), self.uppers, self.lowers)
+        # The new item's own exchanges: passing `other` from below, or being passed by it.
+        own = (thetas, np.where(moves_up, positions - 1, positions), np.where(moves_up, others, item),
+               np.where(moves_up, item, others))
+
+        self.xs = np.append(self.xs, x)
+        self.ys = np.append(self.ys, y)
+        self.groups = np.append(self.groups, np.array(code, dtype=self.groups.dtype))
+        self.merge(*self.resweep_blocks(item, crossings, events, own), self.follow(crossings, True))
+        return item
+
+    def delete(self, item):
+        """Remove the item with id item; the ids after it shift down by one."""
+        crossings = self.crossings(self.xs[item], self.ys[item], item)
+        thetas, positions, others, moves_up, start = crossings
+
+        keep = (self.uppers != item) & (self.lowers != item)
+        event_thetas, slots = self.thetas[keep], self.slots[keep]
+        position = self.position_at(thetas, positions, moves_up, start, event_thetas)
+        events = (event_thetas, slots - (position < slots), self.uppers[keep], self.lowers[keep])
+        thetas, slots, uppers, lowers = self.resweep_blocks(item, crossings, events)
+        bounds = self.follow(crossings, False)
+
+        self.xs = np.delete(self.xs, item)
+        self.ys = np.delete(self.ys, item)
+        self.groups = np.delete(self.groups, item)
+        self.merge(thetas, slots, uppers - (uppers > item), lowers - (lowers > item), bounds)
+
+    def merge(self, thetas, slots, uppers, lowers, bounds):
+        """
+        Take the new bounds of the band (see follow), keep the exchanges inside it, in sweep
+        order, and rebuild if slot k-1 left it.
+        """
+        edges, los, his = bounds
+        los = np.maximum(los, 0)
+        his = np.minimum(his, len(self.xs) - 1)
+        # Merge the angle ranges the update left with the same bounds.
+        keep = (los[:-1] != los[1:]) | (his[:-1] != his[1:])
+        self.edges = edges[keep]
+        self.los = np.append(los[:-1][keep], los[-1])
+        self.his = np.append(his[:-1][keep], his[-1])
+        index = np.searchsorted(self.edges, thetas, side='left')
+        inside = (slots >= self.los[index]) & (slots < self.his[index])
+        thetas, slots, uppers, lowers = thetas[inside], slots[inside], uppers[inside], lowers[inside]
+        # A stable sort keeps the recorded sweep order of the exchanges at one angle.
+        order = np.argsort(thetas, kind='stable')
+        self.thetas, self.slots, self.uppers, self.lowers = thetas[order], slots[order], uppers[order], lowers[order]
+        k = self.top_k()
+        if k >= 1 and not self.los.max() <= k - 1 < self.his.min():
+            self.rebuild()
+
+    def regions(self):
+        """The boundaries of the satisfactory regions of the current items (see two_d_array_sweep)."""
+        xs, ys, groups = self.xs, self.ys, self.groups.tolist()
+        oracle = self.oracle
+        oracle.reset()
+        order = np.argsort(-xs, kind='stable')
+        state = OracleState(oracle, oracle.start([groups[item] for item in order.tolist()]))
+
+        k = oracle.top_k
+        tail = tail_exchanges(xs, ys, order)
+        at_k = np.nonzero(self.slots == k - 1)[0]
+        for theta, upper, lower in zip(self.thetas[at_k].tolist(), self.uppers[at_k].tolist(),
+                                       self.lowers[at_k].tolist()):
+            state.update(theta, oracle.swap(k - 1, groups[lower], groups[upper]))
+        for theta, i, upper, lower in tail:
+            if i == k - 1:
+                state.update(theta, oracle.swap(i, groups[lower], groups[upper]))
+        return state.finish()
@@ -0,0 +1,244 @@
+import bisect
+import heapq
+import math
+from time import perf_counter
+
+import numpy as np
+
+from algorithms.dynamicArraySweep import tail_exchanges
+from algorithms.multiOracleSweep import OracleState
+from algorithms.sweepStats import SweepStats, timed
+
+
+def boundary_exchanges(y, block, slot):
+    """
+    The exchanges at one slot of a block of items through one point, as block_exchanges in
+    algorithms/dynamicArraySweep.py makes them, without making all the others.
+
+    Applying the pending exchange at the smallest slot first is an insertion sort of the block
+    by decreasing y: every item in turn moves up past the items above it with a smaller y.
+    slot is relative to the start of the block.
+
+    Output:
+      - exchanges: the (upper, lower) pairs exchanged at slot, in sweep order.
+      - order: the block after the sweep.
+    """
+    keys = []
+    exchanges = []
+    for j, item in enumerate(block):
+        key = (-y[item], j, item)
+        p = bisect.bisect_left(keys, key)
+        if p <= slot < j:
+            exchanges.append((keys[slot][2], item))
+        keys.insert(p, key)
+    return exchanges, [key[2] for key in keys]
+
+
+def k_level_array_sweep(xs, ys, groups, oracle, profile=False, hook=None):
+    """
+    Exact engine for top-k oracles (see Datasets/TopKOracle.py) that only follows the exchanges
+    at the top-k boundary; see two_d_array_sweep for the interface. The items are given as
+    columns, like for vectorized_array_sweep.
+
+    The verdict of a top-k oracle only changes when the k-th and the (k+1)-th items exchange, so
+    instead of the whole ordering the sweep keeps two kinetic heaps: a min-heap of the top-k
+    (its root is the k-th item) and a max-heap of the other items (its root is the (k+1)-th).
+    Every parent/child pair of a heap, and the two roots, hold a certificate: the angle where
+    their order fails, found in a priority queue. A failing heap certificate swaps the pair
+    inside its heap; a failing root certificate is an exchange at slot k-1, and moves the two
+    items across. Only these certificates are processed, instead of the O(n²) exchanges of the
+    full sweep. Where several items pass through one point at the boundary (ties, common with
+    integer attributes), the exchanges of that block at slot k-1 are replayed in the order of the
+    full sweep (see boundary_exchanges), so the boundaries are the ones two_d_array_sweep returns for the other engines.
+
+    stats.exchanges counts the exchanges at slot k-1, and stale_events the certificates that
+    were invalidated before they failed; the hook is called every hook.every certificates.
+    """
+    stats = SweepStats()
+    start_time = perf_counter()
+    if hook is not None:
+        hook.on_start(stats)
+    if not hasattr(oracle, 'watched_slots'):
+        raise ValueError("the k-level engine needs a top-k oracle (see Datasets/TopKOracle.py)")
+    half_pi = math.pi / 2
+    inf = math.inf
+    n = len(xs)
+    x = xs.tolist()
+    y = ys.tolist()
+    group = groups.tolist()
+
+    oracle.reset()
+    order = np.argsort(-xs, kind='stable')
+    start = oracle.start if not profile else timed(oracle.start, stats)
+    swap = oracle.swap if not profile else timed(oracle.swap, stats)
+    state = OracleState(oracle, start([group[item] for item in order.tolist()]))
+    stats.oracle_calls = 1
+    k = oracle.top_k
+    tail = tail_exchanges(xs, ys, order)
+
+    def above(u, v, theta):
+        """Whether u is above v just after theta."""
+        if x[u] > x[v] or (x[u] == x[v] and u < v):
+            return not (y[u] < y[v] and (x[v] - x[u]) / (y[u] - y[v]) <= theta)
+        return y[v] < y[u] and (x[u] - x[v]) / (y[v] - y[u]) <= theta
+
+    def failure(u, v, theta):
+        """The angle from theta on where u stops being above v (theta if it is not now), or inf."""
+        if x[u] > x[v] or (x[u] == x[v] and u < v):
+            if y[u] < y[v]:
+                meet = (x[v] - x[u]) / (y[u] - y[v])
+                if meet <= half_pi:
+                    return max(meet, theta)
+            return inf
+        return inf if y[v] < y[u] and (x[u] - x[v]) / (y[v] - y[u]) <= theta else theta
+
+    def through(u, v, theta):
+        """Whether u and v pass through one point at theta (have the same score there)."""
+        if theta == 0:
+            return x[u] == x[v]
+        if y[u] == y[v]:
+            return x[u] == x[v]
+        if x[u] > x[v] or (x[u] == x[v] and u < v):
+            u, v = v, u
+        return (x[u] - x[v]) / (y[v] - y[u]) == theta
+
+    # heaps[0] is the top-k (lowest item at the root), heaps[1] the rest (highest at the root);
+    # side and place locate every item.
+    heaps = (order[:k].tolist(), order[k:].tolist())
+    side = [0] * n
+    place = [0] * n
+    for h, heap in enumerate(heaps):
+        for p, item in enumerate(heap):
+            side[item], place[item] = h, p
+    queue = []
+
+    def first(h, u, v, theta):
+        """Whether u belongs closer to the root of heap h than v."""
+        return above(v, u, theta) if h == 0 else above(u, v, theta)
+
+    def certify(h, p, theta):
+        """Queue the certificate of the node at p with its parent (or of the roots, for p == 0)."""
+        heap = heaps[h]
+        if p == 0:
+            if heaps[0] and heaps[1]:
+                upper, lower = heaps[0][0], heaps[1][0]
+                t = failure(upper, lower, theta)
+                if t != inf:
+                    heapq.heappush(queue, (t, 1, 0, 0, upper, lower))
+        elif p < len(heap):
+            child, parent = heap[p], heap[(p - 1) // 2]
+            t = failure(child, parent, theta) if h == 0 else failure(parent, child, theta)
+            if t != inf:
+                heapq.heappush(queue, (t, 0, h, p, child, parent))
+
+    def exchange(h, p, q):
+        heap = heaps[h]
+        heap[p], heap[q] = heap[q], heap[p]
+        place[heap[p]], place[heap[q]] = p, q
+
+    def sift(h, p, theta, moved):
+        """Restore heap h around the node at p; adds the positions that changed to moved."""
+        heap = heaps[h]
+        moved.add(p)
+        while p > 0 and first(h, heap[p], heap[(p - 1) // 2], theta):
+            exchange(h, p, (p - 1) // 2)
+            p = (p - 1) // 2
+            moved.add(p)
+        while 2 * p + 1 < len(heap):
+            c = 2 * p + 1
+            if c + 1 < len(heap) and first(h, heap[c + 1], heap[c], theta):
+                c += 1
+            if not first(h, heap[c], heap[p], theta):
+                break
+            exchange(h, p, c)
+            p = c
+            moved.add(p)
+
+    def recertify(h, moved, theta):
+        for p in moved:
+            certify(h, p, theta)
+            certify(h, 2 * p + 1, theta)
+            certify(h, 2 * p + 2, theta)
+
+    def block(theta):
+        """The items through the point where the two roots meet, in their order before theta."""
+        point = heaps[0][0]
+        parts = []
+        for heap in heaps:
+            members, stack = [], [0]
+            while stack:
+                p = stack.pop()
+                if p < len(heap) and (heap[p] == point or through(heap[p], point, theta)):
+                    members.append(heap[p])
+                    stack.extend((2 * p + 1, 2 * p + 2))
+            # Just before theta the block is ordered by y (identical items by id); at 0 by id.
+            parts.append(sorted(members, key=(lambda item: item) if theta == 0 else (lambda item: (y[item], item))))
+        return parts
+
+    next_hook = hook.every if hook is not None else -1
+    events = 0
+    theta = 0
+    loop_time = perf_counter()
+    if 0 < k < n:
+        for h, heap in enumerate(heaps):
+            moved = set()
+            for p in reversed(range(len(heap) // 2)):
+                sift(h, p, 0, moved)
+            for p in range(1, len(heap)):
+                certify(h, p, 0)
+        certify(0, 0, 0)
+        stats.peak_heap = len(queue)
+
+    while queue:
+        theta, kind, h, p, upper, lower = heapq.heappop(queue)
+        if kind == 0:
+            heap = heaps[h]
+            if p >= len(heap) or heap[p] != upper or heap[(p - 1) // 2] != lower:
+                stats.stale_events += 1
+                continue
+            exchange(h, p, (p - 1) // 2)
+            recertify(h, (p, (p - 1) // 2), theta)
+        else:
+            if heaps[0][0] != upper or heaps[1][0] != lower:
+                stats.stale_events += 1
+                continue
+            top_part, rest_part = block(theta)
+            swept, members = boundary_exchanges(y, top_part + rest_part, len(top_part) - 1)
+            for left, right in swept:
+                state.update(theta, swap(k - 1, group[right], group[left]))
+            stats.exchanges += len(swept)
+            stats.oracle_calls += len(swept)
+            # The items that crossed the boundary trade their places in the two heaps.
+            entering = [item for item in members[:len(top_part)] if side[item] == 1]
+            leaving = [item for item in members[len(top_part):] if side[item] == 0]
+            moved = (set(), set())
+            for into, out in zip(entering, leaving):
+                p, q = place[out], place[into]
+                heaps[0][p], heaps[1][q] = into, out
+                side[into], place[into], side[out], place[out] = 0, p, 1, q
+            for item in entering + leaving:
+                sift(side[item], place[item], theta, moved[side[item]])
+            recertify(0, moved[0], theta)
+            recertify(1, moved[1], theta)
+            certify(0, 0, theta)
+        events += 1
+        stats.peak_heap = max(stats.peak_heap, len(queue))
+        if events == next_hook:
+            next_hook += hook.every
+            stats.theta = theta
+            hook.on_events(stats)
+
+    for theta, i, upper, lower in tail:
+        if i == k - 1:
+            state.update(theta, swap(i, group[lower], group[upper]))
+            stats.exchanges += 1
+            stats.oracle_calls += 1
+    satisfactory_regions = state.finish()
+
+    end_time = perf_counter()
+    stats.boundaries = len(satisfactory_regions)
+    stats.theta = half_pi
+    stats.phases = {'setup': loop_time - start_time, 'loop': end_time - loop_time, 'total': end_time - start_time}
+    if hook is not None:
+        hook.on_finish(stats)
+    return satisfactory_regions, stats
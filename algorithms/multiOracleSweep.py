@@ -0,0 +1,146 @@
+import heapq
+import math
+from time import perf_counter
+
+from Datasets.Dataset import Dataset
+from algorithms.sweepStats import SweepStats
+from algorithms.vectorizedArraySweep import initial_state
+
+
+class OracleState:
+    """Boundary bookkeeping of one oracle during a shared sweep."""
+    __slots__ = ("oracle", "regions", "fair")
+
+    def __init__(self, oracle, fair):
+        self.oracle = oracle
+        # A satisfactory initial ordering opens a region at 0.
+        self.regions = [(0, 0)] if fair else []
+        self.fair = fair
+
+    def update(self, theta, new_sign):
+        """
+        Record the verdict after an exchange at theta, exactly as two_d_array_sweep does: every
+        change of verdict is a boundary, a start when the ordering becomes satisfactory.
+        """
+        if self.fair != new_sign:
+            self.regions.append((theta, 0 if new_sign else 1))
+        self.fair = new_sign
+
+    def finish(self):
+        if self.fair:
+            self.regions.append((math.pi / 2, 1))
+        return self.regions
+
+
+def two_d_array_sweep_many(dataset: Dataset, oracles: list, incremental=True):
+    """
+    Run one 2draysweep pass over the exchange events of the dataset and evaluate many
+    fairness oracles on it at once.
+
+    Input:
+      - dataset: an instance of Dataset; only its columns and labels are used, its oracle is ignored.
+      - oracles: a list of fairness oracles over the dataset's type column (for instance one
+        COMPAS Oracle per protected value and threshold).
+      - incremental: use the oracles' incremental protocol when they have one.
+
+    Output:
+      - A list with the boundary list of every oracle, in the order of `oracles`. Each one is
+        the same as two_d_array_sweep would return for that oracle.
+      - A SweepStats of the (single) sweep; oracle_calls and boundaries add up all the oracles.
+
+    Oracles exposing watched_slots() (such as TopKOracle) are only notified of the exchanges
+    at those positions, so the cost of an exchange does not grow with the number of oracles.
+    Other incremental oracles are notified of every exchange, and plain callables rescan the
+    ordering after every exchange.
+    """
+    stats = SweepStats()
+    start_time = perf_counter()
+    xs, ys, groups = dataset.get_columns()
+    n = len(xs)
+    groups = groups.tolist()
+
+    order, heap = initial_state(xs, ys)
+    order = order.tolist()
+    x = xs.tolist()
+    y = ys.tolist()
+    half_pi = math.pi / 2
+
+    states = []
+    watchers = {}  # position -> states of the oracles watching it
+    every_swap = []  # incremental oracles without watched_slots
+    rescans = []  # oracles that rescan the whole ranking
+    ranking = None
+    ranked_groups = [groups[item] for item in order]
+    for oracle in oracles:
+        if hasattr(oracle, 'encode'):
+            oracle.encode(dataset.labels)
+        if hasattr(oracle, 'reset'):
+            oracle.reset()  # it may have judged other rankings before
+        if incremental and hasattr(oracle, 'start'):
+            state = OracleState(oracle, oracle.start(ranked_groups))
+            if hasattr(oracle, 'watched_slots'):
+                for i in oracle.watched_slots():
+                    watchers.setdefault(i, []).append(state)
+            else:
+                every_swap.append(state)
+        else:
+            if ranking is None:
+                ranking = [[x[item], y[item], groups[item]] for item in order]
+            state = OracleState(oracle, oracle(ranking))
+            rescans.append(state)
+        states.append(state)
+    oracle_calls = len(states)
+
+    heappop, heappush = heapq.heappop, heapq.heappush
+    last = n - 2
+    intersections_count = 0
+    stale = 0
+    peak_heap = len(heap)
+    theta = 0
+    loop_time = perf_counter()
+    while heap:
+        oe, i, left, right = heappop(heap)
+        if order[i] != left or order[i + 1] != right:
+            stale += 1
+            continue  # stale event; skip it.
+        order[i] = right
+        order[i + 1] = left
+        intersections_count += 1
+        theta = oe
+        if i > 0:
+            upper = order[i - 1]
+            if y[upper] < y[right]:
+                new_oe = (x[right] - x[upper]) / (y[upper] - y[right])
+                # avoid adding events that their angle exceeds the required range
+                if new_oe <= half_pi:
+                    heappush(heap, (new_oe, i - 1, upper, right))
+        if i < last:
+            lower = order[i + 2]
+            if y[left] < y[lower]:
+                new_oe = (x[lower] - x[left]) / (y[left] - y[lower])
+                if new_oe <= half_pi:
+                    heappush(heap, (new_oe, i + 1, left, lower))
+        if len(heap) > peak_heap:
+            peak_heap = len(heap)
+
+        watching = watchers.get(i)
+        if watching or every_swap:
+            upper_group, lower_group = groups[right], groups[left]
+            for state in watching or ():
+                state.update(oe, state.oracle.swap(i, upper_group, lower_group))
+            for state in every_swap:
+                state.update(oe, state.oracle.swap(i, upper_group, lower_group))
+            oracle_calls += len(watching or ()) + len(every_swap)
+        if rescans:
+            ranking[i], ranking[i + 1] = ranking[i + 1], ranking[i]
+            for state in rescans:
+                state.update(oe, state.oracle(ranking))
+            oracle_calls += len(rescans)
+
+    all_regions = [state.finish() for state in states]
+    end_time = perf_counter()
+    stats.exchanges, stats.stale_events, stats.peak_heap, stats.theta = intersections_count, stale, peak_heap, theta
+    stats.oracle_calls = oracle_calls
+    stats.boundaries = sum(len(regions) for regions in all_regions)
+    stats.phases = {'setup': loop_time - start_time, 'loop': end_time - loop_time, 'total': end_time - start_time}
+    return all_regions, stats
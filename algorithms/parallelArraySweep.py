@@ -0,0 +1,243 @@
+import heapq
+import math
+import os
+from time import perf_counter
+
+import numpy as np
+
+from algorithms.sweepStats import SweepStats
+from algorithms.vectorizedArraySweep import initial_state
+
+SAMPLE_PAIRS = 100000
+
+_sweep = None
+
+
+def sector_bounds(xs, ys, sectors, seed=0):
+    """
+    Split [0, π/2] into at most `sectors` ranges holding about the same number of exchanges.
+
+    Every pair of items exchanges at most once, at (x_r - x_l) / (y_l - y_r), so the exchange
+    values of a random sample of pairs estimate where the work of the sweep lies.
+    Returns the sorted inner bounds.
+    """
+    n = len(xs)
+    if sectors < 2 or n < 2:
+        return []
+    rng = np.random.default_rng(seed)
+    left = rng.integers(0, n, SAMPLE_PAIRS)
+    right = rng.integers(0, n, SAMPLE_PAIRS)
+    # Orient each pair by the initial ordering (descending x), then keep the pairs that exchange.
+    upper = np.where(xs[left] >= xs[right], left, right)
+    lower = np.where(xs[left] >= xs[right], right, left)
+    swapping = ys[upper] < ys[lower]
+    exchanges = (xs[lower][swapping] - xs[upper][swapping]) / (ys[upper][swapping] - ys[lower][swapping])
+    exchanges = exchanges[(exchanges > 0) & (exchanges < math.pi / 2)]
+    if len(exchanges) == 0:
+        return []
+    bounds = np.quantile(exchanges, np.arange(1, sectors) / sectors)
+    return sorted(set(bounds.tolist()))
+
+
+def ordering_at(xs, ys, theta):
+    """
+    The ordering reached by the serial sweep once every exchange at or below theta is done:
+    item u precedes v if u starts first and they do not exchange by theta, or the other way round.
+    Returns (order, rank) where rank is the position of every item in the initial ordering.
+    """
+    start = np.argsort(-xs, kind='stable')
+    rank = np.empty(len(xs), dtype=np.int64)
+    rank[start] = np.arange(len(xs))
+    if theta is None:
+        return start.tolist(), rank
+
+    # Sort by score at theta. Items with equal scores have exchanged at theta, which leaves them
+    # by decreasing y; identical points never exchange and keep their initial order.
+    order = np.lexsort((rank, -ys, -(xs + theta * ys)))
+
+    def precedes(u, v):
+        """Vectorized: does u precede v at theta? (same arithmetic as the sweep)"""
+        first = np.where(rank[u] < rank[v], u, v)
+        second = np.where(rank[u] < rank[v], v, u)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            exchanged = (ys[first] < ys[second]) & \
+                ((xs[second] - xs[first]) / (ys[first] - ys[second]) <= theta)
+        return (first == u) != exchanged
+
+    # Rounding in the scores can misplace items whose exchange is within an ulp of theta.
+    # Repair those with an insertion sort that uses the exact test.
+    if not precedes(order[:-1], order[1:]).all():
+        order = order.tolist()
+        for p in range(1, len(order)):
+            item = order[p]
+            q = p
+            while q > 0 and not precedes(np.array([order[q - 1]]), np.array([item]))[0]:
+                order[q] = order[q - 1]
+                q -= 1
+            order[q] = item
+        return order, rank
+    return order.tolist(), rank
+
+
+def _init_worker(xs, ys, groups, oracle, incremental):
+    global _sweep
+    _sweep = (xs, ys, groups, oracle, incremental)
+
+
+def sweep_sector(low, high):
+    """
+    Sweep the exchanges in (low, high] (every exchange up to high when low is None).
+
+    Output:
+      - The oracle's verdict for the ordering at low.
+      - The verdict changes as (theta, verdict).
+      - The number of exchanges processed.
+      - The number of stale events skipped and the peak size of the sector's heap.
+    """
+    xs, ys, groups, oracle, incremental = _sweep
+    n = len(xs)
+    groups = groups.tolist()
+    half_pi = math.pi / 2
+    tail = []
+    if low is None or high == half_pi:
+        initial_order, initial_events = initial_state(xs, ys)
+        # The serial sweep seeds the exchanges of the initial ordering without the π/2 cut, and
+        # pops the ones beyond π/2 that are still valid after all the others. The last sector
+        # does the same.
+        if high == half_pi:
+            tail = [event for event in initial_events if event[0] > half_pi]
+    if low is None:
+        order = initial_order.tolist()
+        heap = [event for event in initial_events if event[0] <= high]
+    else:
+        order, _ = ordering_at(xs, ys, low)
+        ox = xs[order]
+        oy = ys[order]
+        index = np.nonzero(oy[:-1] < oy[1:])[0]
+        exchanges = (ox[index + 1] - ox[index]) / (oy[index] - oy[index + 1])
+        keep = (exchanges > low) & (exchanges <= high)
+        index = index[keep]
+        heap = list(zip(exchanges[keep].tolist(), index.tolist(),
+                        [order[i] for i in index.tolist()], [order[i + 1] for i in index.tolist()]))
+
+    x = xs.tolist()
+    y = ys.tolist()
+    if incremental and hasattr(oracle, 'start'):
+        fair = oracle.start([groups[item] for item in order])
+
+        def check(i):
+            return oracle.swap(i, groups[order[i]], groups[order[i + 1]])
+    else:
+        ranking = [[x[item], y[item], groups[item]] for item in order]
+        fair = oracle(ranking)
+
+        def check(i):
+            ranking[i], ranking[i + 1] = ranking[i + 1], ranking[i]
+            return oracle(ranking)
+
+    heappop, heappush = heapq.heappop, heapq.heappush
+    last = n - 2
+    changes = []
+    verdict = fair
+    count = 0
+    stale = 0
+    peak_heap = len(heap)
+    for heap in (heap, tail):
+        heapq.heapify(heap)
+        while heap:
+            oe, i, left, right = heappop(heap)
+            if order[i] != left or order[i + 1] != right:
+                stale += 1
+                continue  # stale event; skip it.
+            order[i] = right
+            order[i + 1] = left
+            count += 1
+            if i > 0:
+                upper = order[i - 1]
+                if y[upper] < y[right]:
+                    new_oe = (x[right] - x[upper]) / (y[upper] - y[right])
+                    # exchanges beyond the sector are swept by the next worker
+                    if new_oe <= high:
+                        heappush(heap, (new_oe, i - 1, upper, right))
+            if i < last:
+                lower = order[i + 2]
+                if y[left] < y[lower]:
+                    new_oe = (x[lower] - x[left]) / (y[left] - y[lower])
+                    if new_oe <= high:
+                        heappush(heap, (new_oe, i + 1, left, lower))
+            if len(heap) > peak_heap:
+                peak_heap = len(heap)
+
+            new_verdict = check(i)
+            if new_verdict != verdict:
+                changes.append((oe, new_verdict))
+                verdict = new_verdict
+
+    return fair, changes, count, stale, peak_heap
+
+
+def stitch(sector_results):
+    """
+    Merge the per-sector results, in angle order, into the boundaries of the serial sweep:
+    a satisfactory initial ordering opens a region at 0, every later change of verdict is a
+    boundary, and a satisfactory final ordering closes the last region at π/2.
+    Returns the boundaries and the total number of exchanges.
+    """
+    total = sum(result[2] for result in sector_results)
+    fair = sector_results[0][0]
+    satisfactory_regions = [(0, 0)] if fair else []
+
+    for _, changes, _, *_ in sector_results:
+        for theta, verdict in changes:
+            satisfactory_regions.append((theta, 0 if verdict else 1))
+            fair = verdict
+
+    if fair:
+        satisfactory_regions.append((math.pi / 2, 1))
+    return satisfactory_regions, total
+
+
+def parallel_array_sweep(xs, ys, groups, oracle, incremental=True, workers=None, sectors=None, profile=False,
+                         hook=None):
+    """
+    Parallel engine for the 2draysweep algorithm; see two_d_array_sweep for the interface.
+    The items are given as columns, like for vectorized_array_sweep.
+
+    [0, π/2] is split into sectors holding about the same number of exchanges. Every worker
+    builds the ordering at the start of its sector directly (a sort by score at that angle),
+    seeds its own event queue with the exchanges of the sector, sweeps it and reports the
+    verdict at the start together with the verdict changes inside. The driver stitches them
+    into the same boundaries and exchange count as the serial engines.
+
+    workers: size of the process pool (default: CPU count); sectors: default one per worker.
+    The stats add up the exchanges, stale events and oracle calls of the sectors, and peak_heap
+    is the largest sector heap. The oracle runs in the workers, so profile is not supported
+    (oracle_time stays None) and a hook only gets on_start and on_finish.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    stats = SweepStats()
+    start_time = perf_counter()
+    if hook is not None:
+        hook.on_start(stats)
+    workers = workers or os.cpu_count()
+    sectors = sectors or workers
+    bounds = sector_bounds(xs, ys, sectors)
+    lows = [None] + bounds
+    highs = bounds + [math.pi / 2]
+    with ProcessPoolExecutor(min(workers, len(lows)), initializer=_init_worker,
+                             initargs=(xs, ys, groups, oracle, incremental)) as executor:
+        loop_time = perf_counter()
+        sector_results = list(executor.map(sweep_sector, lows, highs))
+    satisfactory_regions, stats.exchanges = stitch(sector_results)
+
+    end_time = perf_counter()
+    stats.stale_events = sum(result[3] for result in sector_results)
+    stats.peak_heap = max(result[4] for result in sector_results)
+    stats.oracle_calls = stats.exchanges + len(sector_results)
+    stats.boundaries = len(satisfactory_regions)
+    stats.theta = math.pi / 2
+    stats.phases = {'setup': loop_time - start_time, 'loop': end_time - loop_time, 'total': end_time - start_time}
+    if hook is not None:
+        hook.on_finish(stats)
+    return satisfactory_regions, stats
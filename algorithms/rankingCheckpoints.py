@@ -0,0 +1,129 @@
+import heapq
+import math
+from array import array
+
+import numpy as np
+
+from Datasets.Dataset import Dataset
+from algorithms.vectorizedArraySweep import initial_state
+
+
+def sweep_checkpoints(xs, ys, every):
+    """
+    Sweep the exchanges up to π/2, saving the ordering every `every` exchanges.
+
+    Output:
+      - checkpoints: a C×n int32 array, row c being the ordering after c * every exchanges
+        (row 0 is the initial ordering).
+      - thetas, slots, lowers: the swap log, one entry per exchange in sweep order: its angle,
+        its slot i, and the item that moves up from i+1 to i.
+    """
+    n = len(xs)
+    half_pi = math.pi / 2
+    order, heap = initial_state(xs, ys)
+    # Initial exchanges beyond π/2 are swept after all the others (see tail_exchanges), past
+    # every angle a query can ask for.
+    heap = [event for event in heap if event[0] <= half_pi]
+    heapq.heapify(heap)
+    order = order.tolist()
+    x = xs.tolist()
+    y = ys.tolist()
+
+    heappop, heappush = heapq.heappop, heapq.heappush
+    last = n - 2
+    checkpoints = [np.array(order, dtype=np.int32)]
+    # Typed arrays keep the log at 16 bytes per exchange while it grows.
+    thetas, slots, lowers = array('d'), array('i'), array('i')
+    while heap:
+        oe, i, left, right = heappop(heap)
+        if order[i] != left or order[i + 1] != right:
+            continue  # stale event; skip it.
+        order[i] = right
+        order[i + 1] = left
+        thetas.append(oe)
+        slots.append(i)
+        lowers.append(right)
+        if len(thetas) % every == 0:
+            checkpoints.append(np.array(order, dtype=np.int32))
+        if i > 0:
+            upper = order[i - 1]
+            if y[upper] < y[right]:
+                new_oe = (x[right] - x[upper]) / (y[upper] - y[right])
+                if new_oe <= half_pi:
+                    heappush(heap, (new_oe, i - 1, upper, right))
+        if i < last:
+            lower = order[i + 2]
+            if y[left] < y[lower]:
+                new_oe = (x[lower] - x[left]) / (y[left] - y[lower])
+                if new_oe <= half_pi:
+                    heappush(heap, (new_oe, i + 1, left, lower))
+
+    return (np.stack(checkpoints), np.frombuffer(thetas, dtype=np.float64), np.frombuffer(slots, dtype=np.int32),
+            np.frombuffer(lowers, dtype=np.int32))
+
+
+class RankingCheckpoints:
+    """
+    The ordering of a dataset at any angle in [0, π/2], without re-scoring and sorting it.
+
+    One sweep keeps the ordering every `every` exchanges (a checkpoint) and the log of the
+    exchanges between them. The ordering at theta is the nearest checkpoint at or before it
+    with at most `every` exchanges of the log replayed on top: O(n + every) for the whole
+    ordering, O(k + every) for the top-k, which only replays the exchanges at slots below k.
+    Memory is 4n bytes per checkpoint plus 16 bytes per exchange, so `every` trades query time
+    for memory.
+
+    Items are identified by their position in the columns, like the rows of a Dataset.
+    The orderings are the ones the sweep checks with the oracle: ordering_at(theta) holds every
+    exchange at or below theta (see algorithms/parallelArraySweep.py).
+    """
+    def __init__(self, dataset: Dataset, every=1024):
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        xs, ys, _ = dataset.get_columns()
+        self.every = every
+        self.checkpoints, self.thetas, self.slots, self.lowers = sweep_checkpoints(
+            np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64), every)
+
+    def __len__(self):
+        return self.checkpoints.shape[1]
+
+    @property
+    def nbytes(self):
+        return self.checkpoints.nbytes + self.thetas.nbytes + self.slots.nbytes + self.lowers.nbytes
+
+    def locate(self, theta):
+        """The checkpoint to start from and the slice of the log to replay on it for theta."""
+        end = int(np.searchsorted(self.thetas, theta, side='right'))
+        checkpoint = min(end // self.every, len(self.checkpoints) - 1)
+        return checkpoint, checkpoint * self.every, end
+
+    def ordering_at(self, theta):
+        """The ids of all the items in their order at theta."""
+        checkpoint, begin, end = self.locate(theta)
+        order = self.checkpoints[checkpoint].tolist()
+        for i in self.slots[begin:end].tolist():
+            order[i], order[i + 1] = order[i + 1], order[i]
+        return order
+
+    def top_k_at(self, theta, k):
+        """The ids of the first k items at theta."""
+        checkpoint, begin, end = self.locate(theta)
+        top = self.checkpoints[checkpoint, :k].tolist()
+        slots = self.slots[begin:end]
+        inside = np.nonzero(slots < k)[0]
+        for i, lower in zip(slots[inside].tolist(), self.lowers[begin:end][inside].tolist()):
+            if i == k - 1:
+                top[i] = lower  # the item at k-1 leaves the top-k
+            else:
+                top[i], top[i + 1] = top[i + 1], top[i]
+        return top
+
+    def ranking(self, w1: float, w2: float, k=None):
+        """
+        The ordering (or its top-k) by the score w1 * x + w2 * y, which is the ordering of the
+        sweep at theta = w2 / w1 (the sweep scores x + theta * y). Weights beyond π/2, and w1 == 0,
+        give the ordering at π/2, the end of the sweep.
+        """
+        theta = math.pi / 2 if w1 == 0 else min(w2 / w1, math.pi / 2)
+        return self.ordering_at(theta) if k is None else self.top_k_at(theta, k)
@@ -0,0 +1,175 @@
+import math
+
+import numpy as np
+
+from Datasets.Dataset import Dataset
+from Datasets.TopKOracle import TopKOracle
+from algorithms.dynamicArraySweep import tail_exchanges
+from algorithms.multiOracleSweep import OracleState
+from algorithms.parallelArraySweep import ordering_at
+
+
+def earlier_at_least(values):
+    """
+    For every position i, the number of positions j < i with values[j] >= values[i].
+
+    A bottom-up merge sort: at every level the entries of each left block are sorted, so the
+    entries of the right block next to it count theirs with one vectorized binary search.
+    O(n log n) in total (the stable sort only merges two sorted runs per block).
+    """
+    n = len(values)
+    ranks = np.unique(values, return_inverse=True)[1].astype(np.int64).reshape(-1)
+    counts = np.zeros(n, dtype=np.int64)
+    index = np.arange(n)  # the position of every entry
+    sorted_ranks = ranks  # the ranks, sorted within blocks of width
+    span = n + 1
+    width = 1
+    while width < n:
+        block = np.arange(n) // width
+        pair = block // 2
+        keys = pair * span + sorted_ranks
+        left = block % 2 == 0
+        left_keys = keys[left]
+        right = ~left
+        counts[index[right]] += (np.searchsorted(left_keys, (pair[right] + 1) * span) -
+                                 np.searchsorted(left_keys, keys[right]))
+        order = np.argsort(keys, kind='stable')
+        index, sorted_ranks = index[order], sorted_ranks[order]
+        width *= 2
+    return counts
+
+
+def skyband_counts(xs, ys):
+    """
+    For every item, the number of items that stay above it, and below it, at every angle.
+
+    v stays above u when it is above u in the initial ordering (higher x, or the same x and a
+    lower id) and y_v >= y_u: the sweep only exchanges an adjacent pair whose lower item has
+    the higher y, so such a pair is never exchanged, not even after π/2.
+    """
+    order = np.argsort(-xs, kind='stable')
+    y = ys[order]
+    above = np.empty(len(xs), dtype=np.int64)
+    below = np.empty(len(xs), dtype=np.int64)
+    above[order] = earlier_at_least(y)
+    below[order] = earlier_at_least(-y[::-1])[::-1]
+    return above, below
+
+
+class FixedCountsOracle(TopKOracle):
+    """
+    A top-k oracle over the contested items only: the items that are always in the top-k
+    are folded in as fixed group counts, and the top segment shrinks by their number.
+    """
+    def __init__(self, oracle, fixed, top_k):
+        super(FixedCountsOracle, self).__init__()
+        self.oracle = oracle
+        self.fixed = fixed
+        self.full_top_k = top_k
+
+    def encode(self, labels):
+        self.oracle.encode(labels)
+
+    def code_of(self, label):
+        return self.oracle.code_of(label)
+
+    def top_k_for(self, n):
+        return self.full_top_k - sum(self.fixed.values())
+
+    def is_fair(self, counts):
+        merged = dict(self.fixed)
+        for group, count in counts.items():
+            merged[group] = merged.get(group, 0) + count
+        return self.oracle.is_fair(merged)
+
+    def params(self):
+        return self.oracle.params()
+
+
+class ContestedItems(Dataset):
+    """
+    The items of a dataset that can both enter and leave the top-k, built by prune_skyband.
+    kept holds their ids in the original columns (in order, so ties keep their order), and
+    forced the ids of the items that are always in the top-k.
+    """
+    def __init__(self, xs, ys, groups, labels, kept, forced):
+        self.set_columns(xs, ys, groups, labels)
+        self.kept = kept
+        self.forced = forced
+
+
+def prune_skyband(dataset: Dataset):
+    """
+    Drop the items that never change the verdict of a top-k oracle (see Datasets/TopKOracle.py),
+    in O(n log n), before the quadratic sweep.
+
+    With the weights (1, θ) for θ in [0, π/2], an item that stays below at least k items (outside
+    the k-skyband) is never in the top-k, and one that stays above at least n-k items is always
+    in it. Neither kind is ever exchanged at slot k-1, so the sweep of the remaining items, with
+    the always-in items folded into the oracle as fixed counts (FixedCountsOracle), sees the same
+    verdict at every angle up to π/2. The returned ContestedItems can be passed to
+    two_d_array_sweep like the dataset itself; pruned_regions turns the boundaries it gets into
+    the ones of the whole dataset.
+    """
+    oracle = dataset.get_oracle()
+    if not hasattr(oracle, 'top_k_for'):
+        raise ValueError("skyband pruning needs a top-k oracle (see Datasets/TopKOracle.py)")
+    xs, ys, groups = dataset.get_columns()
+    n = len(xs)
+    oracle.reset()
+    k = oracle.top_k = min(oracle.top_k_for(n), n)
+
+    above, below = skyband_counts(xs, ys)
+    forced = np.nonzero(below >= n - k)[0]
+    kept = np.nonzero((above < k) & (below < n - k))[0]
+    codes, counts = np.unique(groups[forced], return_counts=True)
+
+    contested = ContestedItems(xs[kept], ys[kept], groups[kept], dataset.labels, kept, forced)
+    contested.set_oracle(FixedCountsOracle(oracle, dict(zip(codes.tolist(), counts.tolist())), k))
+    return contested
+
+
+def verdict(oracle, groups, order):
+    """The verdict of a top-k oracle on the items of order."""
+    oracle.reset()
+    return oracle.start([groups[item] for item in order])
+
+
+def pruned_regions(dataset: Dataset, contested: ContestedItems, satisfactory_regions):
+    """
+    The boundaries two_d_array_sweep returns for dataset, from the ones it returns for the
+    contested items (see prune_skyband). O(n log n) plus the exchanges beyond π/2.
+
+    Up to π/2 both sweeps see the same verdicts, so they make the same boundaries. The initial
+    exchanges beyond π/2 that are left at the end (see tail_exchanges) depend on which items
+    start out adjacent, so the contested items have different ones: their boundaries beyond π/2
+    are dropped and the exchanges beyond π/2 of the whole dataset are replayed.
+    """
+    half_pi = math.pi / 2
+    xs, ys, groups = dataset.get_columns()
+    groups = groups.tolist()
+    contested_xs, contested_ys, contested_groups = contested.get_columns()
+    contested_groups = contested_groups.tolist()
+    contested_oracle = contested.get_oracle()
+
+    # The verdict over the contested items after their own exchanges beyond π/2.
+    order = ordering_at(contested_xs, contested_ys, half_pi)[0]
+    for _, i, upper, lower in tail_exchanges(contested_xs, contested_ys,
+                                             np.argsort(-contested_xs, kind='stable')):
+        order[i], order[i + 1] = lower, upper
+    final_fair = verdict(contested_oracle, contested_groups, order)
+
+    boundaries = list(satisfactory_regions)
+    if final_fair and boundaries:
+        boundaries.pop()  # the end the sweep appends at π/2
+    boundaries = [boundary for boundary in boundaries if boundary[0] <= half_pi]
+
+    oracle = dataset.get_oracle()
+    order = ordering_at(xs, ys, half_pi)[0]
+    state = OracleState(oracle, verdict(oracle, groups, order))
+    state.regions = boundaries
+    k = oracle.top_k
+    for theta, i, upper, lower in tail_exchanges(xs, ys, np.argsort(-xs, kind='stable')):
+        if i == k - 1:
+            state.update(theta, oracle.swap(i, groups[lower], groups[upper]))
+    return state.finish()
@@ -0,0 +1,142 @@
+import heapq
+import math
+from array import array
+
+import numpy as np
+
+from Datasets.Dataset import Dataset
+from algorithms.multiOracleSweep import OracleState
+from algorithms.vectorizedArraySweep import initial_state
+
+TRACE_VERSION = 1
+
+
+class SwapTrace:
+    """
+    The exchanges of a sweep, which only depend on the two scoring attributes: the initial
+    ordering (item ids) and, for every exchange in sweep order, its angle, its slot i, and the
+    items that move up (from i+1 to i) and down. Replaying it with any oracle over the same
+    items gives the boundaries two_d_array_sweep would return, without sweeping again.
+    """
+    def __init__(self, order, thetas, slots, rising, falling, stale=0, peak_heap=0):
+        self.order = order
+        self.thetas = thetas
+        self.slots = slots
+        self.rising = rising
+        self.falling = falling
+        self.stale = stale
+        self.peak_heap = peak_heap
+
+    def __len__(self):
+        return len(self.thetas)
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in (self.order, self.thetas, self.slots, self.rising, self.falling))
+
+    def save(self, path):
+        """Write the trace as an uncompressed .npz file (NumPy adds the suffix if it is missing)."""
+        np.savez(path, version=TRACE_VERSION, order=self.order, thetas=self.thetas, slots=self.slots,
+                 rising=self.rising, falling=self.falling, counts=np.array([self.stale, self.peak_heap]))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            if int(data['version']) != TRACE_VERSION:
+                raise ValueError(f"{path} has trace version {int(data['version'])}, expected {TRACE_VERSION}")
+            stale, peak_heap = data['counts'].tolist()
+            return cls(data['order'], data['thetas'], data['slots'], data['rising'], data['falling'], stale, peak_heap)
+
+
+def record_trace(xs, ys):
+    """
+    Sweep the exchanges of the items (xs, ys) without an oracle and return their SwapTrace.
+    Like the other engines, the initial exchanges beyond π/2 are kept and swept last.
+    """
+    n = len(xs)
+    half_pi = math.pi / 2
+    order, heap = initial_state(xs, ys)
+    initial = order.astype(np.int32)
+    order = order.tolist()
+    x = xs.tolist()
+    y = ys.tolist()
+
+    heappop, heappush = heapq.heappop, heapq.heappush
+    last = n - 2
+    stale = 0
+    peak_heap = len(heap)
+    # Typed arrays keep the trace at 20 bytes per exchange while it grows.
+    thetas, slots, rising, falling = array('d'), array('i'), array('i'), array('i')
+    while heap:
+        oe, i, left, right = heappop(heap)
+        if order[i] != left or order[i + 1] != right:
+            stale += 1
+            continue  # stale event; skip it.
+        order[i] = right
+        order[i + 1] = left
+        thetas.append(oe)
+        slots.append(i)
+        rising.append(right)
+        falling.append(left)
+        if i > 0:
+            upper = order[i - 1]
+            if y[upper] < y[right]:
+                new_oe = (x[right] - x[upper]) / (y[upper] - y[right])
+                # avoid adding events that their angle exceeds the required range
+                if new_oe <= half_pi:
+                    heappush(heap, (new_oe, i - 1, upper, right))
+        if i < last:
+            lower = order[i + 2]
+            if y[left] < y[lower]:
+                new_oe = (x[lower] - x[left]) / (y[left] - y[lower])
+                if new_oe <= half_pi:
+                    heappush(heap, (new_oe, i + 1, left, lower))
+        if len(heap) > peak_heap:
+            peak_heap = len(heap)
+
+    return SwapTrace(initial, np.frombuffer(thetas, dtype=np.float64), np.frombuffer(slots, dtype=np.int32),
+                     np.frombuffer(rising, dtype=np.int32), np.frombuffer(falling, dtype=np.int32), stale, peak_heap)
+
+
+def replay_trace(trace: SwapTrace, dataset: Dataset, oracle=None, incremental=True):
+    """
+    The boundaries of the satisfactory regions of oracle (by default the dataset's), from a
+    trace recorded over the same items; the same as two_d_array_sweep returns.
+
+    Returns the boundaries and the number of oracle calls. Oracles exposing watched_slots()
+    (such as TopKOracle) are only called for the exchanges at those slots, picked out with array
+    operations, so replaying costs a linear scan of the trace. Other incremental oracles are
+    called for every exchange, and plain callables rescan the ordering after every exchange.
+    """
+    xs, ys, groups = dataset.get_columns()
+    if len(xs) != len(trace.order):
+        raise ValueError(f"the trace was recorded over {len(trace.order)} items, the dataset has {len(xs)}")
+    if oracle is None:
+        oracle = dataset.get_oracle()
+    elif hasattr(oracle, 'encode'):
+        oracle.encode(dataset.labels)
+    if hasattr(oracle, 'reset'):
+        oracle.reset()  # both branches start from a fresh oracle, whatever it judged before
+    groups = groups.tolist()
+    order = trace.order.tolist()
+
+    if incremental and hasattr(oracle, 'start'):
+        state = OracleState(oracle, oracle.start([groups[item] for item in order]))
+        if hasattr(oracle, 'watched_slots'):
+            exchanges = np.nonzero(np.isin(trace.slots, list(oracle.watched_slots())))[0]
+        else:
+            exchanges = np.arange(len(trace))
+        swap = oracle.swap
+        for theta, i, upper, lower in zip(trace.thetas[exchanges].tolist(), trace.slots[exchanges].tolist(),
+                                          trace.rising[exchanges].tolist(), trace.falling[exchanges].tolist()):
+            state.update(theta, swap(i, groups[upper], groups[lower]))
+        return state.finish(), len(exchanges) + 1
+
+    x = xs.tolist()
+    y = ys.tolist()
+    ranking = [[x[item], y[item], groups[item]] for item in order]
+    state = OracleState(oracle, oracle(ranking))
+    for theta, i in zip(trace.thetas.tolist(), trace.slots.tolist()):
+        ranking[i], ranking[i + 1] = ranking[i + 1], ranking[i]
+        state.update(theta, oracle(ranking))
+    return state.finish(), len(trace) + 1
@@ -0,0 +1,84 @@
+from time import perf_counter
+
+
+class SweepStats:
+    """
+    Statistics of one sweep, returned by two_d_array_sweep next to the boundaries.
+
+      • exchanges: ordering exchanges processed (real swaps).
+      • stale_events: popped events that no longer matched the ordering and were skipped.
+      • oracle_calls: fairness checks (the initial one plus one per exchange, or per exchange at
+        a watched slot when a trace is replayed).
+      • oracle_time: seconds spent in the oracle; only measured when the sweep runs with
+        profile=True (None otherwise), since timing every call slows the loop down.
+      • peak_heap: largest number of pending events.
+      • boundaries: number of boundaries returned.
+      • phases: wall-clock seconds of the 'setup' (initial ordering, events, first oracle check)
+        and 'loop' phases, and the 'total' (which includes a 'prune' phase when there is one).
+        The list-based and numpy engines also report the 'sort' by x that starts their setup.
+        A sweep that writes a trace has 'record' and 'replay' phases instead of 'setup' and 'loop'.
+      • theta: the angle reached, kept up to date for hooks.
+    """
+    __slots__ = ("exchanges", "stale_events", "oracle_calls", "oracle_time", "peak_heap", "boundaries",
+                 "phases", "theta")
+
+    def __init__(self):
+        self.exchanges = 0
+        self.stale_events = 0
+        self.oracle_calls = 0
+        self.oracle_time = None
+        self.peak_heap = 0
+        self.boundaries = 0
+        self.phases = {}
+        self.theta = 0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"SweepStats({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)})"
+
+
+class SweepHook:
+    """
+    Opt-in callbacks of a sweep, for progress meters or sampling profilers.
+    on_events is called after every `every` exchanges, with the stats updated so far.
+    A sweep without a hook pays a single integer comparison per exchange.
+    """
+    every = 100000
+
+    def on_start(self, stats):
+        pass
+
+    def on_events(self, stats):
+        pass
+
+    def on_finish(self, stats):
+        pass
+
+
+class ProgressHook(SweepHook):
+    """Report the angle reached and the exchanges processed every `every` exchanges."""
+    def __init__(self, every=100000, log=print):
+        self.every = every
+        self.log = log
+
+    def on_events(self, stats):
+        self.log(f"theta {stats.theta:.4f}: {stats.exchanges} exchanges, {stats.stale_events} stale, "
+                 f"heap peak {stats.peak_heap}")
+
+    def on_finish(self, stats):
+        self.log(f"done: {stats.exchanges} exchanges, {stats.boundaries} boundaries "
+                 f"in {stats.phases['total']:.3f} s")
+
+
+def timed(check, stats):
+    """Wrap a fairness check so that the time spent in it is added to stats.oracle_time."""
+    stats.oracle_time = stats.oracle_time or 0.0
+
+    def timed_check(*args):
+        begin = perf_counter()
+        verdict = check(*args)
+        stats.oracle_time += perf_counter() - begin
+        return verdict
+    return timed_check
@@ -1,22 +1,21 @@
 import math
-from DataStructures.MinHeap import MinHeap
-from Datasets.Dataset import Dataset
-
-
-class Node:
-    __slots__ = ("ordering_exchange", "attribute1", "attribute2", "index")
+from time import perf_counter
 
-    def __init__(self, ordering_exchange, attribute1, attribute2, index):
-        self.ordering_exchange = ordering_exchange  # computed angle (in radians)
-        self.attribute1 = attribute1  # left item (a [x, y] pair)
-        self.attribute2 = attribute2  # right item (a [x, y] pair)
-        self.index = index  # position in the current ordering
+import numpy as np
 
-    def __lt__(self, other):
-        return self.ordering_exchange < other.ordering_exchange
+from DataStructures.IndexedMinHeap import IndexedMinHeap
+from Datasets.Dataset import Dataset
+from algorithms.approximateArraySweep import approximate_array_sweep
+from algorithms.batchedArraySweep import batched_array_sweep
+from algorithms.dynamicArraySweep import tail_exchanges
+from algorithms.kLevelArraySweep import k_level_array_sweep
+from algorithms.parallelArraySweep import parallel_array_sweep
+from algorithms.skybandPruning import prune_skyband, pruned_regions
+from algorithms.swapTrace import record_trace, replay_trace
+from algorithms.sweepStats import SweepStats, timed
+from algorithms.vectorizedArraySweep import vectorized_array_sweep
 
-    def __repr__(self):
-        return f'({self.attribute1}, {self.attribute2})'
+ENGINES = ('python', 'numpy', 'parallel', 'approximate', 'klevel', 'batched')
 
 
 def calc_ordering_exchange(attr_left, attr_right):
@@ -35,7 +34,8 @@ def update_event(i, ordering, heap):
     """
     For index i, if the adjacent pair (ordering[i], ordering[i+1])
     can exchange order (i.e. left.y < right.y), compute the ordering
-    exchange and push a new Node onto the heap.
+    exchange and set it as the key of slot i in the heap.
+    Otherwise, slot i has no pending event and is removed from the heap.
     """
     n = len(ordering)
     if i < 0 or i >= n - 1:
@@ -45,10 +45,11 @@ def update_event(i, ordering, heap):
     y_right = ordering[i + 1][1]
     if y_left < y_right:
         oe = calc_ordering_exchange(ordering[i], ordering[i + 1])
-        # avoid adding nodes that their angle exceeds the required range
-        if oe > math.pi / 2:
+        # avoid adding events that their angle exceeds the required range
+        if oe <= math.pi / 2:
+            heap.push(i, oe)
             return
-        heap.push(Node(oe, ordering[i], ordering[i + 1], i))
+    heap.remove(i)
 
 
 def swap_in_ordering(ordering, i):
@@ -58,70 +59,212 @@ def swap_in_ordering(ordering, i):
     ordering[i], ordering[i + 1] = ordering[i + 1], ordering[i]
 
 def get_theta_and_update_the_event(heap, ordering):
-    node = heap.pop()
-    theta = node.ordering_exchange
-    # Check if the event is still valid.
-    if ordering[node.index] != node.attribute1 or ordering[node.index + 1] != node.attribute2:
-        return None  # stale event; skip it.
-    swap_in_ordering(ordering, node.index)
+    """
+    Pop the next event and apply it. Returns (theta, index) of the exchange.
+    The heap holds exactly one event per adjacent slot, so popped events are never stale.
+    """
+    index, theta = heap.pop()
+    swap_in_ordering(ordering, index)
     # Update events for the affected adjacent pairs.
-    update_event(node.index - 1, ordering, heap)
-    update_event(node.index + 1, ordering, heap)
-    return theta
+    update_event(index - 1, ordering, heap)
+    update_event(index + 1, ordering, heap)
+    return theta, index
+
+
+def make_fairness_check(oracle, ordering, incremental=True, stats=None):
+    """
+    Prepare the fairness checks for a sweep over `ordering`.
+    Returns (fair, check): the verdict for the current ordering, and a function check(i)
+    to call right after the items at positions i and i+1 were exchanged.
+
+    Oracles that implement the incremental protocol (start/swap, see Datasets/TopKOracle.py)
+    are updated in O(1) per exchange. Plain callables, or incremental=False, fall back to
+    a full oracle(ordering) rescan after every exchange.
+    With stats, the time spent in the oracle is added to stats.oracle_time.
+    """
+    if incremental and hasattr(oracle, 'start'):
+        oracle.reset()
+        start = oracle.start if stats is None else timed(oracle.start, stats)
+        fair = start([item[2] for item in ordering])
+
+        def check(i):
+            return oracle.swap(i, ordering[i][2], ordering[i + 1][2])
+    else:
+        fair = (oracle if stats is None else timed(oracle, stats))(ordering)
 
+        def check(i):
+            return oracle(ordering)
 
-def two_d_array_sweep(dataset: Dataset):
+    return fair, check if stats is None else timed(check, stats)
+
+
+def traced_array_sweep(dataset: Dataset, trace, incremental=True, hook=None):
+    """Record the exchanges of the dataset, write them to the file trace, and replay them with its oracle."""
+    stats = SweepStats()
+    start_time = perf_counter()
+    if hook is not None:
+        hook.on_start(stats)
+    xs, ys, _ = dataset.get_columns()
+    swap_trace = record_trace(xs, ys)
+    swap_trace.save(trace)
+    replay_time = perf_counter()
+    satisfactory_regions, stats.oracle_calls = replay_trace(swap_trace, dataset, incremental=incremental)
+
+    end_time = perf_counter()
+    stats.exchanges, stats.stale_events, stats.peak_heap = len(swap_trace), swap_trace.stale, swap_trace.peak_heap
+    stats.theta = math.pi / 2
+    stats.boundaries = len(satisfactory_regions)
+    stats.phases = {'record': replay_time - start_time, 'replay': end_time - replay_time,
+                    'total': end_time - start_time}
+    if hook is not None:
+        hook.on_finish(stats)
+    return satisfactory_regions, stats
+
+
+def two_d_array_sweep(dataset: Dataset, incremental=True, engine='python', workers=None, profile=False,
+                      hook=None, epsilon=1e-3, prune=False, trace=None):
     """
     Implements the 2draysweep algorithm.
 
     Input:
       - dataset: an instance of Dataset that provides:
-           • get_attributes(): returns a list of [x, y] pairs.
+           • get_attributes(): returns a list of [x, y, group] items (list-based engine).
+           • get_columns(): returns the same items as (xs, ys, groups) arrays (other engines).
            • get_oracle(): returns a fairness oracle function that takes the ordering and returns True/False.
+      - incremental: use the oracle's incremental protocol when it has one. Set to False to
+        rescan the whole ordering after every exchange (useful for verification).
+      - engine: 'python' (list based), 'numpy' (vectorized setup, integer-id event loop) or
+        'parallel' (angle sectors swept by a process pool). All engines return the same boundaries.
+        'approximate' samples angles instead of sweeping and returns boundaries within epsilon,
+        finding every region wider than epsilon (see algorithms/approximateArraySweep.py); its stats count oracle calls, not exchanges.
+        'klevel' (top-k oracles only) follows the exchanges at the top-k boundary with kinetic
+        heaps instead of sweeping all of them (see algorithms/kLevelArraySweep.py).
+        'batched' (top-k oracles only) collapses identical points and judges the ordering once
+        per distinct angle; it leaves out the zero-width regions of ties, so its boundaries can
+        differ from the other engines' (see algorithms/batchedArraySweep.py).
+      - workers: number of processes for the parallel engine (default: CPU count).
+      - epsilon: angular tolerance of the approximate engine.
+      - profile: also measure the time spent in the oracle (stats.oracle_time).
+      - hook: an optional SweepHook (see algorithms/sweepStats.py), called every hook.every
+        exchanges. The parallel engine only calls its on_start and on_finish.
+      - prune: first drop the items that can never enter or leave the top-k (top-k oracles
+        only, see algorithms/skybandPruning.py); stats.phases['prune'] holds the time it took.
+      - trace: a file name; the exchanges are recorded without the oracle, written there as a
+        SwapTrace and replayed with the oracle (see algorithms/swapTrace.py), whatever the engine.
+        replay_trace evaluates other oracles on the same items from that file without sweeping.
 
     Output:
       - A list of boundaries defining satisfactory regions.
         Each boundary is a tuple (theta, boundary_type), where boundary_type is 0 (start) or 1 (end).
+      - A SweepStats with the number of ordering exchanges processed by the sweep, the stale
+        events skipped, the oracle calls, the peak heap size and the phase timings.
     """
-    ordering = dataset.get_attributes()  # list of [x, y] pairs
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine {engine!r}, expected one of {ENGINES}")
+
+    if prune:
+        begin = perf_counter()
+        contested = prune_skyband(dataset)
+        prune_time = perf_counter() - begin
+        satisfactory_regions, stats = two_d_array_sweep(contested, incremental, engine, workers, profile, hook, epsilon,
+                                                        trace=trace)
+        if engine not in ('approximate', 'batched'):
+            begin = perf_counter()
+            satisfactory_regions = pruned_regions(dataset, contested, satisfactory_regions)
+            prune_time += perf_counter() - begin
+        stats.boundaries = len(satisfactory_regions)
+        stats.phases['prune'] = prune_time
+        stats.phases['total'] += prune_time
+        return satisfactory_regions, stats
+
+    if trace is not None:
+        return traced_array_sweep(dataset, trace, incremental, hook)
+
     oracle = dataset.get_oracle()
+    if engine == 'numpy':
+        return vectorized_array_sweep(*dataset.get_columns(), oracle, incremental, profile, hook)
+    if engine == 'parallel':
+        return parallel_array_sweep(*dataset.get_columns(), oracle, incremental, workers, profile=profile, hook=hook)
+    if engine == 'approximate':
+        return approximate_array_sweep(*dataset.get_columns(), oracle, epsilon)
+    if engine == 'klevel':
+        return k_level_array_sweep(*dataset.get_columns(), oracle, profile, hook)
+    if engine == 'batched':
+        return batched_array_sweep(*dataset.get_columns(), oracle, profile, hook)
+
+    stats = SweepStats()
+    start_time = perf_counter()
+    if hook is not None:
+        hook.on_start(stats)
+    ordering = dataset.get_attributes()  # list of [x, y, group] items
     n = len(ordering)
 
     # Build initial ordering Ω = ∇f((1,0))(D): sort descending by x-coordinate.
+    begin = perf_counter()
     ordering.sort(key=lambda item: item[0], reverse=True)
+    sort_time = perf_counter() - begin
 
-    heap = MinHeap()
-    satisfactory_regions = []
+    heap = IndexedMinHeap(max(n - 1, 0))
+    intersections_count = 0
 
-    # Build initial heap: add events for each adjacent pair that can exchange order.
+    # Build initial heap: add events for each adjacent pair that can exchange order up to π/2.
+    # The initial exchanges beyond π/2 are applied after all the others (see tail_exchanges):
+    # a slot holds a single event, so they cannot wait in the heap while their slot changes.
+    slots, keys = [], []
     for i in range(n - 1):
         if ordering[i][1] < ordering[i + 1][1]:
-            heap.push(Node(calc_ordering_exchange(ordering[i], ordering[i + 1]), ordering[i], ordering[i + 1], i))
+            oe = calc_ordering_exchange(ordering[i], ordering[i + 1])
+            if oe <= math.pi / 2:
+                slots.append(i)
+                keys.append(oe)
+    heap.heapify(slots, keys)
+
+    fair, check = make_fairness_check(oracle, ordering, incremental, stats if profile else None)
+    satisfactory_regions = [(0, 0)] if fair else []
+    peak_heap = heap.size()
+    # The hook is due when the exchange count reaches next_hook; without one it never is.
+    next_hook = hook.every if hook is not None else -1
+
+    def report():
+        stats.exchanges, stats.peak_heap, stats.theta = intersections_count, peak_heap, theta
+
+    def exchanges():
+        """Apply the exchanges in sweep order, yielding (theta, index) after each one."""
+        while heap.size() > 0:
+            yield get_theta_and_update_the_event(heap, ordering)
+        xs, ys, _ = dataset.get_columns()
+        for oe, i, _, _ in tail_exchanges(xs, ys, np.argsort(-xs, kind='stable')):
+            swap_in_ordering(ordering, i)
+            yield oe, i
 
     theta = 0
-    # First sweep loop: advance until the ordering is satisfactory.
-    while heap.size() > 0:
-        if oracle(ordering):
-            satisfactory_regions.append((theta, 0))
-            break
-        theta = get_theta_and_update_the_event(heap, ordering)
-
-    if heap.size() == 0 and not oracle(ordering):
-        return satisfactory_regions, heap.intersections_count
-
-    flag = oracle(ordering)
-    # Second sweep loop: record transitions in fairness.
-    while heap.size() > 0:
-        theta = get_theta_and_update_the_event(heap, ordering)
-        if theta is not None:
-            new_sign = oracle(ordering)
-            if flag and not new_sign:
-                satisfactory_regions.append((theta, 1))  # end boundary of a satisfactory region.
-            elif (not flag) and new_sign:
-                satisfactory_regions.append((theta, 0))  # start boundary of a satisfactory region.
-            flag = new_sign
+    flag = fair
+    loop_time = perf_counter()
+    # Record every change of verdict: a start boundary whenever an exchange makes the ordering
+    # satisfactory, an end boundary whenever one makes it unsatisfactory.
+    for theta, index in exchanges():
+        intersections_count += 1
+        peak_heap = max(peak_heap, heap.size())
+        new_sign = check(index)
+        if flag and not new_sign:
+            satisfactory_regions.append((theta, 1))  # end boundary of a satisfactory region.
+        elif (not flag) and new_sign:
+            satisfactory_regions.append((theta, 0))  # start boundary of a satisfactory region.
+        flag = new_sign
+        if intersections_count == next_hook:
+            next_hook += hook.every
+            report()
+            hook.on_events(stats)
 
     if flag:
         satisfactory_regions.append((math.pi / 2, 1))
 
-    return satisfactory_regions, heap.intersections_count
+    end_time = perf_counter()
+    report()
+    stats.oracle_calls = intersections_count + 1
+    stats.boundaries = len(satisfactory_regions)
+    stats.phases = {'sort': sort_time, 'setup': loop_time - start_time, 'loop': end_time - loop_time,
+                    'total': end_time - start_time}
+    if hook is not None:
+        hook.on_finish(stats)
+    return satisfactory_regions, stats
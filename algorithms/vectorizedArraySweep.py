@@ -0,0 +1,143 @@
+import heapq
+import math
+from time import perf_counter
+
+import numpy as np
+
+from algorithms.sweepStats import SweepStats, timed
+
+
+def initial_state(xs, ys, order=None):
+    """
+    Build the initial sweep state with array operations.
+
+    Input:
+      - xs, ys: float64 arrays with the two scoring attributes of every item.
+      - order: the initial ordering, if it is already sorted.
+
+    Output:
+      - order: item ids sorted descending by x (stable, like list.sort(reverse=True)).
+      - events: a heapified list of (ordering_exchange, index, left_id, right_id) tuples,
+        one for every adjacent pair that can exchange order (left.y < right.y).
+    """
+    if order is None:
+        order = np.argsort(-xs, kind='stable')
+    ox = xs[order]
+    oy = ys[order]
+
+    index = np.nonzero(oy[:-1] < oy[1:])[0]
+    exchanges = (ox[index + 1] - ox[index]) / (oy[index] - oy[index + 1])
+
+    events = list(zip(exchanges.tolist(), index.tolist(), order[index].tolist(), order[index + 1].tolist()))
+    heapq.heapify(events)
+    return order, events
+
+
+def vectorized_array_sweep(xs, ys, groups, oracle, incremental=True, profile=False, hook=None):
+    """
+    NumPy engine for the 2draysweep algorithm; see two_d_array_sweep for the interface.
+    The items are given as columns (see Dataset.get_columns): xs and ys as float64 arrays and
+    groups as integer codes.
+
+    The initial ordering and the initial batch of ordering exchanges are computed with
+    array operations. The event loop then works on integer item ids: the ordering is a list
+    of ids and every event is a plain tuple, so no per-event objects are allocated.
+    Stale tuples are skipped lazily by comparing item ids, which keeps the C heapq
+    operations on the hot path; the stats count the real exchanges and the stale events apart.
+    Returns exactly the same boundaries as the list-based engine.
+    """
+    stats = SweepStats()
+    start_time = perf_counter()
+    if hook is not None:
+        hook.on_start(stats)
+    n = len(xs)
+    groups = groups.tolist()
+
+    begin = perf_counter()
+    order = np.argsort(-xs, kind='stable')
+    sort_time = perf_counter() - begin
+    order, heap = initial_state(xs, ys, order)
+    intersections_count = 0
+    stale = 0
+    peak_heap = len(heap)
+    order = order.tolist()
+    x = xs.tolist()
+    y = ys.tolist()
+    half_pi = math.pi / 2
+
+    if incremental and hasattr(oracle, 'start'):
+        start = timed(oracle.start, stats) if profile else oracle.start
+        fair = start([groups[item] for item in order])
+
+        def check(i):
+            return oracle.swap(i, groups[order[i]], groups[order[i + 1]])
+    else:
+        # The full-rescan oracle needs [x, y, group] rows, so keep them in step with the ids.
+        ranking = [[x[item], y[item], groups[item]] for item in order]
+        fair = (timed(oracle, stats) if profile else oracle)(ranking)
+
+        def check(i):
+            ranking[i], ranking[i + 1] = ranking[i + 1], ranking[i]
+            return oracle(ranking)
+    if profile:
+        check = timed(check, stats)
+    # The hook is due when the exchange count reaches next_hook; without one it never is.
+    next_hook = hook.every if hook is not None else -1
+
+    heappop, heappush = heapq.heappop, heapq.heappush
+    last = n - 2
+
+    satisfactory_regions = [(0, 0)] if fair else []
+    theta = 0
+    # The event loop is inlined: one iteration pops an event, drops it if stale, swaps the
+    # pair, pushes the events of the two new adjacent pairs and records a change of verdict.
+    flag = fair
+    loop_time = perf_counter()
+    while heap:
+        oe, i, left, right = heappop(heap)
+        if order[i] != left or order[i + 1] != right:
+            stale += 1
+            continue  # stale event; skip it.
+        order[i] = right
+        order[i + 1] = left
+        intersections_count += 1
+        if i > 0:
+            upper = order[i - 1]
+            if y[upper] < y[right]:
+                new_oe = (x[right] - x[upper]) / (y[upper] - y[right])
+                # avoid adding events that their angle exceeds the required range
+                if new_oe <= half_pi:
+                    heappush(heap, (new_oe, i - 1, upper, right))
+        if i < last:
+            lower = order[i + 2]
+            if y[left] < y[lower]:
+                new_oe = (x[lower] - x[left]) / (y[left] - y[lower])
+                if new_oe <= half_pi:
+                    heappush(heap, (new_oe, i + 1, left, lower))
+        if len(heap) > peak_heap:
+            peak_heap = len(heap)
+
+        theta = oe
+        new_sign = check(i)
+        if flag and not new_sign:
+            satisfactory_regions.append((theta, 1))  # end boundary of a satisfactory region.
+        elif (not flag) and new_sign:
+            satisfactory_regions.append((theta, 0))  # start boundary of a satisfactory region.
+        flag = new_sign
+        if intersections_count == next_hook:
+            next_hook += hook.every
+            stats.exchanges, stats.stale_events, stats.peak_heap, stats.theta = \
+                intersections_count, stale, peak_heap, theta
+            hook.on_events(stats)
+
+    if flag:
+        satisfactory_regions.append((half_pi, 1))
+
+    end_time = perf_counter()
+    stats.exchanges, stats.stale_events, stats.peak_heap, stats.theta = intersections_count, stale, peak_heap, theta
+    stats.oracle_calls = intersections_count + 1
+    stats.boundaries = len(satisfactory_regions)
+    stats.phases = {'sort': sort_time, 'setup': loop_time - start_time, 'loop': end_time - loop_time, 'total': end_time - start_time}
+    if hook is not None:
+        hook.on_finish(stats)
+    return satisfactory_regions, stats
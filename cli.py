@@ -0,0 +1,244 @@
+"""
+Headless command-line entry point: preprocessing sweeps, online queries, experiments and the
+batch catalog, without the Tkinter UI.
+
+Only argparse is imported at start-up; every command imports what it needs, so plotting
+(and pandas) are only loaded by the commands that use them.
+
+Examples, from the project root:
+    python cli.py sweep --attr1 age --attr2 priors_count --type race --value Caucasian -o regions.json
+    python cli.py sweep --value Caucasian --trace trace.npz -o regions.json
+    python cli.py replay trace.npz --value Hispanic --max-aa-ratio 0.5 -o hispanic.json
+    python cli.py query regions.json 0.5 0.5
+    python cli.py query regions.json --weights weights.csv
+    python cli.py rank 0.5 0.5 --regions regions.json --top 10
+    python cli.py experiment --batch 500
+    python cli.py catalog --workers 8
+    python cli.py serve regions.json --port 8765
+"""
+import argparse
+import json
+import sys
+
+
+def load_dataset(args):
+    if args.dataset == 'toy':
+        from Datasets.Toy.Toy import Toy
+        return Toy()
+    if args.dataset == 'synthetic':
+        from Datasets.Synthetic.Synthetic import Synthetic
+        return Synthetic(args.size, args.distribution, seed=args.seed)
+    from Datasets.COMPAS.COMPAS import COMPAS
+    return COMPAS(args.attr1, args.attr2, args.type, args.value)
+
+
+def sweep(args):
+    from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+
+    def compute():
+        dataset = load_dataset(args)
+        if args.portion:
+            dataset.set_portion(args.portion)
+            dataset.set_seed(args.seed)
+        satisfactory_regions, stats = two_d_array_sweep(dataset, engine=args.engine, workers=args.workers,
+                                                        profile=args.profile, epsilon=args.epsilon, prune=args.prune,
+                                                        trace=args.trace)
+        return satisfactory_regions, dict(stats.as_dict(), intersections_count=stats.exchanges)
+
+    # The approximate and batched engines return other boundaries than the exact ones the key stands for.
+    if args.cache and not args.portion and not args.trace and args.dataset != 'synthetic' \
+            and args.engine not in ('approximate', 'batched'):
+        from helpers.preprocessing_cache import PreprocessingCache, preprocessing_key
+        if args.dataset == 'toy':
+            from Datasets.Toy.Toy import Toy, ToyOracle
+            key = preprocessing_key(Toy.get_path(), 'x', 'y', 'color', ToyOracle())
+        else:
+            from Datasets.COMPAS.COMPAS import COMPAS
+            from Datasets.COMPAS.Oracle import Oracle
+            key = preprocessing_key(COMPAS.get_path(), args.attr1, args.attr2, args.type,
+                                    Oracle(type_attr=args.value))
+        satisfactory_regions, stats = PreprocessingCache().get_or_compute(key, compute)
+    else:
+        satisfactory_regions, stats = compute()
+
+    write_regions(args, satisfactory_regions, stats)
+
+
+def write_regions(args, satisfactory_regions, stats):
+    output = {'regions': [list(boundary) for boundary in satisfactory_regions], 'stats': stats}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(output, f)
+    else:
+        json.dump(output, sys.stdout)
+        print()
+
+
+def replay(args):
+    from time import perf_counter
+    from algorithms.swapTrace import SwapTrace, replay_trace
+
+    dataset = load_dataset(args)
+    oracle = None
+    if args.dataset == 'compas':
+        from Datasets.COMPAS.Oracle import Oracle
+        oracle = Oracle(args.top_k_fraction, args.max_aa_ratio, args.value)
+    begin = perf_counter()
+    trace = SwapTrace.load(args.trace)
+    satisfactory_regions, oracle_calls = replay_trace(trace, dataset, oracle)
+    write_regions(args, satisfactory_regions, {'exchanges': len(trace), 'oracle_calls': oracle_calls,
+                                               'seconds': perf_counter() - begin})
+
+
+def query(args):
+    with open(args.regions) as f:
+        satisfactory_regions = [tuple(boundary) for boundary in json.load(f)['regions']]
+
+    if args.weights:
+        import numpy as np
+        from DataStructures.SatisfactoryRegionIndex import SatisfactoryRegionIndex
+
+        weights = np.loadtxt(args.weights, delimiter=',', ndmin=2)
+        adjusted, in_region = SatisfactoryRegionIndex(satisfactory_regions).query_batch(weights)
+        for (w1, w2), satisfactory in zip(adjusted.tolist(), in_region.tolist()):
+            print(f'{w1},{w2},{int(satisfactory)}')
+    else:
+        from algorithms.twoDimensionalOnline import two_d_online
+        w1, w2 = two_d_online(satisfactory_regions, args.w1, args.w2)
+        print(f'{w1},{w2}')
+
+
+def rank(args):
+    from algorithms.rankingCheckpoints import RankingCheckpoints
+
+    w1, w2 = args.w1, args.w2
+    if args.regions:
+        from algorithms.twoDimensionalOnline import two_d_online
+        with open(args.regions) as f:
+            w1, w2 = two_d_online([tuple(boundary) for boundary in json.load(f)['regions']], w1, w2)
+    ranking = RankingCheckpoints(load_dataset(args), args.every).ranking(w1, w2, args.top)
+    print(f'{w1},{w2}')
+    print(','.join(map(str, ranking)))
+
+
+def experiment(args):
+    from helpers.experiment import run_experiment, PLT_EXPERIMENT_NAME
+    run_experiment(load_dataset(args), args.batch, engines=args.engines, repeats=args.repeats, seed=args.seed,
+                   output=args.output)
+    print(PLT_EXPERIMENT_NAME)
+
+
+def catalog(args):
+    from helpers.batch_preprocessing import build_catalog
+    build_catalog(args.catalog, args.workers)
+
+
+def serve(args):
+    import asyncio
+    from helpers.query_service import QueryService
+
+    service = QueryService.from_files(args.regions, args.catalog)
+
+    def ready(server):
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"serving {', '.join(sorted(service.indexes))} on http://{host}:{port}", flush=True)
+
+    try:
+        asyncio.run(service.serve(args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+def add_dataset_arguments(parser):
+    parser.add_argument('--dataset', choices=('compas', 'toy', 'synthetic'), default='compas')
+    parser.add_argument('--attr1', default='age', help='first COMPAS scoring attribute')
+    parser.add_argument('--attr2', default='c_days_from_compas', help='second COMPAS scoring attribute')
+    parser.add_argument('--type', default='race', help='COMPAS protected type')
+    parser.add_argument('--value', default='African-American', help='protected value of the type')
+    parser.add_argument('--size', type=int, default=100000, help='number of synthetic items')
+    parser.add_argument('--distribution', default='independent',
+                        choices=('independent', 'correlated', 'anti-correlated', 'duplicates'),
+                        help='joint distribution of the synthetic attributes')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the sampling and of the synthetic items')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Fair ranking (2DarraySweep / 2DOnline) without the UI.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    sweep_parser = commands.add_parser('sweep', help='run the preprocessing sweep and print the boundaries as JSON')
+    add_dataset_arguments(sweep_parser)
+    sweep_parser.add_argument('--engine', choices=('python', 'numpy', 'parallel', 'approximate', 'klevel', 'batched'),
+                              default='numpy')
+    sweep_parser.add_argument('--epsilon', type=float, default=1e-3,
+                              help='angular tolerance of the approximate engine: boundaries within epsilon of the '
+                                   'exact ones, every region wider than epsilon found')
+    sweep_parser.add_argument('--workers', type=int, default=None, help='processes for the parallel engine')
+    sweep_parser.add_argument('--portion', type=int, default=None, help='sweep a seeded sample of this many items')
+    sweep_parser.add_argument('--cache', action='store_true', help='use the on-disk preprocessing cache')
+    sweep_parser.add_argument('--profile', action='store_true', help='also time the oracle (slower)')
+    sweep_parser.add_argument('--prune', action='store_true',
+                              help='drop the items that can never enter or leave the top-k before sweeping')
+    sweep_parser.add_argument('--trace', help='also write the exchange trace to this .npz file (for replay)')
+    sweep_parser.add_argument('-o', '--output', help='write the JSON to this file instead of stdout')
+    sweep_parser.set_defaults(run=sweep)
+
+    replay_parser = commands.add_parser('replay', help='evaluate another oracle on a trace written by sweep --trace')
+    add_dataset_arguments(replay_parser)
+    replay_parser.add_argument('trace', help='.npz file written by sweep --trace, over the same items')
+    replay_parser.add_argument('--top-k-fraction', type=float, default=0.3, help='COMPAS oracle: size of the top-k')
+    replay_parser.add_argument('--max-aa-ratio', type=float, default=0.6,
+                               help='COMPAS oracle: largest share of the protected value in the top-k')
+    replay_parser.add_argument('-o', '--output', help='write the JSON to this file instead of stdout')
+    replay_parser.set_defaults(run=replay)
+
+    query_parser = commands.add_parser('query', help='run 2DOnline on the output of sweep')
+    query_parser.add_argument('regions', help='JSON file written by sweep')
+    query_parser.add_argument('w1', type=float, nargs='?')
+    query_parser.add_argument('w2', type=float, nargs='?')
+    query_parser.add_argument('--weights', help='CSV file of w1,w2 rows, answered as w1,w2,in_region rows')
+    query_parser.set_defaults(run=query)
+
+    rank_parser = commands.add_parser('rank', help='print the ranking (item ids) at the angle of w1, w2')
+    add_dataset_arguments(rank_parser)
+    rank_parser.add_argument('w1', type=float)
+    rank_parser.add_argument('w2', type=float)
+    rank_parser.add_argument('--regions', help='adjust the weights with 2DOnline on this output of sweep first')
+    rank_parser.add_argument('--top', type=int, default=None, help='only the first TOP items')
+    rank_parser.add_argument('--every', type=int, default=1024, help='exchanges between two ranking checkpoints')
+    rank_parser.set_defaults(run=rank)
+
+    experiment_parser = commands.add_parser('experiment', help='time the sweep for growing n and plot it')
+    add_dataset_arguments(experiment_parser)
+    experiment_parser.add_argument('--batch', type=int, default=200)
+    experiment_parser.add_argument('--engines', nargs='+', choices=('python', 'numpy'), default=['python', 'numpy'])
+    experiment_parser.add_argument('--repeats', type=int, default=1, help='seeded runs per size (median plotted)')
+    experiment_parser.add_argument('-o', '--output', help='also write the timings as a JSON benchmark report')
+    experiment_parser.set_defaults(run=experiment)
+
+    catalog_parser = commands.add_parser('catalog', help='preprocess every COMPAS configuration')
+    catalog_parser.add_argument('--workers', type=int, default=None)
+    catalog_parser.add_argument('--catalog', default='outputs/catalog/compas_catalog.json')
+    catalog_parser.set_defaults(run=catalog)
+
+    serve_parser = commands.add_parser('serve', help='answer online queries over HTTP from boundary files')
+    serve_parser.add_argument('regions', nargs='*', help='JSON files written by sweep, optionally as name=path')
+    serve_parser.add_argument('--catalog', help='also serve every entry of this binary catalog (.frc)')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8765)
+    serve_parser.set_defaults(run=serve)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'query' and not args.weights and (args.w1 is None or args.w2 is None):
+        parser.error('query needs w1 and w2, or --weights')
+    if args.command == 'serve' and not args.regions and not args.catalog:
+        parser.error('serve needs boundary files or --catalog')
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
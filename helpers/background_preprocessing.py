@@ -0,0 +1,116 @@
+"""
+Preprocessing off the Tk main thread.
+
+BackgroundPreprocessing runs the sweep (or the experiment) in a child process, so neither the
+GIL nor the computation blocks the UI. The child reports on a queue that the UI polls with
+`after`: ('progress', fraction, elapsed) messages, then one of ('done', result, elapsed),
+('cancelled', None, elapsed) or ('error', message, elapsed). Cancelling sets an event that
+the child checks at every progress report, so it stops between two batches of exchanges.
+"""
+import math
+import multiprocessing
+import queue
+from time import perf_counter
+
+import numpy as np
+
+from algorithms.parallelArraySweep import ordering_at
+from algorithms.skybandPruning import earlier_at_least
+from algorithms.sweepStats import SweepHook
+from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+
+
+class Cancelled(Exception):
+    pass
+
+
+def sweep_with_stats(dataset, hook=None):
+    """Run the preprocessing sweep and return (regions, stats) in the form stored by the cache."""
+    satisfactory_regions, stats = two_d_array_sweep(dataset, hook=hook)
+    return satisfactory_regions, dict(stats.as_dict(), intersections_count=stats.exchanges)
+
+
+def count_exchanges(xs, ys):
+    """
+    The number of exchanges the sweep makes up to π/2, without sweeping: every pair of items
+    ordered differently at 0 and at π/2 is exchanged once (O(n log n)).
+    """
+    order, rank = ordering_at(xs, ys, math.pi / 2)
+    position = np.empty(len(xs), dtype=np.int64)
+    position[order] = np.arange(len(xs))
+    return int(earlier_at_least(position[np.argsort(rank)]).sum())
+
+
+class ChannelHook(SweepHook):
+    """Send the fraction of the exchanges done about every percent, and stop once cancelled."""
+    def __init__(self, channel, cancel, total, begin):
+        self.channel = channel
+        self.cancel = cancel
+        self.total = max(total, 1)
+        self.begin = begin
+        self.every = max(total // 100, 1000)
+
+    def on_events(self, stats):
+        if self.cancel.is_set():
+            raise Cancelled()
+        self.channel.put(('progress', min(stats.exchanges / self.total, 1.0), perf_counter() - self.begin))
+
+
+def work(channel, cancel, experiment, make_dataset):
+    """Entry point of the child process; make_dataset builds the dataset there."""
+    from helpers.experiment import run_experiment
+
+    begin = perf_counter()
+    try:
+        dataset = make_dataset()
+        if experiment:
+            def progress(done, total):
+                if cancel.is_set():
+                    raise Cancelled()
+                channel.put(('progress', done / total, perf_counter() - begin))
+            result = run_experiment(dataset, progress=progress)
+        else:
+            xs, ys, _ = dataset.get_columns()
+            result = sweep_with_stats(dataset, ChannelHook(channel, cancel, count_exchanges(xs, ys), begin))
+        channel.put(('done', result, perf_counter() - begin))
+    except Cancelled:
+        channel.put(('cancelled', None, perf_counter() - begin))
+    except Exception as e:
+        channel.put(('error', f'{type(e).__name__}: {e}', perf_counter() - begin))
+
+
+class BackgroundPreprocessing:
+    """
+    One preprocessing run in a child process.
+
+    make_dataset must be picklable (a dataset class, or a functools.partial of one), since the
+    process is spawned rather than forked from the Tk process. With experiment=True the child
+    runs helpers.experiment.run_experiment instead of the sweep.
+    """
+    def __init__(self, make_dataset, experiment=False):
+        context = multiprocessing.get_context('spawn')
+        self.channel = context.Queue()
+        self.cancel_event = context.Event()
+        self.process = context.Process(target=work, args=(self.channel, self.cancel_event, experiment, make_dataset),
+                                       daemon=True)
+        self.process.start()
+
+    def poll(self):
+        """The messages that arrived since the last poll, without blocking."""
+        messages = []
+        while True:
+            try:
+                messages.append(self.channel.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def cancel(self):
+        """Ask the child to stop at its next progress report."""
+        self.cancel_event.set()
+
+    def close(self, timeout=1.0):
+        """Wait up to timeout seconds for the child to exit, then terminate it."""
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
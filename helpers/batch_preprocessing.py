@@ -0,0 +1,143 @@
+"""
+Headless batch preprocessing of the whole COMPAS catalog: every pair of scoring attributes,
+every protected type and every protected value.
+
+The dataset is loaded once in the main process and handed read-only to the workers of a process
+pool (inherited copy-on-write where processes are forked, pickled once per worker otherwise).
+One job covers an (attribute1, attribute2, type) triple and evaluates the oracles of all the
+values of that type in a single sweep (two_d_array_sweep_many).
+
+Finished jobs are appended to a journal next to the catalog, so an interrupted run resumes
+where it stopped. The consolidated catalog is written once all the jobs are done, as JSON and
+as a memory-mappable binary catalog next to it (see DataStructures/RegionCatalog.py).
+
+Run from the project root:
+    python -m helpers.batch_preprocessing [--workers N] [--catalog PATH]
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from DataStructures.RegionCatalog import write_catalog
+from Datasets.COMPAS.COMPAS import COMPAS
+from Datasets.COMPAS.Oracle import Oracle
+from Datasets.FileHash import file_hash
+from algorithms.multiOracleSweep import two_d_array_sweep_many
+from helpers.preprocessing_cache import preprocessing_key
+
+CATALOG_FILE = 'outputs/catalog/compas_catalog.json'
+BINARY_SUFFIX = '.frc'
+
+_raw_df = None
+
+
+def catalog_jobs():
+    """The (attribute1, attribute2, type) triples of the catalog, one per job."""
+    return [(attribute1, attribute2, type)
+            for attribute1, attribute2 in itertools.combinations(COMPAS.SCORING_ATTR, 2)
+            for type in COMPAS.TYPE_ATTS]
+
+
+def _init_worker(raw_df):
+    global _raw_df
+    _raw_df = raw_df
+
+
+def run_job(attribute1, attribute2, type):
+    """
+    Sweep one (attribute1, attribute2, type) triple for all the values of type.
+    Returns {type_attr: (satisfactory_regions, intersections_count)} and the elapsed time.
+    """
+    start = time.perf_counter()
+    dataset = COMPAS(attribute1, attribute2, type, raw_df=_raw_df)
+    values = COMPAS.TYPE_ATTS[type]
+    all_regions, stats = two_d_array_sweep_many(dataset, [Oracle(type_attr=type_attr) for type_attr in values])
+    results = {type_attr: (regions, stats.exchanges) for type_attr, regions in zip(values, all_regions)}
+    return results, time.perf_counter() - start
+
+
+def load_journal(path):
+    """
+    Return the entries of the journal, keyed by preprocessing key.
+    A line torn by an interruption is dropped, so that new entries start on a line of their own.
+    """
+    entries = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            lines = f.readlines()
+        if lines and not lines[-1].endswith('\n'):
+            lines.pop()
+            with open(path, 'w') as f:
+                f.writelines(lines)
+        for line in lines:
+            entry = json.loads(line)
+            entries[entry['key']] = entry
+    return entries
+
+
+def build_catalog(catalog_file=CATALOG_FILE, workers=None, log=print):
+    """
+    Preprocess every configuration missing from the journal of catalog_file, then write the
+    consolidated catalog: a JSON object with the dataset hash and one entry per
+    (attribute1, attribute2, type, type_attr) holding its boundaries and sweep statistics, and
+    the same boundaries as a binary catalog (BINARY_SUFFIX) keyed by preprocessing key.
+    Returns the catalog.
+    """
+    dataset_hash = file_hash(COMPAS.get_path())
+    journal_file = f'{catalog_file}.journal'
+    os.makedirs(os.path.dirname(catalog_file) or '.', exist_ok=True)
+    done = load_journal(journal_file)
+
+    def keys_of(job):
+        attribute1, attribute2, type = job
+        return [preprocessing_key(COMPAS.get_path(), attribute1, attribute2, type, Oracle(type_attr=type_attr))
+                for type_attr in COMPAS.TYPE_ATTS[type]]
+
+    jobs = catalog_jobs()
+    pending = [job for job in jobs if not all(key in done for key in keys_of(job))]
+    log(f'{len(jobs) - len(pending)} of {len(jobs)} jobs already done')
+
+    if pending:
+        raw_df = COMPAS.read_csv()
+        total_start = time.perf_counter()
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(raw_df,)) as executor, \
+                open(journal_file, 'a') as journal:
+            futures = {executor.submit(run_job, *job): job for job in pending}
+            for count, future in enumerate(as_completed(futures), 1):
+                attribute1, attribute2, type = job = futures[future]
+                results, seconds = future.result()
+                for key, (type_attr, (regions, intersections_count)) in zip(keys_of(job), results.items()):
+                    entry = {'key': key, 'attribute1': attribute1, 'attribute2': attribute2, 'type': type,
+                             'type_attr': type_attr, 'oracle': Oracle(type_attr=type_attr).params(),
+                             'regions': [list(boundary) for boundary in regions],
+                             'stats': {'intersections_count': intersections_count, 'seconds': seconds}}
+                    journal.write(json.dumps(entry) + '\n')
+                    done[key] = entry
+                journal.flush()
+                log(f'[{count}/{len(pending)}] {attribute1} x {attribute2}, {type}: {seconds:.2f} s')
+        log(f'{len(pending)} jobs in {time.perf_counter() - total_start:.2f} s')
+
+    entries = [done[key] for job in jobs for key in keys_of(job)]
+    catalog = {'dataset': dataset_hash, 'entries': entries}
+    tmp_file = f'{catalog_file}.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(catalog, f)
+    os.replace(tmp_file, catalog_file)
+
+    binary_file = os.path.splitext(catalog_file)[0] + BINARY_SUFFIX
+    write_catalog(tmp_file, {entry['key']: entry['regions'] for entry in entries},
+                  {entry['key']: {name: entry[name] for name in ('attribute1', 'attribute2', 'type', 'type_attr')}
+                   for entry in entries})
+    os.replace(tmp_file, binary_file)
+    return catalog
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Preprocess every COMPAS configuration into one region catalog.')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes (default: CPU count)')
+    parser.add_argument('--catalog', default=CATALOG_FILE, help='path of the consolidated catalog')
+    args = parser.parse_args()
+    build_catalog(args.catalog, args.workers)
@@ -0,0 +1,192 @@
+"""
+Reproducible benchmark suite of the preprocessing sweep, for the list-based ('python') and the
+'numpy' engines. helpers.experiment.run_experiment runs its size sweep through it too.
+
+For every dataset, engine and size the sweep is repeated on seeded samples, and the median and
+interquartile range of each metric are reported:
+  • sort: the initial ordering (the engine's own sort by x, stats.phases['sort']).
+  • heap_build: the rest of the setup: the initial ordering exchanges, the heap and the first
+    oracle check.
+  • loop: the event loop, oracle included.
+  • oracle: the time spent in the oracle alone (a separate profile=True run, since timing
+    every call slows the loop down).
+  • total, peak_memory_mb (tracemalloc, also in a separate run), exchanges and stale_events.
+
+Run from the project root:
+    python -m helpers.benchmark run -o outputs/benchmark.json [--quick] [--engines python numpy]
+    python -m helpers.benchmark compare outputs/baseline.json outputs/benchmark.json [--threshold 0.1]
+The compare mode exits with status 1 if a timing median regressed by more than the threshold.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+
+ENGINES = ('python', 'numpy')
+TIMINGS = ('sort', 'heap_build', 'loop', 'oracle', 'total')
+METRICS = TIMINGS + ('peak_memory_mb', 'exchanges', 'stale_events')
+REPEATS = 5
+SEED = 0
+
+
+def compas_dataset():
+    from Datasets.COMPAS.COMPAS import COMPAS
+    return COMPAS('age', 'c_days_from_compas')
+
+
+def toy_dataset():
+    from Datasets.Toy.Toy import Toy
+    return Toy()
+
+
+def synthetic_dataset(n=100000, seed=SEED):
+    """n strongly correlated Synthetic items, so that a sample has a few exchanges per item."""
+    from Datasets.Synthetic.Synthetic import Synthetic
+    return Synthetic(n, 'correlated', correlation=1 - 1e-7, seed=seed)
+
+
+# name -> (dataset factory, sizes, quick sizes); sizes past the dataset length are clipped.
+SUITE = {
+    'toy': (toy_dataset, [10], [10]),
+    'compas': (compas_dataset, [1000, 2000, 4743], [1000]),
+    'synthetic': (synthetic_dataset, [10000, 50000, 100000], [10000]),
+}
+
+
+def measure(dataset, engine='numpy'):
+    """Time one sweep of the current sample of dataset with engine, phase by phase."""
+    oracle = dataset.get_oracle()
+    oracle.reset()
+    _, stats = two_d_array_sweep(dataset, engine=engine)
+
+    oracle.reset()
+    _, profiled = two_d_array_sweep(dataset, engine=engine, profile=True)
+
+    oracle.reset()
+    tracemalloc.start()
+    two_d_array_sweep(dataset, engine=engine)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    sort = stats.phases['sort']
+    return {'sort': sort, 'heap_build': stats.phases['setup'] - sort, 'loop': stats.phases['loop'],
+            'oracle': profiled.oracle_time, 'total': stats.phases['total'], 'peak_memory_mb': peak / 2 ** 20,
+            'exchanges': stats.exchanges, 'stale_events': stats.stale_events}
+
+
+def summarize(values):
+    q1, median, q3 = np.percentile(values, [25, 50, 75]).tolist()
+    return {'median': median, 'iqr': q3 - q1, 'runs': values}
+
+
+def benchmark_dataset(dataset, sizes, engines=ENGINES, repeats=REPEATS, seed=SEED, warm_up=True, progress=None,
+                      log=None):
+    """
+    Measure every engine on seeded samples of every size of dataset (sizes past its length are
+    clipped) and return {engine: {size: {metric: summary}}}.
+    progress(done, total), if given, is called after every run, counting a run on n items as
+    n² (the sweep is quadratic).
+    """
+    sizes = list(dict.fromkeys(min(size, len(dataset)) for size in sizes))
+    total = len(engines) * repeats * sum(size ** 2 for size in sizes)
+    done = 0
+    results = {}
+    for engine in engines:
+        results[engine] = {}
+        for size in sizes:
+            if warm_up:
+                dataset.set_portion(size)
+                measure(dataset, engine)  # not recorded
+            runs = []
+            for repeat in range(repeats):
+                dataset.set_portion(size)
+                dataset.set_seed(seed + repeat)
+                runs.append(measure(dataset, engine))
+                done += size ** 2
+                if progress is not None:
+                    progress(done, total)
+            results[engine][str(size)] = {metric: summarize([run[metric] for run in runs]) for metric in METRICS}
+            if log is not None:
+                median = results[engine][str(size)]['total']
+                log(f"{engine:<7} n={size:<7} total {median['median']:.4f} s (IQR {median['iqr']:.4f})")
+    return results
+
+
+def report(results, **meta):
+    """The JSON report of results ({case: benchmark_dataset results}), with the platform metadata."""
+    return {'meta': dict({'python': platform.python_version(), 'numpy': np.__version__,
+                          'machine': platform.machine(), 'platform': platform.platform()}, **meta),
+            'results': results}
+
+
+def run_suite(quick=False, repeats=REPEATS, seed=SEED, engines=ENGINES, log=print):
+    """Run every case of SUITE and return the results as a JSON-serializable dict."""
+    results = {}
+    for name, (factory, sizes, quick_sizes) in SUITE.items():
+        log(name)
+        results[name] = benchmark_dataset(factory(), quick_sizes if quick else sizes, engines, repeats, seed,
+                                          log=log)
+    return report(results, repeats=repeats, seed=seed, quick=quick, engines=list(engines))
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Return the regressions of current against baseline: the timings whose median grew by more
+    than threshold (relative) and by more than the two IQRs together, as (case/engine, size, metric,
+    old, new).
+    """
+    regressions = []
+    for name, engines in current['results'].items():
+        for engine, sizes in engines.items():
+            for size, metrics in sizes.items():
+                old_metrics = baseline['results'].get(name, {}).get(engine, {}).get(size)
+                if old_metrics is None:
+                    continue
+                for metric in TIMINGS:
+                    old, new = old_metrics[metric], metrics[metric]
+                    if new['median'] > old['median'] * (1 + threshold) and \
+                            new['median'] - old['median'] > old['iqr'] + new['iqr']:
+                        regressions.append((f'{name}/{engine}', size, metric, old['median'], new['median']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the preprocessing sweep.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run')
+    run_parser.add_argument('-o', '--output', default='outputs/benchmark.json')
+    run_parser.add_argument('--quick', action='store_true', help='smallest sizes only')
+    run_parser.add_argument('--repeats', type=int, default=REPEATS)
+    run_parser.add_argument('--seed', type=int, default=SEED)
+    run_parser.add_argument('--engines', nargs='+', choices=ENGINES, default=list(ENGINES))
+    compare_parser = commands.add_parser('compare')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        with open(args.output, 'w') as f:
+            json.dump(run_suite(args.quick, args.repeats, args.seed, args.engines), f, indent=1)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold)
+    for name, size, metric, old, new in regressions:
+        print(f"SLOWER {name} n={size} {metric}: {old:.4f} s -> {new:.4f} s ({new / old - 1:+.0%})")
+    if not regressions:
+        print('no regressions')
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Benchmark of the sweep's event queue: the original MinHeap of Node objects (before) against the
+IndexedMinHeap keyed by adjacent slot (after). Only the geometric event processing is measured,
+the fairness oracle is left out.
+
+Run from the project root:
+    python -m helpers.event_queue_benchmark
+"""
+import math
+import time
+import tracemalloc
+
+import numpy as np
+
+from DataStructures.IndexedMinHeap import IndexedMinHeap
+from DataStructures.MinHeap import MinHeap
+from Datasets.COMPAS.COMPAS import COMPAS
+from algorithms.twoDimensionalArraySweep import calc_ordering_exchange, get_theta_and_update_the_event
+
+
+class Node:
+    """The per-event object used by the original sweep."""
+    __slots__ = ("ordering_exchange", "attribute1", "attribute2", "index")
+
+    def __init__(self, ordering_exchange, attribute1, attribute2, index):
+        self.ordering_exchange = ordering_exchange
+        self.attribute1 = attribute1
+        self.attribute2 = attribute2
+        self.index = index
+
+    def __lt__(self, other):
+        if self.ordering_exchange != other.ordering_exchange:
+            return self.ordering_exchange < other.ordering_exchange
+        return self.index < other.index
+
+
+def legacy_push(i, ordering, heap):
+    if i < 0 or i >= len(ordering) - 1:
+        return
+    if ordering[i][1] < ordering[i + 1][1]:
+        oe = calc_ordering_exchange(ordering[i], ordering[i + 1])
+        if oe <= math.pi / 2:
+            heap.push(Node(oe, ordering[i], ordering[i + 1], i))
+
+
+def legacy_events(ordering):
+    """Process all events with the original MinHeap of Node objects and lazy stale checks."""
+    heap = MinHeap()
+    for i in range(len(ordering) - 1):
+        if ordering[i][1] < ordering[i + 1][1]:
+            heap.push(Node(calc_ordering_exchange(ordering[i], ordering[i + 1]), ordering[i], ordering[i + 1], i))
+
+    exchanges = stale = 0
+    peak = heap.size()
+    while heap.size() > 0:
+        peak = max(peak, heap.size())
+        node = heap.pop()
+        i = node.index
+        if ordering[i] != node.attribute1 or ordering[i + 1] != node.attribute2:
+            stale += 1
+            continue
+        ordering[i], ordering[i + 1] = ordering[i + 1], ordering[i]
+        legacy_push(i - 1, ordering, heap)
+        legacy_push(i + 1, ordering, heap)
+        exchanges += 1
+    return exchanges, stale, peak, heap.intersections_count
+
+
+def indexed_events(ordering):
+    """Process all events with the IndexedMinHeap used by two_d_array_sweep."""
+    n = len(ordering)
+    heap = IndexedMinHeap(max(n - 1, 0))
+    events = [(i, calc_ordering_exchange(ordering[i], ordering[i + 1]))
+              for i in range(n - 1) if ordering[i][1] < ordering[i + 1][1]]
+    # Like two_d_array_sweep, the initial exchanges beyond π/2 stay out of the heap.
+    events = [(i, key) for i, key in events if key <= math.pi / 2]
+    heap.heapify([i for i, _ in events], [key for _, key in events])
+
+    exchanges = 0
+    peak = heap.size()
+    while heap.size() > 0:
+        peak = max(peak, heap.size())
+        get_theta_and_update_the_event(heap, ordering)
+        exchanges += 1
+    return exchanges, 0, peak, exchanges
+
+
+def initial_ordering(attributes):
+    return sorted((list(item) for item in attributes), key=lambda item: item[0], reverse=True)
+
+
+def measure(events, attributes):
+    # Time and memory are measured in separate runs, since tracemalloc slows the loop down.
+    ordering = initial_ordering(attributes)
+    start = time.perf_counter()
+    exchanges, stale, peak_heap, pushes = events(ordering)
+    elapsed = time.perf_counter() - start
+
+    ordering = initial_ordering(attributes)
+    tracemalloc.start()
+    events(ordering)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'time': elapsed, 'peak_memory_mb': peak_memory / 2 ** 20, 'peak_heap': peak_heap,
+            'exchanges': exchanges, 'stale': stale, 'pushes': pushes}
+
+
+def synthetic_attributes(n, seed=0):
+    """n items with independent uniform attributes, the case with the most stale events."""
+    rng = np.random.default_rng(seed)
+    xs = rng.random(n)
+    ys = rng.random(n)
+    return [[x, y, 'a'] for x, y in zip(xs.tolist(), ys.tolist())]
+
+
+def compas_attributes(n, seed=0):
+    dataset = COMPAS('age', 'c_days_from_compas')
+    dataset.set_portion(min(n, len(dataset)))
+    dataset.set_seed(seed)
+    return dataset.get_attributes()
+
+
+def main():
+    cases = [('COMPAS n=1000', compas_attributes(1000)),
+             ('COMPAS n=2000', compas_attributes(2000)),
+             ('synthetic n=500', synthetic_attributes(500)),
+             ('synthetic n=1000', synthetic_attributes(1000))]
+    print(f"{'case':<18} {'queue':<8} {'time (s)':>9} {'peak MB':>8} {'peak heap':>10} "
+          f"{'exchanges':>10} {'stale':>9}")
+    for name, attributes in cases:
+        for queue, events in (('before', legacy_events), ('after', indexed_events)):
+            r = measure(events, attributes)
+            print(f"{name:<18} {queue:<8} {r['time']:>9.3f} {r['peak_memory_mb']:>8.2f} {r['peak_heap']:>10} "
+                  f"{r['exchanges']:>10} {r['stale']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,23 @@
-from matplotlib import pyplot as plt
-import time
-from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+import json
+
+from helpers.benchmark import ENGINES, SEED, benchmark_dataset, report
 
 PLT_EXPERIMENT_NAME = "outputs/time_inter_plot.png"
 
+
 def plot_results(batch_sizes, times, intersections):
+    """times maps an engine to its median sweep time for every batch size."""
+    from matplotlib import pyplot as plt  # only loaded when a plot is drawn
+
     fig, ax1 = plt.subplots()
 
     color1 = 'tab:blue'
     ax1.set_xlabel('n')  # number of items
     ax1.set_ylabel('time (sec)', color=color1)
-    ax1.plot(batch_sizes, times, marker='<', color=color1)
+    for (engine, engine_times), marker in zip(times.items(), '<o^s'):
+        ax1.plot(batch_sizes, engine_times, marker=marker, color=color1, label=engine)
     ax1.tick_params(axis='y', labelcolor=color1)
+    ax1.legend(loc='upper left')
 
     # Create a second y-axis sharing the same x-axis
     ax2 = ax1.twinx()
@@ -23,26 +29,27 @@ def plot_results(batch_sizes, times, intersections):
     plt.title('Figure 14: 2D; preprocessing time, varying n')
     plt.tight_layout()
     plt.savefig(PLT_EXPERIMENT_NAME, dpi=600, transparent=True)
-
-def run_batch(dataset, batch_size, times, intersections, batch_sizes):
-    dataset.set_portion(batch_size)
-    start = time.perf_counter()
-    _, inter = two_d_array_sweep(dataset)
-    end = time.perf_counter()
-    times.append(end - start)
-    intersections.append(inter)
-    batch_sizes.append(batch_size)
-
-
-
-def run_experiment(dataset, batch=200):
-    times = []
-    intersections = []
-    batch_sizes = []
-    for batch_size in range(batch, len(dataset), batch):
-        run_batch(dataset, batch_size, times, intersections, batch_sizes)
-
-    if batch_size < len(dataset):
-        run_batch(dataset, len(dataset), times, intersections, batch_sizes)
-
-    plot_results(batch_sizes, times, intersections)
\ No newline at end of file
+    plt.close(fig)
+
+
+def run_experiment(dataset, batch=200, progress=None, engines=ENGINES, repeats=1, seed=SEED, output=None):
+    """
+    Time the sweep on seeded samples of batch, 2 * batch, ... items and the whole dataset, with
+    every engine, through helpers.benchmark, and plot the median times.
+    Every size is repeated `repeats` times; output, if given, is a file for the JSON report
+    (the same format as `python -m helpers.benchmark run`). Returns the report.
+    progress(done, total), if given, is called after every run with the work done so far,
+    counting a run on n items as n² (the sweep is quadratic).
+    """
+    sizes = list(range(batch, len(dataset), batch)) + [len(dataset)]
+    results = benchmark_dataset(dataset, sizes, engines, repeats, seed, warm_up=False, progress=progress)
+    batch_sizes = [int(size) for size in results[engines[0]]]
+    times = {engine: [metrics['total']['median'] for metrics in results[engine].values()] for engine in engines}
+    intersections = [metrics['exchanges']['median'] for metrics in results[engines[0]].values()]
+    plot_results(batch_sizes, times, intersections)
+
+    experiment = report({'experiment': results}, repeats=repeats, seed=seed, engines=list(engines), batch=batch)
+    if output is not None:
+        with open(output, 'w') as f:
+            json.dump(experiment, f, indent=1)
+    return experiment
@@ -1,19 +1,20 @@
+import hashlib
 import math
-import matplotlib.pyplot as plt
-from matplotlib.patches import Wedge
+from collections import OrderedDict
 
 FILE_NAME = 'outputs/plot_satisfactory_regions.png'
+# Rendered images kept in memory, by boundary list and size (least recently used dropped first).
+RENDER_CACHE_SIZE = 32
+_rendered = OrderedDict()
 
-def plot_satisfactory_regions(boundaries, max_radius=4):
+
+def satisfactory_intervals(boundaries):
     """
     boundaries: list of (angle, boundary_type)
       angle in radians, boundary_type in {0, 1} (0=start, 1=end)
-    max_radius: how far the wedges/lines extend from origin
+    Returns the (start, end) angles of the satisfactory regions, and the boundaries sorted by angle.
     """
-    # 1) Sort boundaries by angle
     boundaries_sorted = sorted(boundaries, key=lambda x: x[0])
-
-    # 2) Identify the angular intervals that are "satisfactory."
     in_region = False
     start_angle = None
     regions = []
@@ -26,35 +27,79 @@ def plot_satisfactory_regions(boundaries, max_radius=4):
             end_angle = angle
             in_region = False
             regions.append((start_angle, end_angle))
+    return regions, boundaries_sorted
 
-    # 3) Plot using matplotlib
-    fig, ax = plt.subplots()
-
-    # (a) Draw each "satisfactory" wedge in green
-    for (start, end) in regions:
-        wedge = Wedge(
-            (0, 0),
-            max_radius,
-            math.degrees(start),
-            math.degrees(end),
-            color='green',
-            alpha=0.3
-        )
-        ax.add_patch(wedge)
-
-    # (b) Draw boundary lines (the “events”)
-    #     We'll color them blue if boundary_type=0, green if boundary_type=1
-    for angle, btype in boundaries_sorted:
-        x = max_radius * math.cos(angle)
-        y = max_radius * math.sin(angle)
-        color = 'blue' if btype == 0 else 'green'
-        ax.plot([0, x], [0, y], color=color, linewidth=2)
+
+def draw_satisfactory_regions(figure, boundaries, max_radius=4):
+    """
+    Draw the satisfactory wedges (green) and the boundary rays (blue for a start, green for an
+    end) on a matplotlib Figure. Every wedge goes into one PatchCollection and every ray into
+    one LineCollection, so thousands of boundaries are drawn in two calls.
+    """
+    from matplotlib.collections import LineCollection, PatchCollection
+    from matplotlib.patches import Wedge
+
+    regions, boundaries_sorted = satisfactory_intervals(boundaries)
+    ax = figure.add_subplot()
+    wedges = [Wedge((0, 0), max_radius, math.degrees(start), math.degrees(end)) for start, end in regions]
+    ax.add_collection(PatchCollection(wedges, facecolor='green', edgecolor='green', alpha=0.3))
+    rays = [[(0, 0), (max_radius * math.cos(angle), max_radius * math.sin(angle))] for angle, _ in boundaries_sorted]
+    colors = ['blue' if btype == 0 else 'green' for _, btype in boundaries_sorted]
+    ax.add_collection(LineCollection(rays, colors=colors, linewidths=2))
 
     ax.set_xlim([0, max_radius])
     ax.set_ylim([0, max_radius])
     ax.set_aspect('equal', 'box')
     ax.set_xlabel('x')
     ax.set_ylabel('y')
-    plt.title('Satisfactory Regions (2D)')
-    plt.savefig(FILE_NAME, dpi=600, transparent=True)
-    return FILE_NAME
\ No newline at end of file
+    ax.set_title('Satisfactory Regions (2D)')
+
+
+def boundaries_key(boundaries, *extra):
+    """A hash of the boundary list (and of extra rendering parameters)."""
+    return hashlib.sha1(repr((tuple(map(tuple, boundaries)),) + extra).encode()).hexdigest()
+
+
+def render_satisfactory_regions(boundaries, size=(600, 450), max_radius=4):
+    """
+    Render the plot straight into memory at the display size (in pixels) and return it as a
+    PIL image. Renders are cached by a hash of the boundary list, so showing the same regions
+    again does not redraw them.
+    """
+    key = boundaries_key(boundaries, size, max_radius)
+    if key in _rendered:
+        _rendered.move_to_end(key)
+        return _rendered[key]
+
+    # Imported here so that headless callers never load them; no pyplot, so no global figures.
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from PIL import Image
+
+    dpi = 100
+    figure = Figure(figsize=(size[0] / dpi, size[1] / dpi), dpi=dpi, facecolor='white')
+    canvas = FigureCanvasAgg(figure)
+    draw_satisfactory_regions(figure, boundaries, max_radius)
+    figure.tight_layout()
+    canvas.draw()
+    image = Image.frombuffer('RGBA', canvas.get_width_height(), canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1).copy()
+
+    _rendered[key] = image
+    if len(_rendered) > RENDER_CACHE_SIZE:
+        _rendered.popitem(last=False)
+    return image
+
+
+def plot_satisfactory_regions(boundaries, max_radius=4, file_name=FILE_NAME, dpi=600):
+    """
+    Export the plot as a high-resolution PNG (600 dpi by default) and return its file name.
+    For display, use render_satisfactory_regions.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    draw_satisfactory_regions(figure, boundaries, max_radius)
+    figure.savefig(file_name, dpi=dpi, transparent=True)
+    return file_name
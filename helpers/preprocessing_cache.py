@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+
+from Datasets.FileHash import file_hash
+
+CACHE_DIR = 'outputs/cache'
+MAX_CACHE_BYTES = 64 * 2 ** 20
+# Bump when the sweep output changes, so that older entries are never returned.
+CACHE_VERSION = 1
+
+
+def preprocessing_key(dataset_file, attribute1, attribute2, type, oracle):
+    """
+    Key of a preprocessing result: the content hash of the dataset file, the two scoring
+    attributes, the protected type, and the oracle configuration (oracle.params(), which
+    includes the protected value and the FM1 thresholds).
+    """
+    config = {'version': CACHE_VERSION,
+              'dataset': file_hash(dataset_file),
+              'attribute1': attribute1,
+              'attribute2': attribute2,
+              'type': type,
+              'oracle': oracle.params()}
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+
+class PreprocessingCache:
+    """
+    Persistent cache of two_d_array_sweep results, one JSON file per key.
+
+    Every entry holds the boundary list and the sweep statistics. The total size of the cache
+    directory is capped at max_bytes: when a new entry does not fit, the least recently used
+    entries (by file mtime, refreshed on every hit) are evicted.
+    """
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.json')
+
+    def get(self, key):
+        """Return (satisfactory_regions, stats) for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        os.utime(path)  # mark as recently used
+        return [tuple(boundary) for boundary in entry['regions']], entry['stats']
+
+    def put(self, key, satisfactory_regions, stats):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'regions': [list(boundary) for boundary in satisfactory_regions], 'stats': stats}, f)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached (satisfactory_regions, stats) for key, or call compute() to produce
+        them and store the result.
+        """
+        entry = self.get(key)
+        if entry is None:
+            entry = compute()
+            self.put(key, *entry)
+        return entry
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime_ns, stat.st_size, name))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        # Always keep the most recent entry, even if it is larger than the cap on its own.
+        for _, size, name in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,178 @@
+"""
+Local HTTP service for the online phase (2DOnline), using the standard library and NumPy only.
+
+The boundary lists (JSON files written by `cli.py sweep`, preprocessing cache entries, or the
+entries of a binary catalog, see DataStructures/RegionCatalog.py) are loaded once at startup
+into SatisfactoryRegionIndex objects and answered from memory. asyncio
+serves many keep-alive connections concurrently on one thread; a query is a binary search
+(a vectorized one for a batch), so none of them holds the loop for long.
+
+Endpoints (JSON in and out):
+  GET  /regions                              the loaded boundary lists and their sizes
+  GET  /query?name=N&w1=W1&w2=W2             one query, answered like two_d_online
+  POST /query  {"name": N, "weights": [[w1, w2], ...]}
+                                             a batch; returns the weights and in_region flags
+  GET  /stats                                request, query and error counters, throughput
+                                             and latency percentiles (in milliseconds)
+name can be left out when a single boundary list is loaded.
+
+Run it with `python cli.py serve regions.json` (see cli.py).
+"""
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from DataStructures.RegionCatalog import RegionCatalog
+from DataStructures.SatisfactoryRegionIndex import SatisfactoryRegionIndex
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+class QueryError(Exception):
+    """A request the service cannot answer, with its HTTP status."""
+    def __init__(self, status, message):
+        super(QueryError, self).__init__(message)
+        self.status = status
+
+
+class ServiceStats:
+    """Counters of a QueryService; latencies are kept for the last `window` requests."""
+    def __init__(self, window=100000):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.queries = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=window)
+
+    def record(self, seconds, queries, error=False):
+        self.requests += 1
+        self.queries += queries
+        self.errors += error
+        self.latencies.append(seconds)
+
+    def as_dict(self):
+        uptime = time.perf_counter() - self.started
+        stats = {'uptime': uptime, 'requests': self.requests, 'queries': self.queries, 'errors': self.errors,
+                 'requests_per_second': self.requests / uptime, 'queries_per_second': self.queries / uptime}
+        if self.latencies:
+            p50, p90, p99 = np.percentile(np.array(self.latencies) * 1000, (50, 90, 99)).tolist()
+            stats['latency_ms'] = {'p50': p50, 'p90': p90, 'p99': p99, 'max': max(self.latencies) * 1000}
+        return stats
+
+
+class QueryService:
+    """
+    Answers 2DOnline queries over named boundary lists, kept in memory.
+    regions maps a name to a sorted boundary list, as returned by two_d_array_sweep.
+    """
+    def __init__(self, regions: dict, catalog=None):
+        self.indexes = {name: SatisfactoryRegionIndex(boundaries) for name, boundaries in regions.items()}
+        if catalog is not None:
+            # Catalog entries are queried in place in the mapped file.
+            self.indexes.update((key, catalog.index(key)) for key in catalog.keys())
+        self.stats = ServiceStats()
+
+    @classmethod
+    def from_files(cls, paths, catalog=None):
+        """
+        Load boundary lists from JSON files ({'regions': ...}), named after the file unless given
+        as name=path, and every entry of the binary catalog file `catalog` (named by its key).
+        """
+        regions = {}
+        for path in paths:
+            name, _, file_name = path.rpartition('=')
+            name = name or os.path.splitext(os.path.basename(file_name))[0]
+            with open(file_name) as f:
+                regions[name] = [tuple(boundary) for boundary in json.load(f)['regions']]
+        return cls(regions, RegionCatalog(catalog) if catalog else None)
+
+    def index(self, name):
+        if name is None:
+            if len(self.indexes) != 1:
+                raise QueryError(400, f"name is required with several boundary lists, loaded: {sorted(self.indexes)}")
+            name = next(iter(self.indexes))
+        if name not in self.indexes:
+            raise QueryError(404, f"unknown boundary list {name!r}, loaded: {sorted(self.indexes)}")
+        index = self.indexes[name]
+        if not len(index):
+            raise QueryError(400, f"{name!r} has no satisfactory regions")
+        return index
+
+    def answer(self, method, target, body):
+        """Answer one request; returns (payload, number of queries answered)."""
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path == '/regions' and method == 'GET':
+            return {name: len(index) for name, index in self.indexes.items()}, 0
+        if url.path == '/stats' and method == 'GET':
+            return self.stats.as_dict(), 0
+        if url.path != '/query':
+            raise QueryError(404, f"no endpoint {url.path}")
+        try:
+            if method == 'GET':
+                w1, w2 = float(query['w1']), float(query['w2'])
+                w1, w2 = self.index(query.get('name')).query(w1, w2)
+                return {'w1': w1, 'w2': w2}, 1
+            if method == 'POST':
+                request = json.loads(body or b'{}')
+                weights = np.asarray(request['weights'], dtype=np.float64).reshape(-1, 2)
+                adjusted, in_region = self.index(request.get('name')).query_batch(weights)
+                return {'weights': adjusted.tolist(), 'in_region': in_region.tolist()}, len(weights)
+        except (KeyError, ValueError, TypeError) as e:
+            raise QueryError(400, f"bad query: {type(e).__name__}: {e}")
+        raise QueryError(405, f"{method} is not supported on /query")
+
+    async def handle(self, reader, writer):
+        """Serve the HTTP/1.1 requests of one connection until it closes."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                begin = time.perf_counter()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                queries = 0
+                try:
+                    method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                    payload, queries = self.answer(method, target, body)
+                    status = 200
+                except QueryError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except ValueError:
+                    status, payload = 400, {'error': 'malformed request line'}
+                except Exception as e:
+                    status, payload = 500, {'error': f'{type(e).__name__}: {e}'}
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                data = json.dumps(payload).encode()
+                writer.write(f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}"
+                             f"\r\n\r\n".encode() + data)
+                await writer.drain()
+                self.stats.record(time.perf_counter() - begin, queries, status != 200)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass  # the client left, or sent a malformed header block
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765, ready=None):
+        """Serve until cancelled; ready(server), if given, is called once it listens."""
+        server = await asyncio.start_server(self.handle, host, port)
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
@@ -0,0 +1,50 @@
+"""
+Cold-start import budget of the headless entry points.
+
+Every module is imported in a fresh interpreter (best of a few runs, as reported by
+python -X importtime) and must stay within its budget without loading any of the plotting or
+UI packages. Exits with status 1 if a budget is exceeded.
+
+Run from the project root:
+    python -m helpers.startup_budget
+"""
+import subprocess
+import sys
+
+# module -> budget in seconds for its cumulative import time
+BUDGETS = {
+    'algorithms.twoDimensionalArraySweep': 0.25,
+    'algorithms.twoDimensionalOnline': 0.01,
+    'cli': 0.05,
+}
+HEAVY_MODULES = ('matplotlib', 'tkinter', 'PIL', 'pandas')
+RUNS = 3
+
+
+def import_cost(module):
+    """Return (seconds, heavy modules loaded) for importing module in a fresh interpreter."""
+    code = f'import sys, {module}; print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, check=True)
+    # The line of the module itself holds the cumulative time (in microseconds) of its imports.
+    line = next(line for line in reversed(result.stderr.splitlines()) if line.endswith(f'| {module}'))
+    seconds = int(line.split('|')[1]) / 1e6
+    heavy = [name for name in result.stdout.strip().split(',') if name]
+    return seconds, heavy
+
+
+def main():
+    failed = False
+    print(f"{'module':<40} {'import (s)':>10} {'budget (s)':>10}  heavy modules")
+    for module, budget in BUDGETS.items():
+        costs = [import_cost(module) for _ in range(RUNS)]
+        seconds = min(cost for cost, _ in costs)
+        heavy = sorted(set(name for _, names in costs for name in names))
+        ok = seconds <= budget and not heavy
+        failed |= not ok
+        print(f"{module:<40} {seconds:>10.3f} {budget:>10.3f}  {', '.join(heavy) or '-'}{'' if ok else '  OVER BUDGET'}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,16 @@
 import tkinter as tk
+from functools import partial
 from tkinter import ttk, messagebox
 from PIL import Image, ImageTk, ImageDraw
 
 from Datasets.COMPAS.COMPAS import COMPAS
-from Datasets.Toy.Toy import Toy
-from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+from Datasets.COMPAS.Oracle import Oracle
+from Datasets.Toy.Toy import Toy, ToyOracle
 from algorithms.twoDimensionalOnline import two_d_online
-from helpers.experiment import run_experiment, PLT_EXPERIMENT_NAME
-from helpers.plot_satisfactory_regions import plot_satisfactory_regions
+from helpers.background_preprocessing import BackgroundPreprocessing, sweep_with_stats
+from helpers.experiment import PLT_EXPERIMENT_NAME
+from helpers.plot_satisfactory_regions import plot_satisfactory_regions, render_satisfactory_regions
+from helpers.preprocessing_cache import PreprocessingCache, preprocessing_key
 from PIL import ImageFilter
 
 
@@ -94,6 +97,12 @@ def make_rounded_image(filename, size, radius):
     return ImageTk.PhotoImage(bg.convert("RGB"))
 
 
+# How often the UI polls a background preprocessing run, and how long a cancelled run may take
+# to reach its next progress report before it is terminated.
+POLL_MS = 100
+CANCEL_GRACE_MS = 3000
+
+
 # --- Application with Modern Theme and Updated Styles ---
 class Application(tk.Tk):
     def __init__(self):
@@ -129,6 +138,8 @@ class Application(tk.Tk):
         self.run_experiment_flag = tk.BooleanVar()
         self.sorted_satisfactory_regions = None
         self.optimal_weights = None
+        # Preprocessing results are cached on disk, keyed by dataset and oracle configuration.
+        self.cache = PreprocessingCache()
 
         # For Section 3 weight entry.
         self.w1_var = tk.StringVar()
@@ -220,8 +231,9 @@ class Section1(ttk.Frame):
         selected = self.controller.dataset_choice.get()
         self.controller.selected_dataset = selected
         if selected == "Toy":
-            toy_instance = Toy()
-            self.controller.sorted_satisfactory_regions, _ = two_d_array_sweep(toy_instance)
+            key = preprocessing_key(Toy.get_path(), 'x', 'y', 'color', ToyOracle())
+            self.controller.sorted_satisfactory_regions, _ = self.controller.cache.get_or_compute(
+                key, lambda: sweep_with_stats(Toy()))
             self.controller.show_frame("Section3")
         else:
             self.controller.show_frame("Section2")
@@ -301,6 +313,17 @@ class Section2(ttk.Frame):
                                      style=controller.button_style)
         self.next_btn.pack(side="right", padx=20)
 
+        # Progress of the preprocessing running in the background, shown while it runs.
+        self.task = None
+        self.progress_frame = ttk.Frame(self, style="White.TFrame")
+        self.progress_bar = ttk.Progressbar(self.progress_frame, length=300, maximum=1.0)
+        self.progress_bar.pack(side="left", padx=10)
+        self.progress_label = ttk.Label(self.progress_frame, text="", background="white", width=18)
+        self.progress_label.pack(side="left", padx=5)
+        self.cancel_btn = ttk.Button(self.progress_frame, text="Cancel", command=self.cancel,
+                                     style=controller.button_style)
+        self.cancel_btn.pack(side="left", padx=10)
+
         controller.compas_attr1.trace("w", self.check_fields)
         controller.compas_attr2.trace("w", self.check_fields)
         controller.compas_type.trace("w", self.check_fields)
@@ -324,16 +347,71 @@ class Section2(ttk.Frame):
         attr2 = self.controller.compas_attr2.get()
         protected_type = self.controller.compas_type.get()
         type_att = self.controller.compas_type_att.get()
-        compas_dataset = COMPAS(attr1, attr2, protected_type, type_att)
+        make_dataset = partial(COMPAS, attr1, attr2, protected_type, type_att)
         if self.controller.run_experiment_flag.get():
-            self.controller.sorted_satisfactory_regions = run_experiment(compas_dataset)
-            self.controller.show_frame("Section4")
+            self.start(make_dataset, None)
         else:
-            self.controller.sorted_satisfactory_regions, _ = two_d_array_sweep(compas_dataset)
-            self.controller.show_frame("Section3")
-
-
-
+            key = preprocessing_key(COMPAS.get_path(), attr1, attr2, protected_type, Oracle(type_attr=type_att))
+            entry = self.controller.cache.get(key)
+            if entry is None:
+                self.start(make_dataset, key)
+            else:
+                self.controller.sorted_satisfactory_regions, _ = entry
+                self.controller.show_frame("Section3")
+
+    def start(self, make_dataset, key):
+        """Preprocess in a child process; the sweep result is cached under key (None: run the experiment)."""
+        self.task = BackgroundPreprocessing(make_dataset, experiment=key is None)
+        self.task_key = key
+        self.next_btn.config(state="disabled")
+        self.cancel_btn.config(state="normal")
+        self.progress_bar["value"] = 0
+        self.progress_label.config(text="Starting...")
+        self.progress_frame.pack(side="bottom", pady=10)
+        self.after(POLL_MS, self.poll, self.task)
+
+    def poll(self, task):
+        if task is not self.task:
+            return  # finished or cancelled meanwhile
+        alive = task.process.is_alive()
+        for kind, value, elapsed in task.poll():
+            if kind == 'progress':
+                self.progress_bar["value"] = value
+                self.progress_label.config(text=f"{value:.0%} in {elapsed:.1f} s")
+            else:
+                self.finish(kind, value)
+                return
+        if not alive:
+            self.finish('error', f"preprocessing stopped (exit code {task.process.exitcode})")
+            return
+        self.after(POLL_MS, self.poll, task)
+
+    def cancel(self):
+        self.task.cancel()
+        self.cancel_btn.config(state="disabled")
+        self.progress_label.config(text="Cancelling...")
+        self.after(CANCEL_GRACE_MS, self.stop, self.task)
+
+    def stop(self, task):
+        if task is self.task:
+            task.close(timeout=0)
+            self.finish('cancelled', None)
+
+    def finish(self, kind, result):
+        self.task.close()
+        self.task = None
+        self.progress_frame.pack_forget()
+        self.check_fields()
+        if kind == 'done':
+            if self.task_key is None:
+                self.controller.sorted_satisfactory_regions = result
+                self.controller.show_frame("Section4")
+            else:
+                self.controller.cache.put(self.task_key, *result)
+                self.controller.sorted_satisfactory_regions, _ = result
+                self.controller.show_frame("Section3")
+        elif kind == 'error':
+            messagebox.showerror("Error", result)
 
 
 # --- Section 3: Display plot and run online phase (unchanged) ---
@@ -348,6 +426,10 @@ class Section3(ttk.Frame):
         self.plot_label = ttk.Label(self, background="white")
         self.plot_label.pack(pady=10)
 
+        self.export_btn = ttk.Button(self, text="Export plot (600 dpi)", command=self.export_plot,
+                                     style=controller.button_style)
+        self.export_btn.pack(pady=5)
+
         weights_frame = ttk.Frame(self, style="White.TFrame")
         weights_frame.pack(pady=10)
         ttk.Label(weights_frame, text="w1:").grid(row=0, column=0, padx=5, pady=5)
@@ -383,16 +465,22 @@ class Section3(ttk.Frame):
             self.run_online_btn.config(state="disabled")
 
     def tkraise(self, aboveThis=None):
-        filename = plot_satisfactory_regions(self.controller.sorted_satisfactory_regions)
         try:
-            pil_image = Image.open(filename)
-            pil_image = pil_image.resize((600, 450))
+            pil_image = render_satisfactory_regions(self.controller.sorted_satisfactory_regions, (600, 450))
             self.image = ImageTk.PhotoImage(pil_image)
             self.plot_label.config(image=self.image)
-        except Exception as e:
-            self.plot_label.config(text="Could not load plot image.")
+        except (ImportError, tk.TclError):
+            # matplotlib missing, or Tk unable to take the image.
+            self.plot_label.config(text="Could not render plot image.")
         super().tkraise(aboveThis)
 
+    def export_plot(self):
+        try:
+            filename = plot_satisfactory_regions(self.controller.sorted_satisfactory_regions)
+            messagebox.showinfo("Export", f"Plot saved to {filename}")
+        except (ImportError, OSError) as e:
+            messagebox.showerror("Error", f"Could not export the plot: {e}")
+
     def run_online(self):
         try:
             w1 = float(self.controller.w1_var.get())
@@ -0,0 +1,78 @@
+import heapq
+import math
+
+from Datasets.COMPAS.Oracle import Oracle
+
+
+class Node:
+    """An event of the original sweep: its angle, the two items and the slot of the left one."""
+    __slots__ = ("ordering_exchange", "attribute1", "attribute2", "index")
+
+    def __init__(self, ordering_exchange, attribute1, attribute2, index):
+        self.ordering_exchange = ordering_exchange
+        self.attribute1 = attribute1
+        self.attribute2 = attribute2
+        self.index = index
+
+    def __lt__(self, other):
+        return self.ordering_exchange < other.ordering_exchange
+
+
+def calc_ordering_exchange(attr_left, attr_right):
+    denom = attr_left[1] - attr_right[1]
+    if denom == 0:
+        return math.pi / 2
+    return (attr_right[0] - attr_left[0]) / denom
+
+
+def baseline_sweep(items, oracle):
+    """
+    The original two_d_array_sweep over [x, y, group] rows and a full-rescan oracle: every
+    event waits in a heap of Node objects, stale ones included, so the initial exchanges beyond
+    π/2 are popped after all the others and applied if their pair is still in place.
+
+    One change: the original only opened a region while events were left in the heap, so an
+    ordering first made satisfactory by the last event got an end boundary without a start.
+    Here a region opens whenever an exchange makes the ordering satisfactory.
+    Ties between events are broken arbitrarily by the heap, so compare on data without ties.
+    """
+    ordering = [list(item) for item in items]
+    n = len(ordering)
+    ordering.sort(key=lambda item: item[0], reverse=True)
+    heap = []
+
+    def update_event(i):
+        if 0 <= i < n - 1 and ordering[i][1] < ordering[i + 1][1]:
+            oe = calc_ordering_exchange(ordering[i], ordering[i + 1])
+            if oe <= math.pi / 2:
+                heapq.heappush(heap, Node(oe, ordering[i], ordering[i + 1], i))
+
+    for i in range(n - 1):
+        if ordering[i][1] < ordering[i + 1][1]:
+            heapq.heappush(heap, Node(calc_ordering_exchange(ordering[i], ordering[i + 1]), ordering[i],
+                                      ordering[i + 1], i))
+
+    flag = oracle(ordering)
+    satisfactory_regions = [(0, 0)] if flag else []
+    while heap:
+        node = heapq.heappop(heap)
+        i = node.index
+        if ordering[i] is not node.attribute1 or ordering[i + 1] is not node.attribute2:
+            continue  # stale event; skip it.
+        ordering[i], ordering[i + 1] = ordering[i + 1], ordering[i]
+        update_event(i - 1)
+        update_event(i + 1)
+        new_sign = oracle(ordering)
+        if flag != new_sign:
+            satisfactory_regions.append((node.ordering_exchange, 0 if new_sign else 1))
+        flag = new_sign
+    if flag:
+        satisfactory_regions.append((math.pi / 2, 1))
+    return satisfactory_regions
+
+
+def baseline(dataset):
+    """baseline_sweep over the items of a dataset, with a fresh copy of its COMPAS oracle."""
+    oracle = Oracle(**dataset.get_oracle().params())
+    oracle.encode(dataset.labels)
+    return baseline_sweep(dataset.get_attributes(), oracle)
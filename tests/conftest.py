@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The modules import each other from the project root (python -m pytest from there, or plain pytest).
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
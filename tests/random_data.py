@@ -0,0 +1,37 @@
+import numpy as np
+
+from Datasets.COMPAS.Oracle import Oracle
+from Datasets.Dataset import Dataset
+
+LABELS = ['a', 'b', 'c']
+
+
+class Items(Dataset):
+    """A dataset built from columns, like ContestedItems."""
+    def __init__(self, xs, ys, groups):
+        self.set_columns(np.asarray(xs, dtype=np.float64), np.asarray(ys, dtype=np.float64), np.asarray(groups),
+                         LABELS)
+
+
+def tied_dataset(seed, n=None, values=None):
+    """
+    n items on a small integer grid, so that many items share a point and many exchanges share an
+    angle, with a random top-k oracle over their groups.
+    """
+    rng = np.random.default_rng(seed)
+    n = n or int(rng.integers(2, 40))
+    values = values or int(rng.integers(2, 8))
+    dataset = Items(rng.integers(0, values, n), rng.integers(0, values, n), rng.integers(0, len(LABELS), n))
+    dataset.set_oracle(Oracle(top_k_fraction=rng.uniform(0.1, 0.9), max_AA_ratio=rng.uniform(0.2, 0.8),
+                              type_attr='a'))
+    return dataset
+
+
+def continuous_dataset(seed, n=None):
+    """n items with uniform random attributes, so no two exchanges share an angle, with a random top-k oracle."""
+    rng = np.random.default_rng(seed)
+    n = n or int(rng.integers(2, 40))
+    dataset = Items(rng.random(n), rng.random(n), rng.integers(0, len(LABELS), n))
+    dataset.set_oracle(Oracle(top_k_fraction=rng.uniform(0.1, 0.9), max_AA_ratio=rng.uniform(0.2, 0.8),
+                              type_attr='a'))
+    return dataset
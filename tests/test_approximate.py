@@ -0,0 +1,42 @@
+import math
+
+import numpy as np
+
+from algorithms.approximateArraySweep import verdict_at
+from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+from random_data import continuous_dataset, tied_dataset
+
+
+def exact_verdict(boundaries, theta):
+    """The verdict at theta in (0, π/2) of the boundaries an exact engine returns."""
+    fair = False
+    for angle, end in boundaries:
+        if angle > theta:
+            break
+        fair = end == 0
+    return fair
+
+
+def check_verdicts(dataset):
+    exact, _ = two_d_array_sweep(dataset, engine='python')
+    xs, ys, groups = dataset.get_columns()
+    oracle = dataset.get_oracle()
+    k = oracle.top_k = min(oracle.top_k_for(len(xs)), len(xs))
+    upper, lower = np.triu_indices(len(xs), 1)
+    exchanging = ys[upper] != ys[lower]
+    angles = (xs[lower] - xs[upper])[exchanging] / (ys[upper] - ys[lower])[exchanging]
+    for theta in np.linspace(0, math.pi / 2, 40)[1:-1].tolist():
+        if np.any(np.abs(angles - theta) < 1e-9):
+            continue  # an exchange right at theta; its side is a matter of rounding
+        assert verdict_at(xs, ys, groups, oracle, theta, k) == exact_verdict(exact, theta), theta
+        assert verdict_at(xs, ys, groups, oracle, theta, None) == exact_verdict(exact, theta), theta
+
+
+def test_verdicts_match_an_exact_engine_on_tied_data():
+    for seed in range(300):
+        check_verdicts(tied_dataset(seed))
+
+
+def test_verdicts_match_an_exact_engine_on_continuous_data():
+    for seed in range(300):
+        check_verdicts(continuous_dataset(seed))
@@ -0,0 +1,39 @@
+import math
+
+import numpy as np
+
+from algorithms.parallelArraySweep import ordering_at
+from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+from random_data import continuous_dataset, tied_dataset
+
+
+def batched_reference(dataset):
+    """The boundaries of the orderings at every distinct exchange angle in [0, π/2], judged one by one."""
+    xs, ys, groups = dataset.get_columns()
+    oracle = dataset.get_oracle()
+    upper, lower = np.triu_indices(len(xs), 1)
+    exchanging = ys[upper] != ys[lower]
+    thetas = (xs[lower] - xs[upper])[exchanging] / (ys[upper] - ys[lower])[exchanging]
+    thetas = sorted(set(thetas[(thetas >= 0) & (thetas <= math.pi / 2)].tolist()) | {0.0})
+    boundaries, fair = [], None
+    for theta in thetas:
+        order, _ = ordering_at(xs, ys, theta)
+        oracle.reset()
+        verdict = oracle.start(groups[order].tolist())
+        if verdict != fair and (fair is not None or verdict):
+            boundaries.append((theta, 0 if verdict else 1))
+        fair = verdict
+    if fair:
+        boundaries.append((math.pi / 2, 1))
+    return boundaries
+
+
+def test_batched_engine_judges_every_distinct_angle():
+    for seed in range(300):
+        assert two_d_array_sweep(tied_dataset(seed), engine='batched')[0] == batched_reference(tied_dataset(seed)), seed
+
+
+def test_batched_engine_on_continuous_data():
+    for seed in range(300):
+        dataset = continuous_dataset(seed)
+        assert two_d_array_sweep(dataset, engine='batched')[0] == batched_reference(continuous_dataset(seed)), seed
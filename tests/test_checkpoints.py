@@ -0,0 +1,30 @@
+import math
+
+import pytest
+
+from algorithms.rankingCheckpoints import RankingCheckpoints
+from random_data import tied_dataset
+
+# Ratios w2 / w1 that are exact in binary, so the sweep's x + theta * y ties exactly where the score does.
+WEIGHTS = [(1, 0), (4, 1), (2, 1), (1, 1), (4, 5), (2, 3)]
+
+
+@pytest.mark.parametrize('every', [1, 3, 1024])
+def test_ranking_is_the_ordering_by_score(every):
+    for seed in range(200):
+        dataset = tied_dataset(seed)
+        xs, ys, _ = dataset.get_columns()
+        checkpoints = RankingCheckpoints(dataset, every)
+        for w1, w2 in WEIGHTS:
+            score = (w1 * xs + w2 * ys).tolist()
+            expected = sorted(range(len(score)), key=lambda item: -score[item])
+            ranking = checkpoints.ranking(w1, w2)
+            assert sorted(ranking) == list(range(len(score))), seed
+            assert [score[item] for item in ranking] == [score[item] for item in expected], (seed, w1, w2)
+            k = max(1, len(ranking) // 3)
+            assert checkpoints.ranking(w1, w2, k) == ranking[:k], (seed, w1, w2)
+
+
+def test_ranking_beyond_the_sweep():
+    checkpoints = RankingCheckpoints(tied_dataset(0))
+    assert checkpoints.ranking(0, 1) == checkpoints.ranking(1, 10) == checkpoints.ordering_at(math.pi / 2)
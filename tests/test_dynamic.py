@@ -0,0 +1,37 @@
+import numpy as np
+
+from Datasets.COMPAS.Oracle import Oracle
+from algorithms.dynamicArraySweep import DynamicArraySweep
+from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+from random_data import LABELS, Items, tied_dataset
+
+
+def test_updates_match_a_new_sweep():
+    for seed in range(60):
+        rng = np.random.default_rng(seed)
+        dataset = tied_dataset(seed, n=int(rng.integers(5, 40)))
+        dynamic = DynamicArraySweep(dataset, margin=4)
+        for step in range(40):
+            if len(dynamic) > 3 and rng.random() < 0.5:
+                dynamic.delete(int(rng.integers(len(dynamic))))
+            else:
+                dynamic.insert(float(rng.integers(0, 6)), float(rng.integers(0, 6)), LABELS[int(rng.integers(3))])
+            fresh = Items(*dynamic.get_columns())
+            fresh.set_oracle(Oracle(**dataset.get_oracle().params()))
+            assert dynamic.regions() == two_d_array_sweep(fresh)[0], (seed, step)
+
+
+def test_band_follows_the_items():
+    dataset = tied_dataset(0, n=200, values=50)
+    dynamic = DynamicArraySweep(dataset, margin=8)
+    rng = np.random.default_rng(0)
+    for _ in range(40):
+        dynamic.insert(float(rng.integers(0, 50)), float(rng.integers(0, 50)), LABELS[int(rng.integers(3))])
+        dynamic.delete(int(rng.integers(len(dynamic))))
+    assert dynamic.rebuilds == 1
+
+
+def test_regions_match_a_new_sweep_past_half_pi():
+    # The only region is opened by an initial exchange beyond π/2, swept after all the others.
+    dataset = tied_dataset(392, n=18, values=11)
+    assert DynamicArraySweep(dataset).regions() == two_d_array_sweep(tied_dataset(392, n=18, values=11))[0]
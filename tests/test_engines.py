@@ -0,0 +1,40 @@
+import pytest
+
+from Datasets.COMPAS.Oracle import Oracle
+from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+from baseline import baseline
+from random_data import continuous_dataset, tied_dataset
+
+SEEDS = range(300)
+LABELS = ('a', 'b', 'c')
+
+
+def labelled(seed, label, **kwargs):
+    """A fresh tied dataset whose oracle limits the group label instead."""
+    dataset = tied_dataset(seed, **kwargs)
+    dataset.set_oracle(Oracle(**dict(dataset.get_oracle().params(), type_attr=label)))
+    return dataset
+
+
+def reference(seed, label='a', **kwargs):
+    """The boundaries of the list-based engine over a fresh tied dataset."""
+    return two_d_array_sweep(labelled(seed, label, **kwargs))[0]
+
+
+@pytest.mark.parametrize('engine', ['numpy', 'klevel'])
+def test_engine_matches_the_list_sweep(engine):
+    for seed in SEEDS:
+        for label in LABELS:
+            assert two_d_array_sweep(labelled(seed, label), engine=engine)[0] == reference(seed, label), (seed, label)
+
+
+@pytest.mark.parametrize('engine', ['numpy', 'klevel'])
+def test_engine_matches_the_baseline_on_continuous_data(engine):
+    for seed in range(1000):
+        dataset = continuous_dataset(seed)
+        assert two_d_array_sweep(dataset, engine=engine)[0] == baseline(dataset), seed
+
+
+def test_numpy_rescan_matches_the_list_sweep():
+    for seed in SEEDS:
+        assert two_d_array_sweep(tied_dataset(seed), incremental=False, engine='numpy')[0] == reference(seed), seed
@@ -0,0 +1,51 @@
+import numpy as np
+
+from Datasets.COMPAS.Oracle import Oracle
+from algorithms.multiOracleSweep import two_d_array_sweep_many
+from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+from baseline import baseline
+from random_data import LABELS, continuous_dataset, tied_dataset
+
+
+def random_oracles(rng):
+    return [Oracle(top_k_fraction=rng.uniform(0.1, 0.9), max_AA_ratio=rng.uniform(0.2, 0.8), type_attr=label)
+            for label in LABELS]
+
+
+def one_sweep_each(make_dataset, oracles):
+    regions = []
+    for oracle in oracles:
+        dataset = make_dataset()
+        dataset.set_oracle(Oracle(**oracle.params()))
+        regions.append(two_d_array_sweep(dataset)[0])
+    return regions
+
+
+def test_many_oracles_match_one_sweep_each():
+    rng = np.random.default_rng(0)
+    for seed in range(300):
+        oracles = random_oracles(rng)
+        for incremental in (True, False):
+            many, stats = two_d_array_sweep_many(tied_dataset(seed), oracles, incremental)
+            assert many == one_sweep_each(lambda: tied_dataset(seed), oracles), seed
+            assert stats.exchanges == two_d_array_sweep(tied_dataset(seed))[1].exchanges
+            assert stats.boundaries == sum(len(regions) for regions in many)
+
+
+def test_many_oracles_match_the_baseline_on_continuous_data():
+    rng = np.random.default_rng(1)
+    for seed in range(500):
+        oracles = random_oracles(rng)
+        many, _ = two_d_array_sweep_many(continuous_dataset(seed), oracles)
+        for oracle, regions in zip(oracles, many):
+            dataset = continuous_dataset(seed)
+            dataset.set_oracle(Oracle(**oracle.params()))
+            assert regions == baseline(dataset), seed
+
+
+def test_oracles_reused_over_other_lengths():
+    rng = np.random.default_rng(2)
+    oracles = random_oracles(rng)
+    for seed in range(100):
+        many, _ = two_d_array_sweep_many(tied_dataset(seed), oracles)
+        assert many == one_sweep_each(lambda: tied_dataset(seed), oracles), seed
@@ -0,0 +1,30 @@
+from Datasets.COMPAS.Oracle import Oracle
+from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+from random_data import tied_dataset
+
+
+def test_start_sizes_the_top_k_for_every_ranking():
+    oracle = Oracle(top_k_fraction=0.5, max_AA_ratio=0.5, type_attr='a')
+    oracle.start([0] * 10)
+    assert oracle.top_k == 5
+    oracle.start([0] * 40)
+    assert oracle.top_k == 20
+    oracle([[0, 0, 0]] * 6)
+    assert oracle.top_k == 3
+
+
+def test_an_oracle_reused_over_other_lengths():
+    oracle = Oracle(top_k_fraction=0.4, max_AA_ratio=0.5, type_attr='a')
+    for seed in range(100):
+        dataset = tied_dataset(seed)
+        dataset.set_oracle(Oracle(**oracle.params()))
+        expected, _ = two_d_array_sweep(dataset)
+        dataset.set_oracle(oracle)
+        for incremental in (True, False):
+            assert two_d_array_sweep(dataset, incremental=incremental)[0] == expected, seed
+
+
+def test_rescanning_matches_the_incremental_oracle():
+    for seed in range(300):
+        expected, _ = two_d_array_sweep(tied_dataset(seed))
+        assert two_d_array_sweep(tied_dataset(seed), incremental=False)[0] == expected, seed
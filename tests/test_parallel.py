@@ -0,0 +1,20 @@
+from algorithms.parallelArraySweep import parallel_array_sweep
+from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+from baseline import baseline
+from random_data import continuous_dataset, tied_dataset
+
+
+def parallel(dataset):
+    """The boundaries of the parallel engine over two workers and four sectors."""
+    return parallel_array_sweep(*dataset.get_columns(), dataset.get_oracle(), workers=2, sectors=4)[0]
+
+
+def test_parallel_matches_the_list_sweep():
+    for seed in range(60):
+        assert parallel(tied_dataset(seed, n=60)) == two_d_array_sweep(tied_dataset(seed, n=60))[0], seed
+
+
+def test_parallel_matches_the_baseline_on_continuous_data():
+    for seed in range(60):
+        dataset = continuous_dataset(seed, n=60)
+        assert parallel(dataset) == baseline(dataset), seed
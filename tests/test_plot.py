@@ -0,0 +1,22 @@
+import pytest
+
+from Datasets.Toy.Toy import Toy
+from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+from helpers import plot_satisfactory_regions as plot
+
+pytest.importorskip('matplotlib')
+pytest.importorskip('PIL')
+
+
+def test_render_and_export_without_a_display(tmp_path, monkeypatch):
+    monkeypatch.delenv('DISPLAY', raising=False)
+    boundaries, _ = two_d_array_sweep(Toy())
+
+    image = plot.render_satisfactory_regions(boundaries, (300, 200))
+    assert image.size == (300, 200)
+    assert plot.render_satisfactory_regions(boundaries, (300, 200)) is image
+    assert plot.boundaries_key(boundaries, (300, 200), 4) in plot._rendered
+
+    file_name = plot.plot_satisfactory_regions(boundaries, file_name=str(tmp_path / 'regions.png'), dpi=50)
+    with open(file_name, 'rb') as png:
+        assert png.read(8) == b'\x89PNG\r\n\x1a\n'
@@ -0,0 +1,54 @@
+import os
+
+from Datasets.COMPAS.Oracle import Oracle
+from helpers.preprocessing_cache import PreprocessingCache, preprocessing_key
+
+
+def counting(regions):
+    """A compute function that returns regions and counts its calls."""
+    def compute():
+        compute.calls += 1
+        return regions, {'exchanges': compute.calls}
+    compute.calls = 0
+    return compute
+
+
+def test_hit_after_miss(tmp_path):
+    data = tmp_path / 'data.csv'
+    data.write_text('x,y\n1,2\n')
+    cache = PreprocessingCache(str(tmp_path / 'cache'))
+    key = preprocessing_key(str(data), 'x', 'y', 'race', Oracle())
+    compute = counting([(0, 0), (0.5, 1)])
+    assert cache.get(key) is None
+    assert cache.get_or_compute(key, compute) == ([(0, 0), (0.5, 1)], {'exchanges': 1})
+    assert cache.get_or_compute(key, compute) == ([(0, 0), (0.5, 1)], {'exchanges': 1})
+    assert compute.calls == 1
+
+
+def test_changed_key_misses(tmp_path):
+    data = tmp_path / 'data.csv'
+    data.write_text('x,y\n1,2\n')
+    cache = PreprocessingCache(str(tmp_path / 'cache'))
+    key = preprocessing_key(str(data), 'x', 'y', 'race', Oracle())
+    compute = counting([(0, 0), (0.5, 1)])
+    cache.get_or_compute(key, compute)
+
+    others = [preprocessing_key(str(data), 'y', 'x', 'race', Oracle()),
+              preprocessing_key(str(data), 'x', 'y', 'sex', Oracle()),
+              preprocessing_key(str(data), 'x', 'y', 'race', Oracle(max_AA_ratio=0.3))]
+    data.write_text('x,y\n1,2\n3,4\n')
+    others.append(preprocessing_key(str(data), 'x', 'y', 'race', Oracle()))
+    assert len(set(others)) == len(others) and key not in others
+    for other in others:
+        assert cache.get(other) is None
+        cache.get_or_compute(other, compute)
+    assert compute.calls == 1 + len(others)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = PreprocessingCache(str(tmp_path), max_bytes=1)
+    cache.put('old', [(0, 0)], {})
+    os.utime(tmp_path / 'old.json', ns=(0, 0))
+    cache.put('new', [(0, 0)], {})
+    assert cache.get('old') is None
+    assert cache.get('new') == ([(0, 0)], {})
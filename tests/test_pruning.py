@@ -0,0 +1,28 @@
+import pytest
+
+from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+from random_data import tied_dataset
+
+
+@pytest.mark.parametrize('engine', ['python', 'numpy', 'klevel'])
+def test_pruned_sweep_matches_full_sweep(engine):
+    for seed in range(300):
+        expected, _ = two_d_array_sweep(tied_dataset(seed))
+        assert two_d_array_sweep(tied_dataset(seed), engine=engine, prune=True)[0] == expected, seed
+
+
+@pytest.mark.parametrize('seed', [47, 331, 1060, 1400])
+def test_boundaries_that_depend_on_the_other_exchanges(seed):
+    # 47: the contested items reach the satisfactory ordering with their last exchange, which is
+    # not the last one of the whole sweep; their region opens all the same. 331, 1060, 1400: the
+    # contested items have other initial exchanges beyond π/2 than the whole dataset.
+    expected, _ = two_d_array_sweep(tied_dataset(seed))
+    assert two_d_array_sweep(tied_dataset(seed), prune=True)[0] == expected
+
+
+@pytest.mark.parametrize('engine', ['python', 'numpy', 'klevel'])
+def test_pruned_sweep_past_half_pi(engine):
+    # The contested items are only satisfactory after an initial exchange beyond π/2, so their
+    # boundaries up to π/2 are empty once the end at π/2 is dropped.
+    expected, _ = two_d_array_sweep(tied_dataset(392, n=18, values=11))
+    assert two_d_array_sweep(tied_dataset(392, n=18, values=11), engine=engine, prune=True)[0] == expected
@@ -0,0 +1,61 @@
+import asyncio
+import json
+import math
+
+from algorithms.twoDimensionalOnline import two_d_online
+from helpers.query_service import QueryService
+
+REGIONS = {'first': [(0, 0), (0.5, 1), (1.0, 0), (math.pi / 2, 1)], 'empty': []}
+
+
+async def exchange(requests):
+    """Send the raw requests over one keep-alive connection; returns their (status, payload)."""
+    service = QueryService(REGIONS)
+    server = await asyncio.start_server(service.handle, '127.0.0.1', 0)
+    reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+    responses = []
+    for method, target, body in requests:
+        data = json.dumps(body).encode() if body is not None else b''
+        writer.write(f"{method} {target} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data)
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode()
+            if line == '\r\n':
+                break
+            key, _, value = line.partition(':')
+            headers[key.lower()] = value.strip()
+        responses.append((status, json.loads(await reader.readexactly(int(headers['content-length'])))))
+    writer.close()
+    await writer.wait_closed()
+    server.close()
+    await server.wait_closed()
+    return responses
+
+
+def test_responses():
+    weights = [[1.0, 0.2], [1.0, 0.8], [0.0, 2.0]]
+    responses = asyncio.run(exchange([
+        ('GET', '/regions', None),
+        ('GET', '/query?name=first&w1=1&w2=0.8', None),
+        ('POST', '/query', {'name': 'first', 'weights': weights}),
+        ('GET', '/query?w1=1&w2=1', None),
+        ('GET', '/query?name=other&w1=1&w2=1', None),
+        ('GET', '/query?name=empty&w1=1&w2=1', None),
+        ('GET', '/query?name=first&w1=one&w2=1', None),
+        ('PUT', '/query', None),
+        ('GET', '/nothing', None),
+        ('GET', '/stats', None),
+    ]))
+    statuses = [status for status, _ in responses]
+    assert statuses == [200, 200, 200, 400, 404, 400, 400, 405, 404, 200]
+    assert responses[0][1] == {'first': 4, 'empty': 0}
+    assert responses[1][1] == dict(zip(('w1', 'w2'), two_d_online(REGIONS['first'], 1, 0.8)))
+    batch = responses[2][1]
+    assert batch['in_region'] == [True, False, False]  # π/2 itself ends the last region
+    for (w1, w2), row in zip(weights, batch['weights']):
+        assert math.isclose(row[0], two_d_online(REGIONS['first'], w1, w2)[0], abs_tol=1e-12)
+        assert math.isclose(row[1], two_d_online(REGIONS['first'], w1, w2)[1], abs_tol=1e-12)
+    assert all('error' in payload for _, payload in responses[3:9])
+    assert responses[9][1]['requests'] == 9 and responses[9][1]['queries'] == 4
+    assert responses[9][1]['errors'] == 6
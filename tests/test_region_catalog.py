@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from DataStructures.RegionCatalog import RegionCatalog, write_catalog
+from DataStructures.SatisfactoryRegionIndex import SatisfactoryRegionIndex
+from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+from random_data import tied_dataset
+
+
+def swept_entries():
+    return {f'seed{seed}': sorted(two_d_array_sweep(tied_dataset(seed))[0]) for seed in range(40)}
+
+
+def test_round_trip(tmp_path):
+    entries = swept_entries()
+    entries['empty'] = []
+    metadata = {key: {'seed': j, 'kind': 'tied'} for j, key in enumerate(entries)}
+    path = tmp_path / 'catalog.frc'
+    write_catalog(path, entries, metadata)
+
+    catalog = RegionCatalog(path)
+    assert len(catalog) == len(entries) and set(catalog.keys()) == set(entries)
+    for key, boundaries in entries.items():
+        assert catalog.boundaries(key) == boundaries
+        assert catalog.metadata(key) == metadata[key]
+    assert catalog.find(seed=3) == ['seed3']
+
+
+def test_mapped_index_answers_like_a_built_one(tmp_path):
+    entries = {key: boundaries for key, boundaries in swept_entries().items() if boundaries}
+    write_catalog(tmp_path / 'catalog.frc', entries)
+    catalog = RegionCatalog(tmp_path / 'catalog.frc')
+    weights = np.random.default_rng(0).uniform(0, 10, (100, 2))
+    for key, boundaries in entries.items():
+        mapped, built = catalog.index(key), SatisfactoryRegionIndex(boundaries)
+        for (w1, w2) in weights.tolist():
+            assert mapped.query(w1, w2) == built.query(w1, w2)
+        for got, expected in zip(mapped.query_batch(weights), built.query_batch(weights)):
+            assert np.array_equal(got, expected)
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / 'other.frc'
+    path.write_bytes(b'\0' * 64)
+    with pytest.raises(ValueError):
+        RegionCatalog(path)
@@ -0,0 +1,40 @@
+import math
+
+import numpy as np
+
+from DataStructures.SatisfactoryRegionIndex import SatisfactoryRegionIndex
+from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+from algorithms.twoDimensionalOnline import two_d_online
+from random_data import tied_dataset
+
+
+def random_regions(rng):
+    """A sorted boundary list of alternating region starts and ends in [0, π/2]."""
+    angles = np.sort(rng.uniform(0, math.pi / 2, 2 * int(rng.integers(1, 6)))).tolist()
+    return [(angle, j % 2) for j, angle in enumerate(angles)]
+
+
+def check_queries(regions, weights):
+    index = SatisfactoryRegionIndex(regions)
+    adjusted, in_region = index.query_batch(weights)
+    for (w1, w2), row, inside in zip(weights.tolist(), adjusted, in_region.tolist()):
+        expected = two_d_online(regions, w1, w2)
+        assert index.query(w1, w2) == expected
+        assert np.allclose(row, expected, rtol=1e-12, atol=1e-12)
+        assert inside == (expected == (w1, w2))
+
+
+def test_queries_match_two_d_online():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        weights = rng.uniform(0, 10, (50, 2))
+        weights[:5, 0] = 0  # straight up: θ = π/2
+        check_queries(random_regions(rng), weights)
+
+
+def test_queries_match_two_d_online_over_swept_regions():
+    rng = np.random.default_rng(1)
+    for seed in range(100):
+        regions = sorted(two_d_array_sweep(tied_dataset(seed))[0])
+        if regions:
+            check_queries(regions, rng.uniform(0, 10, (50, 2)))
@@ -0,0 +1,26 @@
+import math
+
+from Datasets.COMPAS.Oracle import Oracle
+from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+from baseline import baseline
+from random_data import Items, continuous_dataset
+
+
+def test_sweep_matches_the_baseline_on_continuous_data():
+    for seed in range(1000):
+        dataset = continuous_dataset(seed)
+        assert two_d_array_sweep(dataset)[0] == baseline(dataset), seed
+
+
+def test_sweep_matches_the_baseline_on_larger_data():
+    for seed in range(10):
+        dataset = continuous_dataset(seed, n=200)
+        assert two_d_array_sweep(dataset)[0] == baseline(dataset), seed
+
+
+def test_the_last_exchange_opens_a_region():
+    # The exchange at 1 makes the ordering satisfactory and is the last one the sweep makes: the
+    # initial exchange of (2, 0) and (0, 1) beyond π/2 is left stale by the exchange at 0.
+    dataset = Items([0, 0, 2, 3], [1, 2, 0, 1], [1, 1, 0, 1])
+    dataset.set_oracle(Oracle(top_k_fraction=0.5, max_AA_ratio=0.4, type_attr='a'))
+    assert two_d_array_sweep(dataset)[0] == [(1.0, 0), (math.pi / 2, 1)]
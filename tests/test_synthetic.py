@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from Datasets.Synthetic.Synthetic import Synthetic
+
+
+def columns(dataset):
+    return [np.array(column) for column in dataset.get_columns()]
+
+
+@pytest.mark.parametrize('distribution', Synthetic.DISTRIBUTIONS)
+def test_a_seed_reproduces_the_items(distribution):
+    first = columns(Synthetic(2000, distribution, seed=7))
+    again = columns(Synthetic(2000, distribution, seed=7))
+    other = columns(Synthetic(2000, distribution, seed=8))
+    for column, same in zip(first, again):
+        assert np.array_equal(column, same)
+    assert not np.array_equal(first[0], other[0])
+
+
+def test_distributions():
+    xs, ys, _ = Synthetic(20000, 'anti-correlated', correlation=0.9, seed=1).get_columns()
+    assert np.corrcoef(xs, ys)[0, 1] < -0.85
+    xs, ys, _ = Synthetic(20000, 'correlated', correlation=0.9, seed=1).get_columns()
+    assert np.corrcoef(xs, ys)[0, 1] > 0.85
+    xs, ys, _ = Synthetic(20000, 'duplicates', distinct=50, seed=1).get_columns()
+    assert len(set(zip(xs.tolist(), ys.tolist()))) <= 50
@@ -0,0 +1,14 @@
+from Datasets.Toy.Toy import Toy, toy_oracle
+from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+
+
+def test_full_rescan_oracle_matches_incremental_oracle():
+    dataset = Toy()
+    expected, _ = two_d_array_sweep(dataset)
+    assert expected == [(0.7583333333333332, 0), (0.7800000000000001, 1), (1.0000000000000004, 0),
+                        (1.5707963267948966, 1)]
+
+    dataset.set_oracle(toy_oracle)
+    for engine in ('python', 'numpy'):
+        assert two_d_array_sweep(dataset, engine=engine)[0] == expected
+    assert two_d_array_sweep(Toy(), incremental=False)[0] == expected
@@ -0,0 +1,36 @@
+import pytest
+
+from Datasets.COMPAS.Oracle import Oracle
+from algorithms.swapTrace import record_trace, replay_trace
+from algorithms.twoDimensionalArraySweep import two_d_array_sweep
+from baseline import baseline
+from random_data import continuous_dataset, tied_dataset
+
+
+@pytest.mark.parametrize('incremental', [True, False])
+def test_replay_does_not_depend_on_what_the_oracle_judged_before(incremental):
+    for seed in range(100):
+        dataset = tied_dataset(seed, n=int(seed % 20) + 2)
+        expected, _ = two_d_array_sweep(dataset)
+        # The same oracle, last used over more items: its top-k must not carry over.
+        oracle = Oracle(**dataset.get_oracle().params())
+        other = tied_dataset(seed, n=60)
+        other.set_oracle(oracle)
+        two_d_array_sweep(other)
+        xs, ys, _ = dataset.get_columns()
+        assert replay_trace(record_trace(xs, ys), dataset, oracle, incremental)[0] == expected, seed
+
+
+@pytest.mark.parametrize('incremental', [True, False])
+def test_replay_matches_the_list_sweep(incremental):
+    for seed in range(300):
+        xs, ys, _ = tied_dataset(seed).get_columns()
+        expected, _ = two_d_array_sweep(tied_dataset(seed))
+        assert replay_trace(record_trace(xs, ys), tied_dataset(seed), incremental=incremental)[0] == expected, seed
+
+
+def test_replay_matches_the_baseline_on_continuous_data():
+    for seed in range(1000):
+        dataset = continuous_dataset(seed)
+        xs, ys, _ = dataset.get_columns()
+        assert replay_trace(record_trace(xs, ys), dataset)[0] == baseline(dataset), seed